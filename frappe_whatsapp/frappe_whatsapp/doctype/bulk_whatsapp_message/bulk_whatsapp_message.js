@@ -1,4 +1,11 @@
 frappe.ui.form.on('Bulk WhatsApp Message', {
+    setup: function(frm) {
+        frappe.realtime.on('bulk_whatsapp_retry', function(data) {
+            if(data && data.parent === frm.doc.name) {
+                frm.reload_doc();
+            }
+        });
+    },
     refresh: function(frm) {
         // Add progress bar
         if(frm.doc.docstatus === 1 && frm.doc.status != 'Draft') {
@@ -4,12 +4,87 @@
 import frappe
 from frappe import _
 import json
-from frappe.utils import cint
+from itertools import islice
+from frappe.utils import cint, now
 from frappe.model.document import Document
 from frappe.model.naming import make_autoname
-from typing import cast
+from typing import TYPE_CHECKING, cast
+
+from frappe_whatsapp.utils.consent import (
+    verify_consent_for_send,
+    verify_consent_for_send_many,
+)
+
+if TYPE_CHECKING:
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import WhatsAppMessage  # noqa: E501
+
+# Number of recipients handled by a single background job.
+# Override via site_config ``whatsapp_bulk_batch_size``.
+BULK_BATCH_SIZE = 100
+
+# RQ queue bulk batches run on. Batches are short and I/O bound, so by
+# default they go to the ``default`` queue rather than waiting behind long
+# jobs. Override via site_config ``whatsapp_bulk_queue``.
+BULK_QUEUE = "default"
+
+# Background job that sends one batch of recipients.
+BATCH_JOB = (
+    "frappe_whatsapp.frappe_whatsapp.doctype.bulk_whatsapp_message"
+    ".bulk_whatsapp_message._bulk_send_batch"
+)
+
+# Fields of the bulk message needed to send a batch; only these are passed
+# to the job instead of reloading the whole document in every worker.
+BATCH_CONTEXT_FIELDS = (
+    "use_template",
+    "template",
+    "variable_type",
+    "template_variables",
+    "attach",
+    "whatsapp_account",
+    "skip_opted_out",
+    "required_consent_category",
+)
+
+# Number of recipient list rows fetched per query while queueing.
+RECIPIENT_PAGE_SIZE = 1000
+
+# Maximum failed messages requeued per UPDATE by retry_failed.
+RETRY_BATCH_SIZE = 5000
+
+# Seconds a get_progress result is served from cache.
+PROGRESS_CACHE_TTL = 3
+
+# Progress bucket for each (lowercased) WhatsApp Message status.
+PROGRESS_BUCKETS = {
+    "sent": "sent",
+    "delivered": "sent",
+    "success": "sent",
+    "read": "sent",
+    "failed": "failed",
+    "queued": "queued",
+}
+
+
+def _get_batch_size() -> int:
+    return max(
+        cint(frappe.conf.get("whatsapp_bulk_batch_size", BULK_BATCH_SIZE)), 1)
+
+
+def _get_queue() -> str:
+    return str(frappe.conf.get("whatsapp_bulk_queue") or BULK_QUEUE)
+
+
+def _progress_cache_key(name: str) -> str:
+    return f"bulk_whatsapp_progress:{name}"
+
+
+def _parse_recipient_data(recipient_data) -> dict:
+    """Decode a recipient's ``recipient_data`` JSON into a dict."""
+    if isinstance(recipient_data, dict):
+        return recipient_data
+    return json.loads(recipient_data or "{}")
 
-from frappe_whatsapp.utils.consent import verify_consent_for_send
 
 # Add these files to your frappe_whatsapp app
 
@@ -65,10 +140,17 @@ class BulkWhatsAppMessage(Document):
             frappe.throw(
                 _("At least one recipient or a recipient list is required"))
 
-        # If recipient list is provided, count recipients
+        # If recipient list is provided, count recipients. Re-read on every
+        # validate (including submit): the list's rows may have changed
+        # since this draft was saved, and sending reads the current rows.
         if self.recipient_type == 'Recipient List' and self.recipient_list:
-            recipient_count = frappe.db.count(
-                "WhatsApp Recipient", {"parent": self.recipient_list})
+            recipient_count = cint(frappe.db.get_value(
+                "WhatsApp Recipient List", self.recipient_list,
+                "recipient_count"))
+            if not recipient_count:
+                # Lists saved before the count was cached
+                recipient_count = frappe.db.count(
+                    "WhatsApp Recipient", {"parent": self.recipient_list})
             if recipient_count == 0:
                 frappe.throw(_("Selected recipient list has no recipients"))
             self.recipient_count = recipient_count
@@ -81,61 +163,95 @@ class BulkWhatsAppMessage(Document):
         self.queue_messages()
 
     def queue_messages(self):
-        """Queue messages for sending"""
-        if self.recipient_type == 'Recipient List' and self.recipient_list:
-            # Fetch recipients from the recipient list
-            recipients = frappe.get_all(
-                "WhatsApp Recipient",
-                filters={"parent": self.recipient_list},
-                fields=[
-                    "mobile_number",
-                    "name", "recipient_name", "recipient_data"]
+        """Queue messages for sending in batches of recipients"""
+        batch_size = _get_batch_size()
+        context = {field: self.get(field) for field in BATCH_CONTEXT_FIELDS}
+        rows = self._iter_recipients()
+        while batch := list(islice(rows, batch_size)):
+            frappe.enqueue(
+                BATCH_JOB,
+                queue=_get_queue(),
+                timeout=4000,
+                parent_name=self.name,
+                recipients=batch,
+                ctx=context,
             )
 
-            for recipient in recipients:
-                frappe.enqueue_doc(
-                    self.doctype, self.name,
-                    "create_single_message",
-                    queue="long",
-                    timeout=4000,
-                    recipient=recipient
+    def _iter_recipients(self):
+        """Yield recipients as plain dicts.
+
+        Recipient lists are read a page at a time so large lists are never
+        held in memory at once.
+        """
+        if self.recipient_type == 'Recipient List' and self.recipient_list:
+            start = 0
+            while True:
+                page = frappe.get_all(
+                    "WhatsApp Recipient",
+                    filters={"parent": self.recipient_list},
+                    fields=[
+                        "mobile_number",
+                        "name", "recipient_name", "recipient_data"],
+                    order_by="name",
+                    limit_start=start,
+                    limit_page_length=RECIPIENT_PAGE_SIZE,
                 )
+                if not page:
+                    break
+                yield from page
+                start += RECIPIENT_PAGE_SIZE
         else:
             # Use recipients from the current document
-            for recipient in self.recipients:
-                frappe.enqueue_doc(
-                    self.doctype, self.name,
-                    "create_single_message",
-                    queue="long",
-                    timeout=4000,
-                    recipient=recipient
-                )
+            for row in self.recipients:
+                yield {
+                    "mobile_number": row.mobile_number,
+                    "name": row.name,
+                    "recipient_name": row.recipient_name,
+                    "recipient_data": row.recipient_data,
+                }
 
-    def create_single_message(self, recipient):
-        """Create a single message in the queue"""
-        mobile = recipient.get("mobile_number")
-        is_consent_request = False
-        if self.use_template and self.template:
-            is_consent_request = bool(
-                frappe.db.get_value(
-                    "WhatsApp Templates",
-                    self.template,
-                    "is_consent_request",
-                )
+    def create_messages_batch(self, recipients):
+        """Create messages for a batch of recipients in one job"""
+        consent_results = {}
+        if self.skip_opted_out:
+            # One consent lookup for the whole batch instead of per recipient.
+            consent_results = verify_consent_for_send_many(
+                [str(r.get("mobile_number")) for r in recipients
+                 if r.get("mobile_number")],
+                consent_category=self.required_consent_category,
+                is_transactional=False,
+                is_consent_request=self._is_consent_request(),
+            )
+
+        for recipient in recipients:
+            self.create_single_message(
+                recipient,
+                parsed_data=_parse_recipient_data(
+                    recipient.get("recipient_data")),
+                consent_result=consent_results.get(
+                    str(recipient.get("mobile_number"))),
             )
 
+    def create_single_message(
+            self, recipient, parsed_data=None, consent_result=None):
+        """Create a single message in the queue
+
+        ``parsed_data`` is the already-decoded ``recipient_data``; it is
+        parsed here only when the caller did not supply it. Likewise
+        ``consent_result`` is a consent check the caller already ran.
+        """
+        mobile = recipient.get("mobile_number")
+
         # Consent check: skip recipients who haven't consented
         if self.skip_opted_out and mobile:
-            result = verify_consent_for_send(
+            result = consent_result or verify_consent_for_send(
                 str(mobile),
                 consent_category=self.required_consent_category,
                 is_transactional=False,
-                is_consent_request=is_consent_request,
+                is_consent_request=self._is_consent_request(),
             )
             if not result.allowed:
-                self.db_set(
-                    "skipped_count",
-                    cint(self.skipped_count) + 1)
+                self._increment_count("skipped_count")
                 frappe.logger().info(
                     f"Bulk {self.name}: skipping"
                     f" {mobile}: {result.reason}")
@@ -145,16 +261,17 @@ class BulkWhatsAppMessage(Document):
         self.status = "In Progress"
 
         # Create WhatsApp message
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import WhatsAppMessage  # noqa
         wa_message = cast(
-            WhatsAppMessage,
+            "WhatsAppMessage",
             frappe.new_doc("WhatsApp Message"))
         # wa_message.from_number = self.from_number
         wa_message.to = recipient.get("mobile_number")
         wa_message.message_type = "Manual"
         # wa_message.message = message_content
-        wa_message.flags.custom_ref_doc = json.loads(
-            recipient.get("recipient_data", "{}"))
+        if parsed_data is None:
+            parsed_data = _parse_recipient_data(
+                recipient.get("recipient_data"))
+        wa_message.flags.custom_ref_doc = parsed_data
         wa_message.bulk_message_reference = self.name
         if self.whatsapp_account:
             wa_message.whatsapp_account = self.whatsapp_account
@@ -176,59 +293,169 @@ class BulkWhatsAppMessage(Document):
 
         # Set status to queued
         wa_message.status = "Queued"
+        # Template and account links were validated on this bulk document;
+        # skip re-validating them and writing a Version row per recipient.
+        wa_message.flags.ignore_links = True
+        wa_message.flags.ignore_version = True
         try:
             wa_message.insert(ignore_permissions=True)
             # Update message count only on successful insert
-            self.db_set("sent_count", cint(self.sent_count) + 1)
-            if cint(self.sent_count) >= cint(self.recipient_count):
-                self.db_set("status", "Completed")
+            self._increment_count("sent_count")
+            # Compare against the freshly incremented column in the same
+            # statement; the in-memory sent_count is stale across workers.
+            frappe.db.sql(
+                "UPDATE `tabBulk WhatsApp Message`"
+                " SET `status` = 'Completed'"
+                " WHERE `name` = %s AND `sent_count` >= `recipient_count`"
+                " AND `status` != 'Completed'",
+                self.name,
+            )
+            completed = cint(frappe.db.sql("SELECT ROW_COUNT()")[0][0])
+            # Persist the message as soon as it is sent, so a failure later
+            # in the batch cannot roll back one Meta already accepted, and
+            # release the row lock parallel batch jobs increment.
+            frappe.db.commit()
+            if completed:
+                frappe.cache().delete_value(_progress_cache_key(self.name))
         except Exception:
-            self.db_set("status", "Partially Failed")
+            self._set_status("Partially Failed")
 
-    def retry_failed(self):
-        """Retry failed messages"""
-        failed_messages = frappe.get_all(
-            "WhatsApp Message",
-            filters={
-                "bulk_message_reference": self.name,
-                "status": "Failed"
-            },
-            fields=["name"]
+    def _set_status(self, status):
+        # Batch jobs run on a partial in-memory copy of this document (see
+        # _bulk_send_batch), so write the column directly.
+        frappe.db.set_value(self.doctype, self.name, "status", status)
+        frappe.cache().delete_value(_progress_cache_key(self.name))
+
+    def _is_consent_request(self):
+        """Whether the template is a consent request, looked up once per
+        batch rather than once per recipient."""
+        if self.flags.is_consent_request is None:
+            self.flags.is_consent_request = bool(
+                self.use_template and self.template and frappe.db.get_value(
+                    "WhatsApp Templates",
+                    self.template,
+                    "is_consent_request",
+                )
+            )
+        return self.flags.is_consent_request
+
+    def _increment_count(self, fieldname):
+        """Atomically increment a counter column on this bulk message.
+
+        Parallel batch jobs update the same row, so the increment is done
+        in SQL rather than as a read-modify-write through ``db_set``.
+        """
+        frappe.db.sql(
+            f"UPDATE `tabBulk WhatsApp Message`"
+            f" SET `{fieldname}` = IFNULL(`{fieldname}`, 0) + 1"
+            f" WHERE `name` = %s",
+            self.name,
         )
 
-        count = 0
-        for msg in failed_messages:
-            from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import WhatsAppMessage  # noqa
-            message_doc = cast(
-                WhatsAppMessage,
-                frappe.get_doc("WhatsApp Message", msg.name))
-            message_doc.status = "Queued"
-            message_doc.save(ignore_permissions=True)
-            count += 1
+    def retry_failed(self):
+        """Retry failed messages
+
+        Requeues at most ``RETRY_BATCH_SIZE`` messages in the request; any
+        remainder is requeued by a background job.
+        """
+        count = self._requeue_failed_chunk()
+        frappe.cache().delete_value(_progress_cache_key(self.name))
+        if count < RETRY_BATCH_SIZE:
+            frappe.msgprint(
+                _("{0} messages have been requeued for sending").format(count))
+            return
 
+        frappe.enqueue_doc(
+            self.doctype, self.name,
+            "retry_failed_batch",
+            queue="long",
+            timeout=4000,
+        )
         frappe.msgprint(
-            _("{0} messages have been requeued for sending").format(count))
+            _("{0} messages have been requeued for sending. The remaining"
+              " failed messages are being requeued in the background")
+            .format(count))
+
+    def retry_failed_batch(self):
+        """Requeue all remaining failed messages in chunks"""
+        while self._requeue_failed_chunk() >= RETRY_BATCH_SIZE:
+            frappe.db.commit()
+
+    def _requeue_failed_chunk(self):
+        """Requeue up to ``RETRY_BATCH_SIZE`` failed messages.
+
+        Returns the number of messages requeued.
+        """
+        frappe.db.sql(
+            "UPDATE `tabWhatsApp Message`"
+            " SET `status` = 'Queued', `modified` = %s, `modified_by` = %s"
+            " WHERE `bulk_message_reference` = %s AND `status` = 'Failed'"
+            " LIMIT %s",
+            (now(), frappe.session.user, self.name, RETRY_BATCH_SIZE),
+        )
+        count = cint(frappe.db.sql("SELECT ROW_COUNT()")[0][0])
+        if count:
+            # The raw UPDATE bypasses per-message hooks; tell open forms
+            # once per chunk instead.
+            frappe.publish_realtime(
+                "bulk_whatsapp_retry",
+                {"parent": self.name, "count": count},
+                doctype=self.doctype,
+                docname=self.name,
+                after_commit=True,
+            )
+        return count
 
     def get_progress(self):
-        """Get sending progress for this bulk message"""
+        """Get sending progress for this bulk message
+
+        The form polls this while a send is running, so the result is cached
+        for ``PROGRESS_CACHE_TTL`` seconds.
+        """
+        cache_key = _progress_cache_key(self.name)
+        cached = frappe.cache().get_value(cache_key)
+        if cached:
+            return cached
+
         total = self.recipient_count
-        sent = frappe.db.count("WhatsApp Message", {
-            "bulk_message_reference": self.name,
-            "status": ["in", ["sent", "delivered", "Success", "read"]]
-        })
-        failed = frappe.db.count("WhatsApp Message", {
-            "bulk_message_reference": self.name,
-            "status": "Failed"
-        })
-        queued = frappe.db.count("WhatsApp Message", {
-            "bulk_message_reference": self.name,
-            "status": "Queued"
-        })
-
-        return {
+        rows = frappe.db.sql(
+            "SELECT `status`, COUNT(*) AS `count`"
+            " FROM `tabWhatsApp Message`"
+            " WHERE `bulk_message_reference` = %s"
+            " GROUP BY `status`",
+            self.name,
+            as_dict=True,
+        )
+
+        # Meta reports lowercase statuses ("failed", "read", ...) while the
+        # send path writes capitalised ones, so bucket case-insensitively.
+        counts = {"sent": 0, "failed": 0, "queued": 0}
+        for row in rows:
+            bucket = PROGRESS_BUCKETS.get(str(row.status or "").lower())
+            if bucket:
+                counts[bucket] += cint(row.count)
+
+        sent = counts["sent"]
+        progress = {
             "total": total,
             "sent": sent,
-            "failed": failed,
-            "queued": queued,
+            "failed": counts["failed"],
+            "queued": counts["queued"],
             "percent": (sent / total * 100) if total else 0
         }
+        frappe.cache().set_value(
+            cache_key, progress, expires_in_sec=PROGRESS_CACHE_TTL)
+        return progress
+
+
+def _bulk_send_batch(parent_name, recipients, ctx):
+    """Background job: send one batch of a Bulk WhatsApp Message.
+
+    Rebuilds the bulk message in memory from ``ctx`` rather than loading it
+    from the database.
+    """
+    doc = cast(
+        BulkWhatsAppMessage,
+        frappe.get_doc(
+            {"doctype": "Bulk WhatsApp Message", "name": parent_name, **ctx}))
+    doc.create_messages_batch(recipients)
@@ -1,9 +1,162 @@
 # Copyright (c) 2025, Shridhar Patil and Contributors
 # See license.txt
 
-# import frappe
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from frappe_whatsapp.frappe_whatsapp.doctype.bulk_whatsapp_message.bulk_whatsapp_message import (  # noqa: E501
+	BATCH_CONTEXT_FIELDS,
+	BATCH_JOB,
+	_bulk_send_batch,
+)
+
+_MOD = (
+	"frappe_whatsapp.frappe_whatsapp.doctype.bulk_whatsapp_message"
+	".bulk_whatsapp_message"
+)
+
+
+def _recipients(count):
+	return [
+		{
+			"mobile_number": f"1555000{i:04d}",
+			"name": f"row-{i}",
+			"recipient_name": f"Recipient {i}",
+			"recipient_data": "{}",
+		}
+		for i in range(count)
+	]
+
 
 class TestBulkWhatsAppMessage(FrappeTestCase):
-	pass
+	def _bulk_message(self, **values):
+		"""Insert a bare Bulk WhatsApp Message row for the batch job to update."""
+		doc = frappe.get_doc({
+			"doctype": "Bulk WhatsApp Message",
+			"name": f"BULK-WA-TEST-{frappe.generate_hash(length=8)}",
+			"title": "Test bulk message",
+			"status": "Queued",
+			"recipient_type": "Individual",
+			**values,
+		})
+		doc.db_insert()
+		return doc
+
+	def _run_batch(self, doc, recipients, ctx=None):
+		"""Run one batch job with message inserts mocked out.
+
+		The job commits after every message; the commits are patched so the
+		test transaction can still be rolled back.
+		"""
+		messages = []
+
+		def new_message(_doctype):
+			message = MagicMock()
+			message.flags = frappe._dict()
+			messages.append(message)
+			return message
+
+		with patch(f"{_MOD}.frappe.new_doc", side_effect=new_message), patch.object(
+			frappe.db, "commit"
+		):
+			_bulk_send_batch(doc.name, recipients, ctx or {})
+		return messages
+
+	def _counts(self, doc):
+		return frappe.db.get_value(
+			"Bulk WhatsApp Message",
+			doc.name,
+			["sent_count", "skipped_count", "status"],
+			as_dict=True,
+		)
+
+	def test_queue_messages_enqueues_batches_of_configured_size(self):
+		doc = frappe.get_doc({
+			"doctype": "Bulk WhatsApp Message",
+			"name": "BULK-WA-TEST-QUEUE",
+			"recipient_type": "Individual",
+			"use_template": 1,
+			"template": "test_template-en_US",
+			"recipients": _recipients(5),
+		})
+
+		with patch.dict(frappe.conf, {"whatsapp_bulk_batch_size": 2}), patch(
+			f"{_MOD}.frappe.enqueue"
+		) as mock_enqueue:
+			doc.queue_messages()
+
+		batches = [call.kwargs["recipients"] for call in mock_enqueue.call_args_list]
+		self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+		self.assertEqual(
+			[row["mobile_number"] for batch in batches for row in batch],
+			[row["mobile_number"] for row in _recipients(5)],
+		)
+		for call in mock_enqueue.call_args_list:
+			self.assertEqual(call.args[0], BATCH_JOB)
+			self.assertEqual(call.kwargs["parent_name"], "BULK-WA-TEST-QUEUE")
+			self.assertEqual(set(call.kwargs["ctx"]), set(BATCH_CONTEXT_FIELDS))
+
+	def test_batch_counts_sent_and_skipped_recipients(self):
+		doc = self._bulk_message(recipient_count=10)
+		recipients = _recipients(3)
+		skipped = recipients[1]["mobile_number"]
+		consent = {
+			r["mobile_number"]: SimpleNamespace(
+				allowed=r["mobile_number"] != skipped, reason="opted out"
+			)
+			for r in recipients
+		}
+
+		with patch(f"{_MOD}.verify_consent_for_send_many", return_value=consent):
+			messages = self._run_batch(doc, recipients, {"skip_opted_out": 1})
+
+		self.assertEqual(len(messages), 2)
+		for message in messages:
+			message.insert.assert_called_once_with(ignore_permissions=True)
+			self.assertEqual(message.bulk_message_reference, doc.name)
+		counts = self._counts(doc)
+		self.assertEqual(counts.sent_count, 2)
+		self.assertEqual(counts.skipped_count, 1)
+		self.assertEqual(counts.status, "Queued")
+
+	def test_last_batch_marks_bulk_message_completed(self):
+		doc = self._bulk_message(recipient_count=3)
+		recipients = _recipients(3)
+
+		self._run_batch(doc, recipients[:2])
+		self.assertEqual(self._counts(doc).status, "Queued")
+
+		self._run_batch(doc, recipients[2:])
+		counts = self._counts(doc)
+		self.assertEqual(counts.sent_count, 3)
+		self.assertEqual(counts.status, "Completed")
+
+	def test_failed_insert_marks_bulk_message_partially_failed(self):
+		doc = self._bulk_message(recipient_count=1)
+
+		with patch(f"{_MOD}.frappe.new_doc") as mock_new_doc, patch.object(
+			frappe.db, "commit"
+		):
+			mock_new_doc.return_value.flags = frappe._dict()
+			mock_new_doc.return_value.insert.side_effect = frappe.ValidationError
+			_bulk_send_batch(doc.name, _recipients(1), {})
+
+		counts = self._counts(doc)
+		self.assertEqual(counts.sent_count, 0)
+		self.assertEqual(counts.status, "Partially Failed")
+
+	def test_validate_rereads_recipient_list_count(self):
+		doc = frappe.get_doc({
+			"doctype": "Bulk WhatsApp Message",
+			"recipient_type": "Recipient List",
+			"recipient_list": "Test List",
+			"recipient_count": 5,
+		})
+
+		with patch(f"{_MOD}.frappe.db.get_value", return_value=8):
+			doc.validate_recipients()
+
+		self.assertEqual(doc.recipient_count, 8)
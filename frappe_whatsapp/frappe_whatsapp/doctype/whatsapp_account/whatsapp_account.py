@@ -7,6 +7,7 @@ from typing import Any
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import now
 
 from frappe_whatsapp.utils.meta import get_paginated_data, request_meta_json
 
@@ -16,6 +17,20 @@ REQUIRED_WHATSAPP_SCOPES = {
     "whatsapp_business_messaging",
 }
 
+# Bumped whenever any account changes so per-process caches of account
+# credentials (e.g. in WhatsApp Notification) know to reload.
+ACCOUNT_CACHE_GENERATION_KEY = "whatsapp_account_cache_generation"
+
+
+def get_account_cache_generation() -> str:
+    """Return the current account cache generation for this site."""
+    return frappe.cache().get_value(ACCOUNT_CACHE_GENERATION_KEY) or ""
+
+
+def bump_account_cache_generation() -> None:
+    frappe.cache().set_value(
+        ACCOUNT_CACHE_GENERATION_KEY, frappe.generate_hash(length=10))
+
 
 class WhatsAppAccount(Document):
     # begin: auto-generated types
@@ -45,6 +60,13 @@ class WhatsAppAccount(Document):
     def on_update(self):
         """Check there is only one default of each type."""
         self.there_must_be_only_one_default()
+        # Bump only once the new values are committed; bumping inside the
+        # transaction lets another worker cache the old row under the new
+        # generation.
+        frappe.db.after_commit.add(bump_account_cache_generation)
+
+    def on_trash(self):
+        frappe.db.after_commit.add(bump_account_cache_generation)
 
     def there_must_be_only_one_default(self):
         """If current WhatsApp Account is default,
@@ -53,15 +75,24 @@ class WhatsAppAccount(Document):
             if not self.get(field):
                 continue
 
-            for whatsapp_account in frappe.get_all(
-                    "WhatsApp Account", filters={field: 1}):
-                if whatsapp_account.name == self.name:
-                    continue
+            others = frappe.get_all(
+                "WhatsApp Account",
+                filters={field: 1, "name": ["!=", self.name]},
+                pluck="name",
+            )
+            if not others:
+                continue
 
-                whatsapp_account = frappe.get_doc(
-                    "WhatsApp Account", whatsapp_account.name)
-                whatsapp_account.set(field, 0)
-                whatsapp_account.save()
+            # Flip the flag in one statement instead of loading and saving
+            # every other default account.
+            frappe.db.sql(
+                f"UPDATE `tabWhatsApp Account`"
+                f" SET `{field}` = 0, `modified` = %s, `modified_by` = %s"
+                f" WHERE `{field}` = 1 AND `name` != %s",
+                (now(), frappe.session.user, self.name),
+            )
+            for name in others:
+                frappe.clear_document_cache("WhatsApp Account", name)
 
 
 def _bearer_headers(token: str) -> dict[str, str]:
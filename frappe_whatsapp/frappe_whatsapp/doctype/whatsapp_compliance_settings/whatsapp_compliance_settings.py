@@ -1,9 +1,10 @@
 # Copyright (c) 2026, Shridhar Patil and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from frappe_whatsapp.utils.consent import clear_compliance_settings_cache
+
 
 class WhatsAppComplianceSettings(Document):
 	# begin: auto-generated types
@@ -33,4 +34,6 @@ class WhatsAppComplianceSettings(Document):
 		terms_of_service_url: DF.Data | None
 		window_hours: DF.Int
 	# end: auto-generated types
-	pass
+
+	def on_update(self):
+		clear_compliance_settings_cache()
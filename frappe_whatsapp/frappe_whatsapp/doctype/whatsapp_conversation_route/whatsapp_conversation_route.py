@@ -4,6 +4,8 @@
 # import frappe
 from frappe.model.document import Document
 
+from frappe_whatsapp.utils.routing import clear_route_app_cache
+
 
 class WhatsAppConversationRoute(Document):
 	# begin: auto-generated types
@@ -20,4 +22,9 @@ class WhatsAppConversationRoute(Document):
 		last_source_app: DF.Link | None
 		whatsapp_account: DF.Link | None
 	# end: auto-generated types
-	pass
+
+	def on_update(self):
+		clear_route_app_cache(self.name)
+
+	def on_trash(self):
+		clear_route_app_cache(self.name)
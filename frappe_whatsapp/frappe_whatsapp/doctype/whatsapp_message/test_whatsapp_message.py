@@ -13,12 +13,24 @@ from requests import Response
 from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import (  # noqa: E501
     WhatsAppMessage,
     _get_integration_request_json,
+    send_template_bulk,
+)
+
+_MOD = (
+    "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
+    "whatsapp_message"
 )
 
 
 class TestWhatsAppMessage(FrappeTestCase):
     """Test whatsapp messages."""
 
+    def setUp(self):
+        # Accounts and templates are memoized per request on frappe.local;
+        # each test mocks its own.
+        frappe.local.whatsapp_account_cache = {}
+        frappe.local.whatsapp_template_cache = {}
+
     def _template(self, **overrides):
         values = {
             "actual_name": "test_template",
@@ -56,12 +68,12 @@ class TestWhatsAppMessage(FrappeTestCase):
     )
     @patch(
         "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
-        "whatsapp_message.frappe.get_doc"
+        "whatsapp_message._get_cached_template"
     )
     def test_parameterless_template_omits_components(
-        self, mock_get_doc, _mock_compliance, _mock_rules
+        self, mock_get_template, _mock_compliance, _mock_rules
     ):
-        mock_get_doc.return_value = self._template(language_code="pt_BR")
+        mock_get_template.return_value = self._template(language_code="pt_BR")
         message = self._template_message()
 
         with patch.object(message, "notify") as mock_notify:
@@ -81,12 +93,12 @@ class TestWhatsAppMessage(FrappeTestCase):
     )
     @patch(
         "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
-        "whatsapp_message.frappe.get_doc"
+        "whatsapp_message._get_cached_template"
     )
     def test_template_runtime_parameters_keep_components(
-        self, mock_get_doc, _mock_compliance, _mock_rules
+        self, mock_get_template, _mock_compliance, _mock_rules
     ):
-        mock_get_doc.return_value = self._template(
+        mock_get_template.return_value = self._template(
             sample_values="Customer",
             header_type="IMAGE",
             buttons=[frappe._dict({
@@ -140,6 +152,30 @@ class TestWhatsAppMessage(FrappeTestCase):
         self.assertEqual(message.message_id, "wamid.123")
         self.assertEqual(mock_request.call_args.kwargs["json_body"], payload)
 
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
+        "whatsapp_message.request_meta_json"
+    )
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
+        "whatsapp_message.frappe.get_doc"
+    )
+    def test_account_loaded_once_per_request(self, mock_get_doc, mock_request):
+        account = frappe._dict({
+            "name": "Test Account",
+            "url": "https://graph.facebook.com",
+            "version": "v24.0",
+            "phone_id": "phone-123",
+        })
+        account.get_password = lambda _fieldname: "token-123"
+        mock_get_doc.return_value = account
+        mock_request.return_value = {"messages": [{"id": "wamid.123"}]}
+
+        for _i in range(3):
+            self._template_message().notify({"messaging_product": "whatsapp"})
+
+        mock_get_doc.assert_called_once_with("WhatsApp Account", "Test Account")
+
     def test_400_response_json_is_not_discarded_as_falsy(self):
         response = Response()
         response.status_code = 400
@@ -164,12 +200,12 @@ class TestWhatsAppMessage(FrappeTestCase):
     )
     @patch(
         "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
-        "whatsapp_message.frappe.get_doc"
+        "whatsapp_message._get_cached_template"
     )
     def test_active_call_permission_blocks_post(
-        self, mock_get_doc, _mock_compliance, _mock_rules
+        self, mock_get_template, _mock_compliance, _mock_rules
     ):
-        mock_get_doc.return_value = self._template(
+        mock_get_template.return_value = self._template(
             is_call_permission_request=1)
         message = self._template_message()
 
@@ -194,12 +230,12 @@ class TestWhatsAppMessage(FrappeTestCase):
     )
     @patch(
         "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
-        "whatsapp_message.frappe.get_doc"
+        "whatsapp_message._get_cached_template"
     )
     def test_inactive_call_permission_allows_one_post(
-        self, mock_get_doc, _mock_compliance, _mock_rules
+        self, mock_get_template, _mock_compliance, _mock_rules
     ):
-        mock_get_doc.return_value = self._template(
+        mock_get_template.return_value = self._template(
             is_call_permission_request=1)
         message = self._template_message()
 
@@ -220,6 +256,10 @@ class TestWhatsAppMessage(FrappeTestCase):
             "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
             "whatsapp_message.get_service_window_status",
             return_value=(False, "closed"),
+        ), patch(
+            "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message."
+            "whatsapp_message._get_cached_template",
+            return_value=self._template(),
         ), patch.object(message, "_check_consent"), patch.object(
             message,
             "send_template",
@@ -438,3 +478,150 @@ class TestWhatsAppMessage(FrappeTestCase):
         self.assertEqual(payload["audio"], {
             "link": "https://example.com/audio.mp3",
         })
+
+    def _send_bulk(self, recipients, accounts, results, insert=None):
+        """Run send_template_bulk with the checks and Meta calls mocked.
+
+        ``accounts`` maps a number to its account, a number missing from
+        it fails validation. ``results`` maps an account to the
+        ``request_meta_json_many`` results for its recipients.
+        """
+        def set_account(doc):
+            if doc.to not in accounts:
+                frappe.throw(f"No account for {doc.to}")
+            doc.whatsapp_account = accounts[doc.to]
+
+        def build_payload(doc, _template=None):
+            return {"to": doc.to}
+
+        def get_account(name):
+            return frappe._dict({
+                "url": "https://graph.facebook.com",
+                "version": "v24.0",
+                "phone_id": f"phone-{name}",
+            }), "token-123"
+
+        def request_many(_method, _url, *, account_name, json_bodies,
+                         **_kwargs):
+            self.assertEqual(len(json_bodies), len(results[account_name]))
+            return results[account_name]
+
+        inserted = []
+
+        def record_insert(doc):
+            if insert:
+                insert(doc)
+            doc.name = f"msg-{doc.to}"
+            inserted.append(doc)
+
+        with patch(f"{_MOD}.frappe.has_permission"), patch.object(
+            WhatsAppMessage, "set_whatsapp_account", autospec=True,
+            side_effect=set_account,
+        ), patch.object(
+            WhatsAppMessage, "_run_send_checks", return_value=None,
+        ), patch.object(
+            WhatsAppMessage, "_build_template_payload", autospec=True,
+            side_effect=build_payload,
+        ), patch(
+            f"{_MOD}._get_cached_account", side_effect=get_account,
+        ), patch(
+            f"{_MOD}.request_meta_json_many", side_effect=request_many,
+        ) as mock_request, patch.object(
+            WhatsAppMessage, "insert", autospec=True,
+            side_effect=record_insert,
+        ):
+            result = send_template_bulk(
+                recipients, "Customer", "CUST-0001", "test_template-en_US")
+
+        return result, mock_request, inserted
+
+    def test_bulk_template_groups_recipients_by_account(self):
+        message_count = len(frappe.local.message_log)
+
+        result, mock_request, _inserted = self._send_bulk(
+            ["111", "222", "333", "444"],
+            {"111": "Account A", "222": "Account B", "333": "Account A"},
+            {
+                "Account A": [
+                    ({"messages": [{"id": "wamid.111"}]}, None),
+                    ({"messages": [{"id": "wamid.333"}]}, None),
+                ],
+                "Account B": [({"messages": [{"id": "wamid.222"}]}, None)],
+            },
+        )
+
+        self.assertEqual(mock_request.call_count, 2)
+        bodies = {
+            call.kwargs["account_name"]: call.kwargs["json_bodies"]
+            for call in mock_request.call_args_list
+        }
+        self.assertEqual(
+            bodies["Account A"], [{"to": "111"}, {"to": "333"}])
+        self.assertEqual(bodies["Account B"], [{"to": "222"}])
+        self.assertIn(
+            "phone-Account A/messages",
+            mock_request.call_args_list[0].args[1],
+        )
+        self.assertCountEqual(
+            result["sent"], ["msg-111", "msg-222", "msg-333"])
+        self.assertEqual([row["to"] for row in result["failed"]], ["444"])
+        # The handled validation failure leaves no popup behind.
+        self.assertEqual(len(frappe.local.message_log), message_count)
+
+    def test_bulk_template_skips_rows_meta_rejected(self):
+        message_count = len(frappe.local.message_log)
+
+        result, _mock_request, inserted = self._send_bulk(
+            ["111", "222", "333"],
+            {"111": "Account A", "222": "Account A", "333": "Account A"},
+            {
+                "Account A": [
+                    ({"messages": [{"id": "wamid.111"}]}, None),
+                    ({}, "Invalid parameter"),
+                    ({"messages": []}, None),
+                ],
+            },
+        )
+
+        # Only the accepted row is saved, already carrying Meta's ID so
+        # before_insert records it instead of sending it again.
+        self.assertEqual([doc.to for doc in inserted], ["111"])
+        self.assertEqual(inserted[0].message_id, "wamid.111")
+        self.assertEqual(inserted[0].status, "Success")
+        self.assertEqual(result["sent"], ["msg-111"])
+        self.assertEqual(
+            [row["to"] for row in result["failed"]], ["222", "333"])
+        self.assertEqual(result["failed"][0]["error"], "Invalid parameter")
+        self.assertEqual(len(frappe.local.message_log), message_count)
+
+    def test_bulk_template_rolls_back_failed_insert_only(self):
+        def insert(doc):
+            if doc.to == "222":
+                raise frappe.DuplicateEntryError
+
+        with patch(f"{_MOD}.frappe.db.savepoint") as mock_savepoint, patch(
+            f"{_MOD}.frappe.db.rollback"
+        ) as mock_rollback, patch(f"{_MOD}.frappe.log_error") as mock_log:
+            result, _mock_request, inserted = self._send_bulk(
+                ["111", "222", "333"],
+                {"111": "Account A", "222": "Account A", "333": "Account A"},
+                {
+                    "Account A": [
+                        ({"messages": [{"id": "wamid.111"}]}, None),
+                        ({"messages": [{"id": "wamid.222"}]}, None),
+                        ({"messages": [{"id": "wamid.333"}]}, None),
+                    ],
+                },
+                insert=insert,
+            )
+
+        self.assertEqual(mock_savepoint.call_count, 3)
+        mock_rollback.assert_called_once_with(
+            save_point="whatsapp_bulk_template_insert")
+        mock_log.assert_called_once()
+        self.assertIn("wamid.222", mock_log.call_args.kwargs["message"])
+        self.assertEqual(result["sent"], ["msg-111", "msg-333"])
+        self.assertEqual(result["failed"], [{
+            "to": "222",
+            "error": "Sent, but the message could not be saved.",
+        }])
@@ -3,16 +3,19 @@
 import json
 import mimetypes
 import os
+import secrets
+from functools import cached_property
 import frappe
+import orjson
 import requests
 from frappe import _, throw
 from frappe.model.document import Document
-from frappe.integrations.utils import make_post_request
-from frappe.utils import get_url
-from typing import cast, Any
+from frappe.utils import cint, get_url
+from typing import TYPE_CHECKING, cast, Any
 from urllib.parse import unquote, urlparse
 from frappe_whatsapp.utils.routing import set_last_sender_app
-from frappe_whatsapp.utils.meta import request_meta_json
+from frappe_whatsapp.utils.meta import (
+    request_meta_json, request_meta_json_many)
 
 from frappe_whatsapp.utils import get_whatsapp_account, format_number
 from frappe_whatsapp.utils.consent import (
@@ -22,6 +25,12 @@ from frappe_whatsapp.utils.consent import (
     enforce_template_send_rules,
     get_compliance_settings,
 )
+from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import insert_profile_if_missing  # noqa: E501
+
+if TYPE_CHECKING:
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_flow.whatsapp_flow import WhatsAppFlow  # noqa: E501
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import WhatsAppTemplates  # noqa: E501
 
 
 AUDIO_UPLOAD_MIME_BY_EXTENSION = {
@@ -38,6 +47,39 @@ AUDIO_UPLOAD_MIME_BY_EXTENSION = {
     ".opus": "audio/ogg; codecs=opus",
 }
 MAX_AUDIO_UPLOAD_BYTES = 16 * 1024 * 1024
+# Concurrent Meta requests for send_template_bulk (conf:
+# whatsapp_bulk_send_workers).
+BULK_SEND_WORKERS = 16
+
+# WhatsApp Templates fields read by the consent checks and send_template.
+TEMPLATE_SEND_FIELDS = (
+    "name",
+    # Keys the per-request marketing compliance memo.
+    "modified",
+    "actual_name",
+    "template_name",
+    "language_code",
+    "status",
+    "category",
+    "footer",
+    "unsubscribe_text",
+    "sample_values",
+    "field_names",
+    "header_type",
+    "sample",
+    "is_transactional",
+    "required_consent_category",
+    "is_consent_request",
+    "is_call_permission_request",
+    "requires_opt_in",
+)
+TEMPLATE_BUTTON_FIELDS = (
+    "button_type",
+    "button_label",
+    "phone_number",
+    "website_url",
+    "url_type",
+)
 
 
 def _get_integration_request_json() -> dict:
@@ -57,6 +99,76 @@ def _get_integration_request_json() -> dict:
     return data if isinstance(data, dict) else {}
 
 
+def _get_request_cache(key: str) -> dict:
+    """Return a dict cached on ``frappe.local`` for the current request/job."""
+    cache = getattr(frappe.local, key, None)
+    if cache is None:
+        cache = {}
+        setattr(frappe.local, key, cache)
+    return cache
+
+
+def _get_cached_account(name: str) -> tuple[Any, str | None]:
+    """Return ``(account_doc, token)`` for a WhatsApp Account.
+
+    Loaded and decrypted once per request so bulk sends reuse them.
+    """
+    cache = _get_request_cache("whatsapp_account_cache")
+    if name not in cache:
+        account = frappe.get_doc("WhatsApp Account", name)
+        cache[name] = (account, account.get_password("token"))
+    return cache[name]
+
+
+def _get_cached_template(name: str) -> Any:
+    """Return the template fields needed to send, loaded once per request."""
+    cache = _get_request_cache("whatsapp_template_cache")
+    if name not in cache:
+        cache[name] = _load_template(name)
+    return cache[name]
+
+
+def _load_template(name: str) -> Any:
+    """Load only the template fields and buttons the send path reads.
+
+    Avoids instantiating the full WhatsApp Templates controller.
+    """
+    template = frappe.db.get_value(
+        "WhatsApp Templates", name, list(TEMPLATE_SEND_FIELDS), as_dict=True)
+    if not template:
+        frappe.throw(
+            _("WhatsApp Templates {0} not found").format(name),
+            frappe.DoesNotExistError)
+
+    template.buttons = frappe.get_all(
+        "WhatsApp Button",
+        filters={"parent": name, "parenttype": "WhatsApp Templates"},
+        fields=list(TEMPLATE_BUTTON_FIELDS),
+        order_by="idx asc",
+    )
+    template.parsed_field_names = _split_field_names(template)
+    return template
+
+
+def _split_field_names(template: Any) -> tuple[str, ...]:
+    """Body parameter field names, split and stripped."""
+    raw = template.field_names or template.sample_values or ""
+    return tuple(field_name.strip() for field_name in raw.split(","))
+
+
+def _get_base_url() -> str:
+    """Return the site URL, resolved once per request/job.
+
+    Scoped to ``frappe.local`` rather than the process because one worker
+    serves several sites.
+    """
+    base_url = getattr(frappe.local, "whatsapp_base_url", None)
+    if base_url is None:
+        base_url = get_url()
+        frappe.local.whatsapp_base_url = base_url
+    return base_url
+
+
 def _normalize_attachment_url(attach: str | None) -> str:
     if not attach:
         return ""
@@ -65,9 +177,9 @@ def _normalize_attachment_url(attach: str | None) -> str:
         return attach
 
     if attach.startswith("/"):
-        return f"{get_url()}{attach}"
+        return f"{_get_base_url()}{attach}"
 
-    return f"{get_url()}/{attach}"
+    return f"{_get_base_url()}/{attach}"
 
 
 class WhatsAppMessage(Document):
@@ -128,36 +240,55 @@ class WhatsAppMessage(Document):
     def validate(self):
         self.set_whatsapp_account()
 
-    def on_update(self):
-        self.update_profile_name()
+    @cached_property
+    def _formatted_to(self) -> str:
+        """Recipient number without the leading '+', computed once."""
+        return format_number(str(self.to or ""))
 
-    def update_profile_name(self):
+    @cached_property
+    def _formatted_counterparty(self) -> str:
+        """The other party's number: the sender if set, else the recipient."""
         number = self.get("from")
         if not number:
-            return
-        from_number = format_number(str(number))
+            return self._formatted_to
+        return format_number(str(number))
 
+    def on_update(self):
+        self.update_profile_name()
+
+    def update_profile_name(self):
+        # Outgoing messages never carry the sender's profile name, so skip
+        # before formatting the number or touching the database.
         if (
-            self.has_value_changed("profile_name")
-            and self.profile_name
-            and from_number
-            and frappe.db.exists("WhatsApp Profiles", {"number": from_number})
+            self.type == "Outgoing"
+            or not self.profile_name
+            or not self.has_value_changed("profile_name")
         ):
-            profile_id = frappe.get_value(
-                "WhatsApp Profiles", {"number": from_number}, "name")
+            return
+
+        if not self.get("from"):
+            return
+        from_number = self._formatted_counterparty
+        if not from_number:
+            return
+
+        profile_id = frappe.db.get_value(
+            "WhatsApp Profiles", {"number": from_number}, "name")
+        if profile_id:
             frappe.db.set_value(
                 "WhatsApp Profiles",
                 profile_id, "profile_name", self.profile_name)
 
     def create_whatsapp_profile(self):
-        number = format_number(str(self.get("from") or self.to))
-        if not frappe.db.exists("WhatsApp Profiles", {"number": number}):
-            frappe.get_doc({
-                "doctype": "WhatsApp Profiles",
-                "profile_name": self.profile_name,
-                "number": number,
-                "whatsapp_account": self.whatsapp_account
-            }).insert(ignore_permissions=True)
+        """Create a WhatsApp Profiles row for the counterparty if missing."""
+        number = self._formatted_counterparty
+        if not number:
+            return
+        insert_profile_if_missing(
+            number,
+            profile_name=self.profile_name,
+            whatsapp_account=self.whatsapp_account,
+        )
 
     def set_whatsapp_account(self):
         """Set whatsapp account to default if missing"""
@@ -173,43 +304,28 @@ class WhatsAppMessage(Document):
             else:
                 self.whatsapp_account = default_whatsapp_account.name
 
-    def _check_consent(self, *, service_window_active: bool = False):
-        """Verify consent before sending an outgoing message."""
+    def _check_consent(
+            self, *, service_window_active: bool = False,
+            template: Any = None):
+        """Verify consent before sending an outgoing message.
+
+        ``template`` may be passed when the caller already loaded it.
+        """
         # Determine if this template is transactional
         is_transactional = False
         consent_category: str | None = None
         is_consent_request = bool(self.is_opt_in_request)
         is_call_permission_request = False
-        if self.template:
-            is_transactional = bool(
-                frappe.db.get_value(
-                    "WhatsApp Templates",
-                    self.template,
-                    "is_transactional",
-                )
-            )
+        if template is None and self.template:
+            template = _get_cached_template(str(self.template))
+        if template:
+            is_transactional = bool(template.is_transactional)
             consent_category = cast(
-                str | None,
-                frappe.db.get_value(
-                    "WhatsApp Templates",
-                    self.template,
-                    "required_consent_category",
-                ),
-            )
-            is_consent_request = bool(
-                frappe.db.get_value(
-                    "WhatsApp Templates",
-                    self.template,
-                    "is_consent_request",
-                )
-            ) or is_consent_request
+                str | None, template.required_consent_category)
+            is_consent_request = (
+                bool(template.is_consent_request) or is_consent_request)
             is_call_permission_request = bool(
-                frappe.db.get_value(
-                    "WhatsApp Templates",
-                    self.template,
-                    "is_call_permission_request",
-                )
-            )
+                template.is_call_permission_request)
 
         if is_consent_request or is_call_permission_request:
             # Consent request templates should not depend on prior category
@@ -219,7 +335,7 @@ class WhatsAppMessage(Document):
             self.is_opt_in_request = 1
 
         result = verify_consent_for_send(
-            str(self.to or ""),
+            self._formatted_to,
             consent_category=consent_category,
             is_transactional=is_transactional,
             is_consent_request=(
@@ -317,9 +433,8 @@ class WhatsAppMessage(Document):
                   "or .opus extension."),
                 title=_("Unsupported Voice Note Format"))
 
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
         whatsapp_account = cast(
-            WhatsAppAccount,
+            "WhatsAppAccount",
             frappe.get_doc("WhatsApp Account", self.whatsapp_account))
         token = whatsapp_account.get_password("token")
         upload_url = (
@@ -374,13 +489,12 @@ class WhatsAppMessage(Document):
 
         return str(media_id)
 
-    """Send whats app messages."""
-    def before_insert(self):
-        """Send message."""
-        self.set_whatsapp_account()
+    def _run_send_checks(self) -> Any:
+        """Run the consent and conversation-window checks for a send.
 
-        if self.use_template and self.template:
-            self.message_type = "Template"
+        Returns the loaded template (if any) so the send path can reuse it.
+        """
+        template = None
 
         # Consent + window checks only for messages not yet sent.
         # Docs created with message_id already set (e.g. from
@@ -393,11 +507,16 @@ class WhatsAppMessage(Document):
             # without a recorded opt-in.  Disabling enforcement must NOT
             # fabricate a phantom service window.
             service_window_active, window_reason = get_service_window_status(
-                str(self.to or ""), whatsapp_account=self.whatsapp_account)
+                self._formatted_to, whatsapp_account=self.whatsapp_account)
             self.within_conversation_window = 1 if service_window_active else 0
 
             # ── Step 2: consent check (may be bypassed by service window) ─
-            self._check_consent(service_window_active=service_window_active)
+            # Load the template once; the send path reuses it.
+            if self.template:
+                template = _get_cached_template(str(self.template))
+            self._check_consent(
+                service_window_active=service_window_active,
+                template=template)
 
             # ── Step 3: enforcement for free-form messages ─────────────
             # The service window bypass relaxes consent only; the window
@@ -415,176 +534,29 @@ class WhatsAppMessage(Document):
                         title=_("Outside Conversation Window"),
                     )
 
-        if self.type == "Outgoing" and self.message_type != "Template":
-            link = _normalize_attachment_url(self.attach)
+        return template
+
+    """Send whats app messages."""
+    def before_insert(self):
+        """Send message."""
+        self.set_whatsapp_account()
+
+        if self.use_template and self.template:
+            self.message_type = "Template"
+
+        template = self._run_send_checks()
 
+        if self.type == "Outgoing" and self.message_type != "Template":
             data: dict[str, Any] = {
                 "messaging_product": "whatsapp",
-                "to": format_number(self.to),
+                "to": self._formatted_to,
                 "type": self.content_type,
             }
             if self.is_reply and self.reply_to_message_id:
                 data["context"] = {"message_id": self.reply_to_message_id}
-            if self.content_type in ["document", "image", "video"]:
-                data[self.content_type.lower()] = {
-                    "link": link,
-                    "caption": self.message,
-                }
-            elif self.content_type == "sticker":
-                data["sticker"] = {"link": link}
-            elif self.content_type == "reaction":
-                data["reaction"] = {
-                    "message_id": self.reply_to_message_id,
-                    "emoji": self.message,
-                }
-            elif self.content_type == "text":
-                data["text"] = {"preview_url": True, "body": self.message}
-
-            elif self.content_type == "audio":
-                # Upload local audio first and send by Meta media ID. This
-                # avoids client-side playback failures caused by WhatsApp
-                # refetching a self-hosted URL with weak MIME/container
-                # metadata.
-                media_id = self._upload_local_audio_to_whatsapp()
-                if self.get("is_voice_note") and not media_id:
-                    frappe.throw(
-                        _("Voice notes must use a local Frappe File "
-                          "attachment so it can be uploaded to WhatsApp "
-                          "before sending."),
-                        title=_("Unsupported Voice Note Attachment"),
-                    )
-                data["audio"] = (
-                    {"id": media_id} if media_id else {"link": link}
-                )
-                if self.get("is_voice_note"):
-                    data["audio"]["voice"] = True
-
-            elif self.content_type == "interactive":
-                # Interactive message (buttons or list)
-                data["type"] = "interactive"
-
-                if isinstance(self.buttons, str):
-                    buttons_data = json.loads(
-                        self.buttons) if self.buttons else []
-                else:
-                    buttons_data = self.buttons or []
-
-                if not isinstance(buttons_data, list):
-                    frappe.throw(
-                        _("Buttons must be a list for interactive messages"))
-
-                if not buttons_data:
-                    frappe.throw(
-                        _("Buttons are required for interactive messages"))
-
-                if len(buttons_data) > 3:
-                    # Use list message for more than 3 options (max 10)
-                    data["interactive"] = {
-                        "type": "list",
-                        "body": {"text": self.message},
-                        "action": {
-                            "button": "Select Option",
-                            "sections": [{
-                                "title": "Options",
-                                "rows": [
-                                    {
-                                        "id": btn["id"],
-                                        "title": btn["title"],
-                                        "description": btn.get(
-                                            "description", "")}
-                                    for btn in buttons_data[:10]
-                                ]
-                            }]
-                        }
-                    }
-                else:
-                    # Use button message for 3 or fewer options
-                    data["interactive"] = {
-                        "type": "button",
-                        "body": {"text": self.message},
-                        "action": {
-                            "buttons": [
-                                {
-                                    "type": "reply",
-                                    "reply": {
-                                        "id": btn["id"],
-                                        "title": btn["title"]}
-                                }
-                                for btn in buttons_data[:3]
-                            ]
-                        }
-                    }
-
-            elif self.content_type == "flow":
-                # WhatsApp Flow message
-                if not self.flow:
-                    frappe.throw(
-                        _("WhatsApp Flow is required for flow content type"))
-                from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_flow.whatsapp_flow import WhatsAppFlow  # noqa: E501
-                flow_doc = cast(
-                    WhatsAppFlow,
-                    frappe.get_doc(
-                        "WhatsApp Flow",
-                        str(self.flow)))
-
-                if not flow_doc.flow_id:
-                    frappe.throw(_(
-                        "Flow must be created on WhatsApp before sending"))
-
-                # Determine flow mode - draft flows can be tested with mode:
-                # "draft"
-                flow_mode = None
-                if flow_doc.status != "Published":
-                    flow_mode = "draft"
-                    frappe.msgprint(
-                        _("Sending flow in draft mode (for testing only)"),
-                        indicator="orange")
-
-                # Get first screen if not specified
-                flow_screen = self.flow_screen
-                if not flow_screen and flow_doc.screens:
-                    first_screen = flow_doc.screens[0]
-                    flow_screen = (
-                        getattr(first_screen, "screen_id", None)
-                        or getattr(first_screen, "screen", None)
-                        or getattr(first_screen, "screen_name", None)
-                        or getattr(first_screen, "name", None)
-                    )
-
-                if not flow_screen:
-                    frappe.throw(
-                        _("Flow screen is required to send flow message"))
-
-                data["type"] = "interactive"
-                data["interactive"] = {
-                    "type": "flow",
-                    "body": {
-                        "text": self.message or "Please fill out the form"},
-                    "action": {
-                        "name": "flow",
-                        "parameters": {
-                            "flow_message_version": "3",
-                            "flow_id": flow_doc.flow_id,
-                            "flow_cta": (
-                                self.flow_cta or flow_doc.flow_cta or "Open"),
-                            "flow_action": "navigate",
-                            "flow_action_payload": {
-                                "screen": flow_screen
-                            }
-                        }
-                    }
-                }
-
-                # Add draft mode for testing unpublished flows
-                if flow_mode:
-                    data["interactive"]["action"]["parameters"][
-                        "mode"] = flow_mode
-
-                # Add flow token - generate one if not provided (required by
-                # WhatsApp)
-                flow_token = self.flow_token or frappe.generate_hash(length=16)
-                data["interactive"]["action"]["parameters"][
-                    "flow_token"] = flow_token
+            builder = _PAYLOAD_BUILDERS.get(str(self.content_type))
+            if builder:
+                builder(self, data)
 
             try:
                 self.notify(data)
@@ -598,7 +570,7 @@ class WhatsAppMessage(Document):
         elif self.type == "Outgoing" and self.message_type == "Template" and \
                 not self.message_id:
             try:
-                self.send_template()
+                self.send_template(template)
                 self.status = "Success"
             except frappe.ValidationError:
                 self.status = "Failed"
@@ -609,20 +581,188 @@ class WhatsAppMessage(Document):
 
         self.create_whatsapp_profile()
 
-    def send_template(self):
+    # ── Outgoing payload builders, dispatched via _PAYLOAD_BUILDERS ──────
+
+    def _build_media_payload(self, data: dict[str, Any]):
+        data[str(self.content_type).lower()] = {
+            "link": _normalize_attachment_url(self.attach),
+            "caption": self.message,
+        }
+
+    def _build_sticker_payload(self, data: dict[str, Any]):
+        data["sticker"] = {"link": _normalize_attachment_url(self.attach)}
+
+    def _build_reaction_payload(self, data: dict[str, Any]):
+        data["reaction"] = {
+            "message_id": self.reply_to_message_id,
+            "emoji": self.message,
+        }
+
+    def _build_text_payload(self, data: dict[str, Any]):
+        data["text"] = {"preview_url": True, "body": self.message}
+
+    def _build_audio_payload(self, data: dict[str, Any]):
+        # Upload local audio first and send by Meta media ID. This
+        # avoids client-side playback failures caused by WhatsApp
+        # refetching a self-hosted URL with weak MIME/container
+        # metadata.
+        media_id = self._upload_local_audio_to_whatsapp()
+        if self.get("is_voice_note") and not media_id:
+            frappe.throw(
+                _("Voice notes must use a local Frappe File "
+                  "attachment so it can be uploaded to WhatsApp "
+                  "before sending."),
+                title=_("Unsupported Voice Note Attachment"),
+            )
+        data["audio"] = (
+            {"id": media_id} if media_id
+            else {"link": _normalize_attachment_url(self.attach)}
+        )
+        if self.get("is_voice_note"):
+            data["audio"]["voice"] = True
+
+    def _build_interactive_payload(self, data: dict[str, Any]):
+        # Interactive message (buttons or list)
+        data["type"] = "interactive"
+
+        if isinstance(self.buttons, str):
+            buttons_data = json.loads(
+                self.buttons) if self.buttons else []
+        else:
+            buttons_data = self.buttons or []
+
+        if not isinstance(buttons_data, list):
+            frappe.throw(
+                _("Buttons must be a list for interactive messages"))
+
+        if not buttons_data:
+            frappe.throw(
+                _("Buttons are required for interactive messages"))
+
+        if len(buttons_data) > 3:
+            # Use list message for more than 3 options (max 10)
+            data["interactive"] = {
+                "type": "list",
+                "body": {"text": self.message},
+                "action": {
+                    "button": "Select Option",
+                    "sections": [{
+                        "title": "Options",
+                        "rows": [
+                            {
+                                "id": btn["id"],
+                                "title": btn["title"],
+                                "description": btn.get(
+                                    "description", "")}
+                            for btn in buttons_data[:10]
+                        ]
+                    }]
+                }
+            }
+        else:
+            # Use button message for 3 or fewer options
+            data["interactive"] = {
+                "type": "button",
+                "body": {"text": self.message},
+                "action": {
+                    "buttons": [
+                        {
+                            "type": "reply",
+                            "reply": {
+                                "id": btn["id"],
+                                "title": btn["title"]}
+                        }
+                        for btn in buttons_data[:3]
+                    ]
+                }
+            }
+
+    def _build_flow_payload(self, data: dict[str, Any]):
+        # WhatsApp Flow message
+        if not self.flow:
+            frappe.throw(
+                _("WhatsApp Flow is required for flow content type"))
+        flow_doc = cast(
+            "WhatsAppFlow",
+            frappe.get_doc(
+                "WhatsApp Flow",
+                str(self.flow)))
+
+        if not flow_doc.flow_id:
+            frappe.throw(_(
+                "Flow must be created on WhatsApp before sending"))
+
+        # Determine flow mode - draft flows can be tested with mode:
+        # "draft"
+        flow_mode = None
+        if flow_doc.status != "Published":
+            flow_mode = "draft"
+            frappe.msgprint(
+                _("Sending flow in draft mode (for testing only)"),
+                indicator="orange")
+
+        # Get first screen if not specified
+        flow_screen = self.flow_screen
+        if not flow_screen and flow_doc.screens:
+            first_screen = flow_doc.screens[0]
+            flow_screen = (
+                getattr(first_screen, "screen_id", None)
+                or getattr(first_screen, "screen", None)
+                or getattr(first_screen, "screen_name", None)
+                or getattr(first_screen, "name", None)
+            )
+
+        if not flow_screen:
+            frappe.throw(
+                _("Flow screen is required to send flow message"))
+
+        data["type"] = "interactive"
+        data["interactive"] = {
+            "type": "flow",
+            "body": {
+                "text": self.message or "Please fill out the form"},
+            "action": {
+                "name": "flow",
+                "parameters": {
+                    "flow_message_version": "3",
+                    "flow_id": flow_doc.flow_id,
+                    "flow_cta": (
+                        self.flow_cta or flow_doc.flow_cta or "Open"),
+                    "flow_action": "navigate",
+                    "flow_action_payload": {
+                        "screen": flow_screen
+                    }
+                }
+            }
+        }
+
+        # Add draft mode for testing unpublished flows
+        if flow_mode:
+            data["interactive"]["action"]["parameters"][
+                "mode"] = flow_mode
+
+        # Add flow token - generate one if not provided (required by
+        # WhatsApp)
+        flow_token = self.flow_token or secrets.token_hex(8)
+        data["interactive"]["action"]["parameters"][
+            "flow_token"] = flow_token
+
+    def send_template(self, template: Any = None):
         """Send template."""
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import WhatsAppTemplates  # noqa: E501
+        self.notify(self._build_template_payload(template))
+
+    def _build_template_payload(self, template: Any = None) -> dict[str, Any]:
+        """Build the Meta request body for a template message."""
         if not self.template:
             frappe.throw(_("Template is required to send template message"))
-            return
+            return {}
         template = cast(
-            WhatsAppTemplates,
-            frappe.get_doc("WhatsApp Templates", self.template)
-        )
+            "WhatsAppTemplates",
+            template or _get_cached_template(str(self.template)))
         enforce_marketing_template_compliance(template)
         enforce_template_send_rules(
             template,
-            to_number=str(self.to or ""),
+            to_number=self._formatted_to,
             service_window_active=bool(self.within_conversation_window),
         )
         if template.is_call_permission_request:
@@ -632,7 +772,7 @@ class WhatsAppMessage(Document):
             )
 
             permission = refresh_permission_state(
-                str(self.to or ""), self.whatsapp_account)
+                self._formatted_to, self.whatsapp_account)
             if permission_is_active(permission):
                 permission_status = getattr(
                     permission, "permission_status", None)
@@ -644,16 +784,27 @@ class WhatsAppMessage(Document):
                         "permission. Use the outbound-call workflow instead "
                         "of sending another permission request."
                     ).format(
-                        format_number(self.to),
+                        self._formatted_to,
                         str(permission_status or "active").lower(),
                     ),
                     title=_("Call Permission Already Granted"),
                 )
 
+        ref_doc = None
+
+        def get_ref_doc():
+            # Body parameters and dynamic URL buttons read the same record;
+            # load it once.
+            nonlocal ref_doc
+            if ref_doc is None:
+                ref_doc = frappe.get_doc(
+                    self.reference_doctype, self.reference_name)
+            return ref_doc
+
         components: list[dict[str, Any]] = []
         data: dict[str, Any] = {
             "messaging_product": "whatsapp",
-            "to": format_number(self.to),
+            "to": self._formatted_to,
             "type": "template",
             "template": {
                 "name": template.actual_name or template.template_name,
@@ -662,38 +813,35 @@ class WhatsAppMessage(Document):
         }
 
         if template.sample_values:
-            field_names = (template.field_names.split(",")
-                           if template.field_names else
-                           template.sample_values.split(","))
-            parameters = []
-            template_parameters = []
-
+            field_names = (template.get("parsed_field_names")
+                           or _split_field_names(template))
             if self.body_param is not None:
-                params = list(json.loads(self.body_param).values())
-                for param in params:
-                    parameters.append({"type": "text", "text": param})
-                    template_parameters.append(param)
+                template_parameters = list(
+                    orjson.loads(self.body_param).values())
             elif self.flags.custom_ref_doc:
                 custom_values = self.flags.custom_ref_doc
-                for field_name in field_names:
-                    value = custom_values.get(field_name.strip())
-                    parameters.append({"type": "text", "text": value})
-                    template_parameters.append(value)
-
+                template_parameters = [
+                    custom_values.get(field_name)
+                    for field_name in field_names
+                ]
             else:
                 if not (self.reference_doctype and self.reference_name):
                     frappe.throw(
                         _("Reference Doctype and Reference Name are required"
                           " to fetch template parameters"))
-                    return
-                ref_doc = frappe.get_doc(
-                    self.reference_doctype, self.reference_name)
-                for field_name in field_names:
-                    value = ref_doc.get_formatted(field_name.strip())
-                    parameters.append({"type": "text", "text": value})
-                    template_parameters.append(value)
-
-            self.template_parameters = json.dumps(template_parameters)
+                    return {}
+                ref = get_ref_doc()
+                template_parameters = [
+                    ref.get_formatted(field_name)
+                    for field_name in field_names
+                ]
+
+            parameters = [
+                {"type": "text", "text": value}
+                for value in template_parameters
+            ]
+            self.template_parameters = orjson.dumps(
+                template_parameters, default=str).decode()
             components.append(
                 {
                     "type": "body",
@@ -708,7 +856,7 @@ class WhatsAppMessage(Document):
                     if self.attach.startswith("http"):
                         url = f'{self.attach}'
                     else:
-                        url = f'{get_url()}{self.attach}'
+                        url = f'{_get_base_url()}{self.attach}'
                     components.append({
                         "type": "header",
                         "parameters": [{
@@ -724,7 +872,7 @@ class WhatsAppMessage(Document):
                     if template.sample.startswith("http"):
                         url = f'{template.sample}'
                     else:
-                        url = f'{get_url()}{template.sample}'
+                        url = f'{_get_base_url()}{template.sample}'
                     components.append({
                         "type": "header",
                         "parameters": [{
@@ -763,10 +911,8 @@ class WhatsAppMessage(Document):
                             frappe.throw(
                                 _("Reference Doctype and Reference Name are"
                                   " required to fetch dynamic url"))
-                            return
-                        ref_doc = frappe.get_doc(
-                            self.reference_doctype, self.reference_name)
-                        url = ref_doc.get_formatted(btn.website_url)
+                            return {}
+                        url = get_ref_doc().get_formatted(btn.website_url)
                     button_parameters.append({
                         "type": "button",
                         "sub_type": "url",
@@ -780,7 +926,7 @@ class WhatsAppMessage(Document):
         if components:
             data["template"]["components"] = components
 
-        self.notify(data)
+        return data
 
     def notify(self, data):
         """Notify."""
@@ -788,16 +934,8 @@ class WhatsAppMessage(Document):
             frappe.throw(_("WhatsApp Account is required to send message"))
             return
 
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
-        whatsapp_account = cast(
-            WhatsAppAccount,
-            frappe.get_doc(
-                "WhatsApp Account",
-                self.whatsapp_account,
-            )
-        )
-
-        token = whatsapp_account.get_password("token")
+        account, token = _get_cached_account(str(self.whatsapp_account))
+        whatsapp_account = cast("WhatsAppAccount", account)
 
         headers = {
             "authorization": f"Bearer {token}",
@@ -816,6 +954,11 @@ class WhatsAppMessage(Document):
             json_body=data,
         )
 
+        self._set_message_id_from_response(
+            response_dict, str(whatsapp_account.name))
+
+    def _set_message_id_from_response(
+            self, response_dict: dict[str, Any], account_name: str):
         messages = response_dict.get("messages")
         if isinstance(messages, list) and messages:
             first = messages[0]
@@ -827,7 +970,7 @@ class WhatsAppMessage(Document):
         if not self.message_id:
             frappe.throw(
                 _("WhatsApp Account {0}: Meta did not return a message ID.")
-                .format(whatsapp_account.name)
+                .format(account_name)
             )
 
     def format_number(self, number):
@@ -848,48 +991,31 @@ class WhatsAppMessage(Document):
             frappe.throw(_("WhatsApp Account is required to send message"))
             return
 
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
-        settings = cast(
-            WhatsAppAccount,
-            frappe.get_doc(
-                "WhatsApp Account",
-                self.whatsapp_account
-                )
-        )
-
-        token = settings.get_password("token")
+        account, token = _get_cached_account(str(self.whatsapp_account))
+        settings = cast("WhatsAppAccount", account)
 
         headers = {
             "authorization": f"Bearer {token}",
             "content-type": "application/json",
         }
         try:
-            response = make_post_request(
+            response = request_meta_json(
+                "POST",
                 f"{settings.url}/{settings.version}/" +
                 f"{settings.phone_id}/messages",
+                account_name=str(settings.name),
+                operation=_("read receipt"),
                 headers=headers,
-                data=json.dumps(data),
+                json_body=data,
             )
 
-            if response is None:
-                return None
-
-            response_dict = response
-            if isinstance(response_dict, str):
-                try:
-                    response_dict = json.loads(response_dict)
-                except Exception:
-                    response_dict = {}
-
-            if not isinstance(response_dict, dict):
-                response_dict = {}
-
-            success = response_dict.get("success")
+            # request_meta_json always returns a parsed dict.
+            success = response.get("success")
 
             if success:
                 self.status = "marked as read"
                 self.save()
-                return response_dict.get("success")
+                return success
 
         except Exception:
             integration_json = _get_integration_request_json()
@@ -899,9 +1025,51 @@ class WhatsAppMessage(Document):
             frappe.log_error("WhatsApp API Error", f"{error_message}\n{res}")
 
 
+_PAYLOAD_BUILDERS = {
+    "document": WhatsAppMessage._build_media_payload,
+    "image": WhatsAppMessage._build_media_payload,
+    "video": WhatsAppMessage._build_media_payload,
+    "sticker": WhatsAppMessage._build_sticker_payload,
+    "reaction": WhatsAppMessage._build_reaction_payload,
+    "text": WhatsAppMessage._build_text_payload,
+    "audio": WhatsAppMessage._build_audio_payload,
+    "interactive": WhatsAppMessage._build_interactive_payload,
+    "flow": WhatsAppMessage._build_flow_payload,
+}
+
+
+MESSAGE_INDEXES = (
+    ("reference_doctype_reference_name_index",
+     ["reference_doctype", "reference_name"]),
+    # Bulk progress and retry queries filter on both columns.
+    ("bulk_message_reference_status_index",
+     ["bulk_message_reference", "status"]),
+    # The 24-hour window check reads a contact's latest incoming message.
+    ("from_type_account_creation_index",
+     ["from", "type", "whatsapp_account", "creation"]),
+)
+
+
+def _quote_column(fieldname: str) -> str:
+    """Quote a column name for DDL in the site's database dialect.
+
+    ``add_index`` joins the field names into the statement as given, and
+    ``from`` is a reserved word on both MariaDB and Postgres.
+    """
+    quote = '"' if frappe.db.db_type == "postgres" else "`"
+    return f"{quote}{fieldname}{quote}"
+
+
 def on_doctype_update():
-    frappe.db.add_index(
-        "WhatsApp Message", ["reference_doctype", "reference_name"])
+    # Check the existing indexes first so a migrate on a large message
+    # table only pays for a SHOW INDEX, never a redundant ALTER TABLE.
+    for index_name, fields in MESSAGE_INDEXES:
+        if not frappe.db.has_index("tabWhatsApp Message", index_name):
+            frappe.db.add_index(
+                "WhatsApp Message",
+                [_quote_column(field) for field in fields],
+                index_name=index_name,
+            )
 
 
 @frappe.whitelist()
@@ -921,3 +1089,102 @@ def send_template(to, reference_doctype, reference_name, template):
         doc.save()
     except Exception as e:
         raise e
+
+
+@frappe.whitelist()
+def send_template_bulk(recipients, reference_doctype, reference_name,
+                       template):
+    """Send one template to many numbers, overlapping the Meta requests.
+
+    Every message passes the same consent and window checks as
+    ``send_template`` and is saved as a regular WhatsApp Message once Meta
+    returns its ID; only the HTTP round trips run concurrently.
+    Recipients that fail are skipped and reported.
+    """
+    # Messages leave before any row is inserted, so check up front rather
+    # than relying on the permission check inside ``doc.insert()``.
+    frappe.has_permission("WhatsApp Message", "create", throw=True)
+
+    if isinstance(recipients, str):
+        recipients = json.loads(recipients)
+
+    failed: list[dict[str, str]] = []
+
+    def _fail(to: Any, error: str, message_count: int):
+        # The failure is reported in the return value; drop the msgprint
+        # popups frappe.throw queued for it.
+        frappe.local.message_log = frappe.local.message_log[:message_count]
+        failed.append({"to": str(to), "error": error})
+
+    by_account: dict[str, list[tuple[Any, dict[str, Any]]]] = {}
+    for to in recipients or []:
+        doc = cast(WhatsAppMessage, frappe.get_doc({
+            "doctype": "WhatsApp Message",
+            "to": to,
+            "type": "Outgoing",
+            "message_type": "Template",
+            "reference_doctype": reference_doctype,
+            "reference_name": reference_name,
+            "content_type": "text",
+            "template": template
+        }))
+        message_count = len(frappe.local.message_log)
+        try:
+            doc.set_whatsapp_account()
+            payload = doc._build_template_payload(doc._run_send_checks())
+        except frappe.ValidationError as e:
+            _fail(to, str(e), message_count)
+            continue
+        by_account.setdefault(str(doc.whatsapp_account), []).append(
+            (doc, payload))
+
+    sent: list[str] = []
+    for account_name, items in by_account.items():
+        account, token = _get_cached_account(account_name)
+        results = request_meta_json_many(
+            "POST",
+            f"{account.url}/{account.version}/{account.phone_id}/messages",
+            account_name=account_name,
+            operation=_("message send"),
+            headers={"authorization": f"Bearer {token}"},
+            json_bodies=[payload for _doc, payload in items],
+            max_workers=cint(frappe.conf.get(
+                "whatsapp_bulk_send_workers", BULK_SEND_WORKERS)),
+        )
+        for (doc, _payload), (response_dict, error) in zip(items, results):
+            message_count = len(frappe.local.message_log)
+            if not error:
+                try:
+                    doc._set_message_id_from_response(
+                        response_dict, account_name)
+                except frappe.ValidationError as e:
+                    error = str(e)
+            if error:
+                _fail(doc.to, error, message_count)
+                continue
+            # message_id is set, so before_insert records the row
+            # without sending it again.
+            doc.status = "Success"
+            frappe.db.savepoint("whatsapp_bulk_template_insert")
+            try:
+                doc.insert()
+            except Exception:
+                # Already sent; undo this row only, log it and keep
+                # recording the rest.
+                frappe.db.rollback(save_point="whatsapp_bulk_template_insert")
+                frappe.log_error(
+                    title="WhatsApp bulk template message not saved",
+                    message=(
+                        f"Sent to {doc.to} as {doc.message_id}\n"
+                        f"{frappe.get_traceback()}"
+                    ),
+                )
+                _fail(
+                    doc.to,
+                    _("Sent, but the message could not be saved."),
+                    message_count,
+                )
+                continue
+            sent.append(str(doc.name))
+
+    return {"sent": sent, "failed": failed}
@@ -7,11 +7,23 @@ import frappe
 from frappe.tests.utils import FrappeTestCase
 
 from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification.whatsapp_notification import (  # noqa: E501
+    NOTIFICATION_LOG_JOB,
     WhatsAppNotification,
+    _load_account_endpoint,
 )
 
 
 class TestWhatsAppNotification(FrappeTestCase):
+    def setUp(self):
+        # Account endpoints are memoized per request on frappe.local and
+        # per process; each test mocks its own account.
+        frappe.local.whatsapp_notification_accounts = {}
+        _load_account_endpoint.cache_clear()
+
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification."
+        "whatsapp_notification.frappe.enqueue"
+    )
     @patch(
         "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification."
         "whatsapp_notification.frappe.msgprint"
@@ -25,7 +37,7 @@ class TestWhatsAppNotification(FrappeTestCase):
         "whatsapp_notification.frappe.get_doc"
     )
     def test_scheduled_failure_uses_detailed_meta_error(
-        self, mock_get_doc, mock_request, mock_msgprint
+        self, mock_get_doc, mock_request, mock_msgprint, mock_enqueue
     ):
         account = frappe._dict({
             "name": "Test Account",
@@ -34,13 +46,10 @@ class TestWhatsAppNotification(FrappeTestCase):
             "phone_id": "phone-123",
         })
         account.get_password = lambda _fieldname: "token-123"
-        notification_log = MagicMock()
 
         def get_doc(doctype, *args):
             if doctype == "WhatsApp Account":
                 return account
-            if isinstance(doctype, dict):
-                return notification_log
             raise AssertionError(f"Unexpected get_doc call: {doctype}, {args}")
 
         mock_get_doc.side_effect = get_doc
@@ -68,4 +77,74 @@ class TestWhatsAppNotification(FrappeTestCase):
         self.assertNotIn("components", payload["template"])
         self.assertEqual(mock_request.call_args.kwargs["json_body"], payload)
         self.assertIn(detail, mock_msgprint.call_args.args[0])
-        notification_log.insert.assert_called_once_with(ignore_permissions=True)
+        mock_enqueue.assert_called_once()
+        self.assertIn(
+            detail, mock_enqueue.call_args.kwargs["logs"][0])
+
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification."
+        "whatsapp_notification.frappe.enqueue"
+    )
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification."
+        "whatsapp_notification.frappe.msgprint"
+    )
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification."
+        "whatsapp_notification.request_meta_json_many"
+    )
+    @patch(
+        "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification."
+        "whatsapp_notification.frappe.get_doc"
+    )
+    def test_batched_sends_are_dispatched_together_and_logged(
+        self, mock_get_doc, mock_request_many, _mock_msgprint,
+        mock_enqueue
+    ):
+        account = frappe._dict({
+            "name": "Test Account",
+            "url": "https://graph.facebook.com",
+            "version": "v24.0",
+            "phone_id": "phone-123",
+        })
+        account.get_password = lambda _fieldname: "token-123"
+        created = []
+
+        def get_doc(doctype, *args):
+            if doctype == "WhatsApp Account":
+                return account
+            if isinstance(doctype, dict):
+                created.append(doctype["doctype"])
+                return MagicMock()
+            raise AssertionError(f"Unexpected get_doc call: {doctype}, {args}")
+
+        mock_get_doc.side_effect = get_doc
+        mock_request_many.return_value = [
+            ({"messages": [{"id": "wamid.1"}]}, None),
+            ({}, "Invalid number"),
+        ]
+        notification = WhatsAppNotification({
+            "doctype": "WhatsApp Notification",
+            "template": "test-template",
+        })
+
+        notification._open_batch()
+        for to in ("111", "222"):
+            notification.notify(
+                {"to": to, "template": {"name": "test-template"}},
+                template_account="Test Account",
+            )
+        mock_request_many.assert_not_called()
+        notification._flush_batch()
+
+        mock_request_many.assert_called_once()
+        self.assertEqual(
+            [body["to"] for body in
+             mock_request_many.call_args.kwargs["json_bodies"]],
+            ["111", "222"],
+        )
+        self.assertEqual(created, ["WhatsApp Message"])
+        mock_enqueue.assert_called_once()
+        self.assertEqual(
+            mock_enqueue.call_args.args[0], NOTIFICATION_LOG_JOB)
+        self.assertEqual(len(mock_enqueue.call_args.kwargs["logs"]), 2)
@@ -1,21 +1,29 @@
 """Notification."""
 
-import json
+import orjson
+from functools import lru_cache
+
 import frappe
 
 from frappe import _
 from frappe.model.document import Document
 from frappe.utils.safe_exec import get_safe_globals, safe_exec
 from frappe.desk.form.utils import get_pdf_link
-from frappe.utils import add_to_date, now_datetime, datetime, \
+from frappe.utils import add_to_date, now, now_datetime, datetime, \
     get_url, cint, get_datetime
 from frappe.model import numeric_fieldtypes
 from datetime import datetime as py_datetime, time as py_time
 
 from frappe_whatsapp.utils import get_whatsapp_account
-from frappe_whatsapp.utils.meta import request_meta_json
+from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import (  # noqa: E501
+    get_account_cache_generation,
+)
+from frappe_whatsapp.utils.meta import (
+    request_meta_json, request_meta_json_many)
 from frappe_whatsapp.utils.consent import (
+    ConsentResult,
     verify_consent_for_send,
+    verify_consent_for_send_many,
     enforce_marketing_template_compliance,
     enforce_template_send_rules,
     # NOTE: service-window bypass (get_service_window_status) is intentionally
@@ -24,7 +32,27 @@ from frappe_whatsapp.utils.consent import (
     # conversation.  The 24-hour service-window consent bypass applies only
     # to the WhatsAppMessage outbound-reply path.
 )
-from typing import Any, cast, TypedDict, Optional
+from typing import TYPE_CHECKING, Any, Callable, cast, TypedDict, Optional
+
+if TYPE_CHECKING:
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import WhatsAppTemplates  # noqa
+
+
+# Messages per second for batched scheduled sends (conf:
+# whatsapp_notification_mps). Meta allows more on higher throughput tiers.
+NOTIFICATION_MPS = 50
+NOTIFICATION_MAX_WORKERS = 32
+DAILY_PAGE_SIZE = 50
+
+# Field types whose formatted value equals the stored one, so scheduled
+# sends can read them from get_all rows without loading the document.
+PLAIN_TEXT_FIELDTYPES = ("Data", "Phone", "Link", "Dynamic Link")
+
+NOTIFICATION_LOG_JOB = (
+    "frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification"
+    ".whatsapp_notification.write_notification_logs"
+)
 
 
 class WhatsAppAPIMessage(TypedDict, total=False):
@@ -55,16 +83,92 @@ def _first_message_id(resp: dict[str, Any]) -> Optional[str]:
     return msg_id if isinstance(msg_id, str) and msg_id else None
 
 
-def _integration_request_json() -> dict[str, Any]:
-    """Safely read frappe.flags.integration_request.json() if present."""
-    ir = getattr(frappe.flags, "integration_request", None)
-    if ir is None:
-        return {}
-    json_func = getattr(ir, "json", None)
-    if not callable(json_func):
-        return {}
-    raw = json_func()
-    return _as_dict(raw)
+def _row_value(value: Any) -> Any:
+    """Parameter text for a raw row value.
+
+    Rows only carry plain text fields, which get_formatted would render
+    as-is ("" for None); dates are stringified.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return str(value)
+    return value
+
+
+def _drop_empty_components(data: dict[str, Any]) -> None:
+    """Meta rejects an empty ``components`` list; omit it instead."""
+    template_payload = data.get("template")
+    if (
+        isinstance(template_payload, dict)
+        and template_payload.get("components") == []
+    ):
+        template_payload.pop("components", None)
+
+
+def _get_account_endpoint(
+        account_name: str | None) -> tuple[str, str, dict[str, str]] | None:
+    """Return ``(account name, messages URL, headers)`` for a send.
+
+    Memoized on ``frappe.local`` for the current run and, behind that, per
+    worker process until any WhatsApp Account changes (see
+    ``get_account_cache_generation``), so the account is loaded and its
+    token decrypted once rather than per recipient. ``None`` selects the
+    default outgoing account.
+    """
+    cache = getattr(frappe.local, "whatsapp_notification_accounts", None)
+    if cache is None:
+        cache = frappe.local.whatsapp_notification_accounts = {}
+
+    key = account_name or ""
+    if key not in cache:
+        cache[key] = _load_account_endpoint(
+            frappe.local.site, key, get_account_cache_generation())
+    return cache[key]
+
+
+def write_notification_logs(
+        template: str, logs: list[str], timestamp: str) -> None:
+    """Background job: insert WhatsApp Notification Log rows in one go."""
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "WhatsApp Notification Log",
+        fields=["name", "creation", "modified", "owner",
+                "modified_by", "template", "meta_data"],
+        values=[
+            (frappe.generate_hash(length=10), timestamp, timestamp,
+             user, user, template, meta_json)
+            for meta_json in logs
+        ],
+    )
+
+
+@lru_cache(maxsize=16)
+def _load_account_endpoint(
+        site: str, account_name: str, generation: str
+) -> tuple[str, str, dict[str, str]] | None:
+    """Build the endpoint bundle; ``site`` and ``generation`` only key the
+    cache."""
+    if account_name:
+        whatsapp_account = frappe.get_doc(
+            "WhatsApp Account",
+            account_name)
+    else:
+        whatsapp_account = get_whatsapp_account(account_type="outgoing")
+
+    wa = cast("Optional[WhatsAppAccount]", whatsapp_account)
+    if not wa:
+        return None
+
+    token = wa.get_password("token")
+    return (
+        str(wa.name),
+        f"{wa.url}/{wa.version}/{wa.phone_id}/messages",
+        {
+            "authorization": f"Bearer {token}",
+            "content-type": "application/json",
+        },
+    )
 
 
 class WhatsAppNotification(Document):
@@ -116,11 +220,14 @@ class WhatsAppNotification(Document):
           fields).
         - Provide clear, actionable error messages.
         """
-        self._validate_doctype_event_field()
-        self._validate_custom_attachment_config()
-        self._validate_set_property_after_alert_field()
-
-    def _validate_doctype_event_field(self) -> None:
+        meta = (
+            frappe.get_meta(self.reference_doctype)
+            if self.reference_doctype else None)
+        self._validate_doctype_event_field(meta)
+        self._validate_custom_attachment_config(meta)
+        self._validate_set_property_after_alert_field(meta)
+
+    def _validate_doctype_event_field(self, meta: Any) -> None:
         """For DocType Event notifications, validate that field_name exists
         on reference_doctype."""
         if self.notification_type != "DocType Event":
@@ -136,8 +243,6 @@ class WhatsAppNotification(Document):
         if not self.reference_doctype:
             frappe.throw(_("Please set Reference DocType."))
 
-        meta = frappe.get_meta(self.reference_doctype)
-
         # meta.get_field returns DocField | None; safe and type-checker
         # friendly.
         if meta.get_field(self.field_name) is None:
@@ -148,7 +253,7 @@ class WhatsAppNotification(Document):
                 )
             )
 
-    def _validate_custom_attachment_config(self) -> None:
+    def _validate_custom_attachment_config(self, meta: Any) -> None:
         """If custom_attachment is enabled, require either attach
         or attach_from_field."""
         if not self.custom_attachment:
@@ -171,7 +276,6 @@ class WhatsAppNotification(Document):
                     _("Please set Reference DocType"
                       " to use Attach from field."))
 
-            meta = frappe.get_meta(self.reference_doctype)
             if meta.get_field(self.attach_from_field) is None:
                 frappe.throw(
                     _("Attach from field {0} not found on DocType {1}."
@@ -181,7 +285,7 @@ class WhatsAppNotification(Document):
                     )
                 )
 
-    def _validate_set_property_after_alert_field(self) -> None:
+    def _validate_set_property_after_alert_field(self, meta: Any) -> None:
         """If set_property_after_alert is set, ensure the field exists on
         reference_doctype."""
         if not self.set_property_after_alert:
@@ -190,7 +294,6 @@ class WhatsAppNotification(Document):
         if not self.reference_doctype:
             frappe.throw(_("Please set Reference DocType."))
 
-        meta = frappe.get_meta(self.reference_doctype)
         if meta.get_field(self.set_property_after_alert) is None:
             frappe.throw(
                 _("Field {0} not found on DocType {1}.").format(
@@ -223,10 +326,9 @@ class WhatsAppNotification(Document):
                 "reason": "no_template_selected",
                 "sent": 0}
 
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import WhatsAppTemplates  # noqa
 
         template = cast(
-            WhatsAppTemplates,
+            "WhatsAppTemplates",
             frappe.get_doc("WhatsApp Templates", self.template))
         enforce_marketing_template_compliance(template)
 
@@ -248,7 +350,11 @@ class WhatsAppNotification(Document):
             # (send_simple_template expects self._contact_list)
             # If you want to remove reliance on dynamic attributes, pass it in.
             self._contact_list = contact_list  # keep backward compatibility
-            self.send_simple_template(template)
+            self._open_batch()
+            try:
+                self.send_simple_template(template)
+            finally:
+                self._flush_batch()
             sent = len(contact_list)
 
             return {
@@ -259,24 +365,32 @@ class WhatsAppNotification(Document):
         if isinstance(data_list, list) and data_list:
             # allow send a dynamic template using schedule event config
             # expected list items: {"name": "...", "phone_no": "..."}
-            for item in data_list:
-                if not isinstance(item, dict):
-                    continue
-
-                docname = item.get("name")
-                phone_no = item.get("phone_no")
-
-                if not docname:
-                    continue
-
-                doc = frappe.get_doc(self.reference_doctype, docname)
-                self.send_template_message(
-                    doc,
-                    phone_no=phone_no,
-                    default_template=template,
-                    ignore_condition=True,
-                )
-                sent += 1
+            self._open_batch()
+            try:
+                self._prefetch_consent(template, [
+                    item.get("phone_no") for item in data_list
+                    if isinstance(item, dict)
+                ])
+                for item in data_list:
+                    if not isinstance(item, dict):
+                        continue
+
+                    docname = item.get("name")
+                    phone_no = item.get("phone_no")
+
+                    if not docname:
+                        continue
+
+                    doc = frappe.get_doc(self.reference_doctype, docname)
+                    self.send_template_message(
+                        doc,
+                        phone_no=phone_no,
+                        default_template=template,
+                        ignore_condition=True,
+                    )
+                    sent += 1
+            finally:
+                self._flush_batch()
 
             return {"status": "ok", "mode": "data_list", "sent": sent}
 
@@ -288,7 +402,12 @@ class WhatsAppNotification(Document):
 
     def send_simple_template(self, template):
         """ send simple template without a doc to get field data """
-        for contact in self._contact_list:
+        contacts = [
+            (contact, self.format_number(contact))
+            for contact in self._contact_list
+        ]
+        self._prefetch_consent(template, [c for c, _ in contacts])
+        for contact, formatted in contacts:
             try:
                 enforce_template_send_rules(template, to_number=contact)
             except Exception as exc:
@@ -297,14 +416,7 @@ class WhatsAppNotification(Document):
                 continue
             # Consent check: skip recipients who haven't consented
             if self.check_consent_before_send:
-                result = verify_consent_for_send(
-                    str(contact),
-                    consent_category=self.required_consent_category,
-                    is_transactional=bool(self.is_transactional),
-                    is_consent_request=bool(
-                        getattr(template, "is_consent_request", 0)
-                    ),
-                )
+                result = self._verify_consent(contact, template)
                 if not result.allowed:
                     frappe.logger().info(
                         f"Skipping {contact}: {result.reason}")
@@ -312,7 +424,7 @@ class WhatsAppNotification(Document):
 
             data = {
                 "messaging_product": "whatsapp",
-                "to": self.format_number(contact),
+                "to": formatted,
                 "type": "template",
                 "template": {
                     "name": template.actual_name,
@@ -327,29 +439,38 @@ class WhatsAppNotification(Document):
                 data, template_account=template.whatsapp_account)
 
     def send_template_message(
-            self, doc: Document, phone_no=None,
+            self, doc: Document | dict[str, Any], phone_no=None,
             default_template=None, ignore_condition=False):
-        """Specific to Document Event triggered Server Scripts."""
+        """Specific to Document Event triggered Server Scripts.
+
+        ``doc`` may also be a plain row from ``_row_fields`` when
+        ``_can_send_from_row`` allows it.
+        """
         if self.disabled:
             return
 
-        doc_data = doc.as_dict()
         if self.condition and not ignore_condition:
-            # check if condition satisfies
+            # check if condition satisfies; only the condition needs the
+            # full field namespace of a Document.
+            namespace = doc.as_dict() if isinstance(doc, Document) else doc
             if not frappe.safe_eval(
-                self.condition, get_safe_globals(), dict(doc=doc_data)
+                self.condition, self._get_safe_globals(), dict(doc=namespace)
             ):
                 return
 
+        # Everything past the condition reads single fields via doc.get();
+        # the message log only needs the reference.
+        doc_data: dict[str, Any] = {
+            "doctype": doc.get("doctype"), "name": doc.get("name")}
+
         template = default_template or frappe.get_doc(
             "WhatsApp Templates", self.template)
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import WhatsAppTemplates  # noqa
-        template = cast(WhatsAppTemplates, template)
+        template = cast("WhatsAppTemplates", template)
         enforce_marketing_template_compliance(template)
 
         if template:
             if self.field_name:
-                phone_number = phone_no or doc_data[self.field_name]
+                phone_number = phone_no or doc.get(self.field_name)
             else:
                 phone_number = phone_no
 
@@ -358,226 +479,446 @@ class WhatsAppNotification(Document):
 
             # Consent check: skip if recipient hasn't consented
             if self.check_consent_before_send and phone_number:
-                result = verify_consent_for_send(
-                    str(phone_number),
-                    consent_category=self.required_consent_category,
-                    is_transactional=bool(self.is_transactional),
-                    is_consent_request=bool(
-                        getattr(template, "is_consent_request", 0)
-                    ),
-                )
+                result = self._verify_consent(phone_number, template)
                 if not result.allowed:
                     frappe.logger().info(
                         f"Skipping notification to"
                         f" {phone_number}: {result.reason}")
                     return
 
-            data = {
-                "messaging_product": "whatsapp",
-                "to": self.format_number(phone_number),
-                "type": "template",
-                "template": {
-                    "name": template.actual_name,
-                    "language": {
-                        "code": template.language_code
-                    },
-                    "components": []
-                }
-            }
+            content_type, build_payload = self._get_payload_builder(
+                template)
+            data, body_texts = build_payload(
+                doc, doc_data, self.format_number(phone_number))
+            self.content_type = content_type
 
-            # Pass parameter values
-            if self.fields:
-                parameters = []
-                for field in self.fields:
-                    if isinstance(doc, Document):
-                        # get field with prettier value.
-                        value = doc.get_formatted(field.field_name)
-                    else:
-                        value = doc_data[field.field_name]
-                        if isinstance(
-                                doc_data[field.field_name],
-                                (datetime.date, datetime.datetime)):
-                            value = str(doc_data[field.field_name])
-
-                    parameters.append({
-                        "type": "text",
-                        "text": value
-                    })
-
-                data['template']["components"] = [{
-                    "type": "body",
-                    "parameters": parameters
-                }]
+            self.notify(
+                data, doc_data,
+                template_account=template.whatsapp_account,
+                body_texts=body_texts)
 
-            url = ""
-            filename = ""
+    def _prefetch_consent(
+            self, template: "WhatsAppTemplates", phone_numbers: list
+    ) -> None:
+        """Check consent for a batch's recipients with one lookup.
 
-            if self.attach_document_print:
-                key = doc.get_document_share_key()  # noqa
-                frappe.db.commit()
+        ``_verify_consent`` answers from these results until the batch is
+        flushed; numbers not prefetched are still checked one by one.
+        """
+        if not self.check_consent_before_send:
+            return
+        cache = self.__dict__.setdefault("_consent_results", {})
+        cache.update(verify_consent_for_send_many(
+            [str(n) for n in phone_numbers if n and str(n) not in cache],
+            consent_category=self.required_consent_category,
+            is_transactional=bool(self.is_transactional),
+            is_consent_request=bool(
+                getattr(template, "is_consent_request", 0)),
+        ))
+
+    def _verify_consent(
+            self, phone_number: Any, template: "WhatsAppTemplates"
+    ) -> ConsentResult:
+        result = self.__dict__.get("_consent_results", {}).get(
+            str(phone_number))
+        if result is None:
+            result = verify_consent_for_send(
+                str(phone_number),
+                consent_category=self.required_consent_category,
+                is_transactional=bool(self.is_transactional),
+                is_consent_request=bool(
+                    getattr(template, "is_consent_request", 0)
+                ),
+            )
+        return result
 
-                doctype_name = cast(str, doc_data.get("doctype") or "")
-                doc_name = cast(str, doc_data.get("name") or "")
+    def _get_payload_builder(
+            self, template: "WhatsAppTemplates"
+    ) -> tuple[str, Callable[..., tuple[dict[str, Any], list[str] | None]]]:
+        """Payload builder for ``template``, built once per run.
 
-                if not doctype_name or not doc_name:
-                    frappe.throw(_(
-                        "Missing doctype or name for PDF attachment."))
+        Keyed on the template's ``modified`` so an edited template gets a
+        fresh builder.
+        """
+        cache = self.__dict__.setdefault("_payload_builders", {})
+        key = (template.name, str(template.modified))
+        if key not in cache:
+            cache[key] = self._build_payload_builder(template)
+        return cache[key]
+
+    def _build_payload_builder(
+            self, template: "WhatsAppTemplates"
+    ) -> tuple[str, Callable[..., tuple[dict[str, Any], list[str] | None]]]:
+        """Resolve the per-template choices of a send up front.
+
+        Returns the message content type and a ``build(doc, doc_data, to)``
+        closure giving the request body and the body parameter texts. The
+        closure only reads document values; which components exist, the
+        body fields and the dynamic button fields are fixed here.
+        """
+        template_name = template.actual_name
+        language_code = template.language_code
+        field_names = (
+            [field.field_name for field in self.fields]
+            if self.fields else None)
+
+        header_type = template.header_type
+        content_type = {
+            "DOCUMENT": "document", "IMAGE": "image"}.get(header_type, "text")
+
+        dynamic_indexes = [
+            str(idx) for idx, btn in enumerate(template.buttons or [])
+            if btn.button_type == "Visit Website"
+            and btn.url_type == "Dynamic"
+        ]
+        button_fields = (
+            self.button_fields.split(",") if self.button_fields else [])
+        # Dynamic URL buttons take the button fields in order.
+        dynamic_buttons = list(zip(dynamic_indexes, button_fields))
+
+        def build(doc, doc_data, to):
+            components: list[dict[str, Any]] = []
+            body_texts: list[str] | None = None
+
+            if field_names is not None:
+                if isinstance(doc, Document):
+                    # get field with prettier value.
+                    values = [doc.get_formatted(f) for f in field_names]
+                else:
+                    values = [_row_value(doc.get(f)) for f in field_names]
+                components.append({
+                    "type": "body",
+                    "parameters": [
+                        {"type": "text", "text": value} for value in values
+                    ],
+                })
+                # What the message log records; same filter as the
+                # fallback walk in _record_send.
+                body_texts = [
+                    value for value in values
+                    if isinstance(value, str) and value
+                ]
+
+            if content_type == "document":
+                url, filename = self._get_attachment(doc, doc_data)
+                components.append({
+                    "type": "header",
+                    "parameters": [{
+                        "type": "document",
+                        "document": {"link": url, "filename": filename},
+                    }],
+                })
+            elif content_type == "image":
+                url, _filename = self._get_attachment(doc, doc_data)
+                components.append({
+                    "type": "header",
+                    "parameters": [{"type": "image", "image": {"link": url}}],
+                })
 
-                print_format: str = "Standard"
+            for index, fieldname in dynamic_buttons:
+                components.append({
+                    "type": "button",
+                    "sub_type": "url",
+                    "index": index,
+                    "parameters": [
+                        {"type": "text", "text": doc.get(fieldname)}
+                    ],
+                })
+
+            return {
+                "messaging_product": "whatsapp",
+                "to": to,
+                "type": "template",
+                "template": {
+                    "name": template_name,
+                    "language": {"code": language_code},
+                    "components": components,
+                },
+            }, body_texts
+
+        return content_type, build
+
+    def _get_attachment(
+            self, doc: Document | dict[str, Any],
+            doc_data: dict[str, Any]) -> tuple[str, str]:
+        """Link and file name for a document or image header."""
+        url = ""
+        filename = ""
+
+        if self.attach_document_print:
+            key = doc.get_document_share_key()  # noqa
+            # Meta fetches the PDF as soon as the message is sent, so
+            # the new share key must be committed first. A batch
+            # commits once for all its keys in _flush_batch.
+            if getattr(self, "_pending_sends", None) is None:
+                frappe.db.commit()
 
-                from frappe.core.doctype.doctype.doctype import DocType
-                doctype = cast(
-                    DocType,
-                    frappe.get_doc("DocType", doctype_name))
+            doctype_name = cast(str, doc_data.get("doctype") or "")
+            doc_name = cast(str, doc_data.get("name") or "")
 
-                if doctype.custom:
-                    # default_print_format is usually str|None, but
-                    # we still narrow
-                    if (isinstance(doctype.default_print_format, str) and
-                            doctype.default_print_format):
-                        print_format = doctype.default_print_format
-                else:
-                    raw_default: Any = frappe.db.get_value(
-                        "Property Setter",
-                        filters={
-                            "doc_type": doctype_name,
-                            "property": "default_print_format"},
-                        fieldname="value",
-                    )
-                    # The important part: enforce str
-                    if isinstance(raw_default, str) and raw_default:
-                        print_format = raw_default
-
-                link = get_pdf_link(
-                    doctype_name,
-                    doc_name,
-                    print_format=print_format,  # always str now
-                )
+            if not doctype_name or not doc_name:
+                frappe.throw(_(
+                    "Missing doctype or name for PDF attachment."))
 
-                filename = f"{doc_name}.pdf"
-                url = f"{get_url()}{link}&key={key}"
+            print_format = self._get_print_format(doctype_name)
 
-            elif self.custom_attachment:
-                filename = self.file_name
+            link = get_pdf_link(
+                doctype_name,
+                doc_name,
+                print_format=print_format,  # always str now
+            )
 
-                if self.attach_from_field:
-                    file_url = doc_data.get(self.attach_from_field) or ""
-                    if file_url and not file_url.startswith("http"):
-                        # get share key so that private files can be sent
-                        key = doc.get_document_share_key()
-                        file_url = f'{get_url()}{file_url}&key={key}'
-                else:
-                    file_url = self.attach
+            filename = f"{doc_name}.pdf"
+            url = f"{self._get_site_url()}{link}&key={key}"
 
-                if file_url and file_url.startswith("http"):
-                    url = f'{file_url}'
-                else:
-                    url = f'{get_url()}{file_url}'
+        elif self.custom_attachment:
+            filename = self.file_name
 
-            if template.header_type == 'DOCUMENT':
-                data['template']['components'].append({
-                    "type": "header",
-                    "parameters": [{
-                        "type": "document",
-                        "document": {
-                            "link": url,
-                            "filename": filename
-                        }
-                    }]
-                })
-                self.content_type = "document"
-            elif template.header_type == 'IMAGE':
-                data['template']['components'].append({
-                    "type": "header",
-                    "parameters": [{
-                        "type": "image",
-                        "image": {
-                            "link": url
-                        }
-                    }]
-                })
-                self.content_type = "image"
+            if self.attach_from_field:
+                file_url = doc.get(self.attach_from_field) or ""
+                if file_url and not file_url.startswith("http"):
+                    # get share key so that private files can be sent
+                    key = doc.get_document_share_key()
+                    file_url = (
+                        f'{self._get_site_url()}{file_url}&key={key}')
             else:
-                # Default to text for empty or TEXT header types
-                self.content_type = "text"
+                file_url = self.attach
 
-            if template.buttons:
-                button_fields = self.button_fields.split(
-                    ",") if self.button_fields else []
-                for idx, btn in enumerate(template.buttons):
-                    if (btn.button_type == "Visit Website"
-                            and btn.url_type == "Dynamic"):
-                        if button_fields:
-                            data['template']['components'].append({
-                                "type": "button",
-                                "sub_type": "url",
-                                "index": str(idx),
-                                "parameters": [
-                                    {"type": "text",
-                                     "text": doc.get(button_fields.pop(0))}
-                                ]
-                            })
+            if file_url and file_url.startswith("http"):
+                url = f'{file_url}'
+            else:
+                url = f'{self._get_site_url()}{file_url}'
 
-            self.notify(
-                data, doc_data,
-                template_account=template.whatsapp_account)
+        return url, filename
 
     def notify(
             self,
             data: dict[str, Any],
             doc_data: dict[str, Any] | None = None,
-            template_account: str | None = None) -> None:
+            template_account: str | None = None,
+            body_texts: list[str] | None = None) -> None:
         """Notify.
 
         Sends a WhatsApp template message via Meta endpoint and logs result.
+        While a batch is open (see ``_open_batch``) the send is queued and
+        dispatched concurrently by ``_flush_batch`` instead.
 
-        Type-safety goals:
-        - avoid subscripting unknown/None responses
-        - avoid assuming integration_request exists
-        - ensure message_id extraction is safe
+        ``body_texts`` are the body parameter values when the caller already
+        has them; otherwise they are read back out of ``data``.
         """
+        pending = getattr(self, "_pending_sends", None)
+        if pending is not None:
+            pending.append((
+                data, doc_data, template_account,
+                self.get("content_type"), body_texts))
+            return
+
         # Use template's whatsapp account if available, otherwise default
         # outgoing account
-        if template_account:
-            whatsapp_account = frappe.get_doc(
-                "WhatsApp Account",
-                template_account)
-        else:
-            whatsapp_account = get_whatsapp_account(account_type="outgoing")
-
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa
-        wa = cast(Optional[WhatsAppAccount], whatsapp_account)
-
-        if not wa:
+        endpoint = _get_account_endpoint(template_account)
+        if not endpoint:
             frappe.throw(_("Please set a default outgoing WhatsApp Account"))
             return
+        account_name, request_url, headers = endpoint
 
-        token = wa.get_password("token")
+        _drop_empty_components(data)
+        response: dict[str, Any] = {}
+        error_message = None
+        try:
+            response = request_meta_json(
+                "POST",
+                request_url,
+                account_name=account_name,
+                operation=_("scheduled notification send"),
+                headers=headers,
+                json_body=data,
+            )
+        except Exception as e:
+            error_message = str(e)
 
-        headers: dict[str, str] = {
-            "authorization": f"Bearer {token}",
-            "content-type": "application/json",
-        }
+        self._record_send(
+            data, doc_data, account_name, response, error_message,
+            body_texts=body_texts)
 
-        error_message = ""
-        meta_json = ""
+    def _open_batch(self) -> None:
+        """Queue notify() calls until ``_flush_batch``."""
+        self._pending_sends: list[tuple] | None = []
+
+    def _flush_batch(self) -> None:
+        """Send the queued notifications concurrently, then record each.
 
+        Only the Meta round trips overlap, capped at the configured messages
+        per second; message rows, property updates and logs are written on
+        this thread.
+        """
+        pending = getattr(self, "_pending_sends", None) or []
+        self._pending_sends = None
+        self.__dict__.pop("_consent_results", None)
+
+        if pending and self.attach_document_print:
+            # Publish every share key created while queueing in one commit.
+            frappe.db.commit()
+
+        by_account: dict[str, list[tuple]] = {}
+        for item in pending:
+            by_account.setdefault(item[2] or "", []).append(item)
+
+        self._pending_logs: list[str] | None = []
+        self._pending_property_updates: dict[tuple, list[str]] | None = {}
         try:
-            template_payload = data.get("template")
-            if (
-                isinstance(template_payload, dict)
-                and template_payload.get("components") == []
-            ):
-                template_payload.pop("components", None)
+            self._send_batch(by_account)
+        finally:
+            self._write_batch_records()
+
+    def _send_batch(self, by_account: dict[str, list[tuple]]) -> None:
+        mps = cint(frappe.conf.get(
+            "whatsapp_notification_mps", NOTIFICATION_MPS)) or NOTIFICATION_MPS
+        for account_key, items in by_account.items():
+            endpoint = _get_account_endpoint(account_key or None)
+            if not endpoint:
+                frappe.throw(
+                    _("Please set a default outgoing WhatsApp Account"))
+                return
+            account_name, request_url, headers = endpoint
 
-            response = request_meta_json(
+            for item in items:
+                _drop_empty_components(item[0])
+            results = request_meta_json_many(
                 "POST",
-                f"{wa.url}/{wa.version}/{wa.phone_id}/messages",
-                account_name=str(wa.name),
+                request_url,
+                account_name=account_name,
                 operation=_("scheduled notification send"),
                 headers=headers,
-                json_body=data,
+                json_bodies=[item[0] for item in items],
+                max_workers=min(NOTIFICATION_MAX_WORKERS, mps),
+                rate_limit=mps,
+            )
+            for (data, doc_data, _account, content_type, body_texts), (
+                    response, error_message) in zip(items, results):
+                self.content_type = content_type
+                self._record_send(
+                    data, doc_data, account_name, response, error_message,
+                    body_texts=body_texts)
+
+    def _get_site_url(self) -> str:
+        """Site URL for attachment links, resolved once per run."""
+        site_url = self.__dict__.get("_site_url")
+        if site_url is None:
+            site_url = self.__dict__["_site_url"] = get_url()
+        return site_url
+
+    def _get_print_format(self, doctype_name: str) -> str:
+        """Default print format for ``doctype_name``, memoized per run."""
+        cache = self.__dict__.setdefault("_print_format_cache", {})
+        if doctype_name in cache:
+            return cache[doctype_name]
+
+        print_format: str = "Standard"
+
+        # The cached meta carries the DocType's own properties, so
+        # no DocType document needs to be loaded.
+        doctype = frappe.get_meta(doctype_name)
+
+        if doctype.custom:
+            # default_print_format is usually str|None, but
+            # we still narrow
+            if (isinstance(doctype.default_print_format, str) and
+                    doctype.default_print_format):
+                print_format = doctype.default_print_format
+        else:
+            raw_default: Any = frappe.db.get_value(
+                "Property Setter",
+                filters={
+                    "doc_type": doctype_name,
+                    "property": "default_print_format"},
+                fieldname="value",
             )
+            # The important part: enforce str
+            if isinstance(raw_default, str) and raw_default:
+                print_format = raw_default
+
+        cache[doctype_name] = print_format
+        return print_format
+
+    def _get_safe_globals(self) -> dict[str, Any]:
+        """Sandbox globals for evaluating ``condition``.
+
+        get_safe_globals() rebuilds a large namespace on every call; build
+        it once per notification object so a batch evaluating the
+        condition for many documents pays for it once.
+        """
+        safe_globals = self.__dict__.get("_safe_globals")
+        if safe_globals is None:
+            safe_globals = self.__dict__["_safe_globals"] = get_safe_globals()
+        return safe_globals
+
+    def _is_numeric_property(self, doctype: str, fieldname: str) -> bool:
+        """Whether set_property_after_alert targets a numeric field.
+
+        Resolved once per (doctype, field) for the lifetime of this
+        notification object, i.e. once per scheduled run.
+        """
+        cache = self.__dict__.setdefault("_numeric_property_cache", {})
+        key = (doctype, fieldname)
+        if key not in cache:
+            df = frappe.get_meta(doctype).get_field(fieldname)
+            cache[key] = bool(df and df.fieldtype in numeric_fieldtypes)
+        return cache[key]
+
+    def _write_batch_records(self) -> None:
+        """Write the property updates collected by a batch and queue its
+        logs.
+
+        Property updates are grouped so each (doctype, field, value) is a
+        single UPDATE; the logs go to one background insert.
+        """
+        logs = self._pending_logs or []
+        updates = self._pending_property_updates or {}
+        self._pending_logs = None
+        self._pending_property_updates = None
+
+        for (doctype, fieldname, value), names in updates.items():
+            frappe.db.set_value(
+                doctype, {"name": ("in", names)}, fieldname, value)
+
+        if logs:
+            self._enqueue_logs(logs)
+
+    def _enqueue_logs(self, logs: list[str]) -> None:
+        """Hand notification logs to a background job.
+
+        The logs are observability only, so sends do not wait on their
+        insert. The job is queued after commit and is dropped with a rolled
+        back transaction, as the inline insert was.
+        """
+        frappe.enqueue(
+            NOTIFICATION_LOG_JOB,
+            queue="short",
+            template=self.template,
+            logs=logs,
+            timestamp=now(),
+            enqueue_after_commit=True,
+        )
+
+    def _record_send(
+            self,
+            data: dict[str, Any],
+            doc_data: dict[str, Any] | None,
+            account_name: str,
+            response: dict[str, Any],
+            error_message: str | None,
+            body_texts: list[str] | None = None) -> None:
+        """Save the sent WhatsApp Message and write the notification log.
+
+        Type-safety goals:
+        - avoid subscripting unknown/None responses
+        - ensure message_id extraction is safe
+        """
+        meta_json = ""
+
+        try:
+            if error_message:
+                raise frappe.ValidationError(error_message)
 
             # Ensure content_type is always a string
             if not isinstance(
@@ -588,7 +929,9 @@ class WhatsAppNotification(Document):
             # Pull body parameters (safe)
             parameters: Optional[str] = None
             template_payload = data.get("template")
-            if isinstance(template_payload, dict):
+            if body_texts is not None:
+                parameters = orjson.dumps(body_texts, default=str).decode()
+            elif isinstance(template_payload, dict):
                 components = template_payload.get("components", [])
                 if isinstance(components, list):
                     for comp in components:
@@ -599,15 +942,15 @@ class WhatsAppNotification(Document):
                         params = comp.get("parameters") or []
                         if not isinstance(params, list):
                             break
-                        texts: list[str] = []
-                        for p in params:
-                            if not isinstance(p, dict):
-                                continue
-                            if p.get("type") == "text":
-                                t = p.get("text")
-                                if isinstance(t, str) and t:
-                                    texts.append(t)
-                        parameters = frappe.json.dumps(texts, default=str)
+                        texts = [
+                            p["text"] for p in params
+                            if isinstance(p, dict)
+                            and p.get("type") == "text"
+                            and isinstance(p.get("text"), str)
+                            and p["text"]
+                        ]
+                        parameters = orjson.dumps(
+                            texts, default=str).decode()
                         break
 
             message_id = _first_message_id(response)
@@ -627,7 +970,7 @@ class WhatsAppNotification(Document):
                 "use_template": 1,
                 "template": self.template,
                 "template_parameters": parameters,
-                "whatsapp_account": wa.name,
+                "whatsapp_account": account_name,
             }
 
             if isinstance(doc_data, dict):
@@ -656,19 +999,28 @@ class WhatsAppNotification(Document):
                     fieldname = cast(str, self.set_property_after_alert)
                     value: Any = self.property_value
 
-                    meta = frappe.get_meta(doctype)
-                    df = meta.get_field(fieldname)
-                    if df and df.fieldtype in numeric_fieldtypes:
+                    if self._is_numeric_property(doctype, fieldname):
                         value = cint(value)
 
-                    frappe.db.set_value(doctype, name, fieldname, value)
+                    updates = getattr(
+                        self, "_pending_property_updates", None)
+                    if updates is not None:
+                        updates.setdefault(
+                            (doctype, fieldname, value), []).append(name)
+                    else:
+                        frappe.db.set_value(doctype, name, fieldname, value)
 
             frappe.msgprint(
                 "WhatsApp Message Triggered",
                 indicator="green", alert=True)
 
-            # integration_request payload for log (optional)
-            meta_json = frappe.as_json(_integration_request_json())
+            # Successful sends are already recorded as WhatsApp Messages, so
+            # by default the log keeps just the message id; the full Meta
+            # response is opt-in via whatsapp_notification_log_on_success.
+            if frappe.conf.get("whatsapp_notification_log_on_success"):
+                meta_json = frappe.as_json(response)
+            else:
+                meta_json = orjson.dumps({"message_id": message_id}).decode()
 
         except Exception as e:
             error_message = str(e)
@@ -682,13 +1034,13 @@ class WhatsAppNotification(Document):
             meta_json = frappe.as_json({"error": error_message})
 
         finally:
-            frappe.get_doc(
-                {
-                    "doctype": "WhatsApp Notification Log",
-                    "template": self.template,
-                    "meta_data": meta_json,
-                }
-            ).insert(ignore_permissions=True)
+            pending_logs = getattr(self, "_pending_logs", None)
+            if frappe.flags.skip_notification_log:
+                pass
+            elif pending_logs is not None:
+                pending_logs.append(meta_json)
+            else:
+                self._enqueue_logs([meta_json])
 
     def on_trash(self):
         """On delete remove from schedule."""
@@ -696,10 +1048,7 @@ class WhatsAppNotification(Document):
 
     def format_number(self, number):
         """Format number."""
-        if (number.startswith("+")):
-            number = number[1:len(number)]
-
-        return number
+        return number[1:] if number.startswith("+") else number
 
     def get_documents_for_today(self) -> int:
         """Send scheduled notifications for documents that match today's
@@ -752,28 +1101,101 @@ class WhatsAppNotification(Document):
         # Use 23:59:59 to match your previous logic (not microseconds)
         end_dt = py_datetime.combine(target_date, py_time(23, 59, 59))
 
-        # 3) Query
-        doc_list = frappe.get_all(
-            self.reference_doctype,
-            fields=["name"],
-            filters=[
-                {date_field: (">=", start_dt)},
-                {date_field: ("<=", end_dt)},
-            ],
-        )
+        # 3) Query. When no Document behaviour is needed the send fields
+        # are fetched here too, so no per-row get_doc is required.
+        self._warn_if_unindexed(date_field)
+        from_rows = self._can_send_from_row()
+        date_filter = {date_field: ["between", [start_dt, end_dt]]}
+        if from_rows:
+            doc_list: list = frappe.get_all(
+                self.reference_doctype,
+                fields=self._row_fields(),
+                filters=date_filter,
+            )
+        elif self.check_consent_before_send and self.field_name:
+            # The recipient numbers let consent be checked for the batch.
+            doc_list = frappe.get_all(
+                self.reference_doctype,
+                fields=["name", self.field_name],
+                filters=date_filter,
+            )
+        else:
+            doc_list = frappe.get_all(
+                self.reference_doctype,
+                filters=date_filter,
+                pluck="name",
+            )
 
         sent = 0
-        for row in doc_list:
-            name = row.get("name") if isinstance(row, dict) else None
-            if not isinstance(name, str) or not name:
-                continue
-
-            doc = frappe.get_doc(self.reference_doctype, name)
-            self.send_template_message(doc)
-            sent += 1
+        self._open_batch()
+        try:
+            if (self.check_consent_before_send and self.field_name
+                    and doc_list):
+                self._prefetch_consent(
+                    frappe.get_doc("WhatsApp Templates", self.template),
+                    [row.get(self.field_name) for row in doc_list])
+            for row in doc_list:
+                if from_rows:
+                    if not row.get("name"):
+                        continue
+                    row["doctype"] = self.reference_doctype
+                    self.send_template_message(row)
+                else:
+                    if not isinstance(row, str):
+                        row = row.get("name")
+                    if not row:
+                        continue
+                    doc = frappe.get_doc(self.reference_doctype, row)
+                    self.send_template_message(doc)
+                sent += 1
+        finally:
+            self._flush_batch()
 
         return sent
 
+    def _warn_if_unindexed(self, date_field: str) -> None:
+        """Log when the daily range scan has no index to use."""
+        if date_field in ("creation", "modified"):
+            return
+        df = frappe.get_meta(self.reference_doctype).get_field(date_field)
+        if df and not df.search_index:
+            frappe.logger().warning(
+                f"WhatsApp Notification {self.name}: {self.reference_doctype}"
+                f".{date_field} is not indexed; enable Search Index on it"
+                " to avoid a full table scan each day.")
+
+    def _row_fields(self) -> list[str]:
+        """Reference fields a send reads: recipient, parameters, buttons."""
+        fields = ["name", cast(str, self.field_name)]
+        fields += [str(f.field_name) for f in self.fields]
+        if self.button_fields:
+            fields += [f for f in str(self.button_fields).split(",") if f]
+        return list(dict.fromkeys(fields))
+
+    def _can_send_from_row(self) -> bool:
+        """Whether sends can use a ``get_all`` row instead of the document.
+
+        Only when nothing needs Document behaviour: no condition, no
+        print or share-key attachment, and every field read is plain text
+        that ``get_formatted`` would return unchanged.
+        """
+        if (
+            self.condition
+            or self.attach_document_print
+            or (self.custom_attachment and self.attach_from_field)
+            or not self.field_name
+        ):
+            return False
+
+        meta = frappe.get_meta(self.reference_doctype)
+        for fieldname in self._row_fields():
+            if fieldname == "name":
+                continue
+            df = meta.get_field(fieldname)
+            if not df or df.fieldtype not in PLAIN_TEXT_FIELDTYPES:
+                return False
+        return True
+
 
 @frappe.whitelist()
 def call_trigger_notifications():
@@ -797,13 +1219,32 @@ def trigger_notifications(method="daily"):
         return
 
     if method == "daily":
-        doc_list = frappe.get_all(
-            "WhatsApp Notification",
-            filters={"doctype_event": ("in", ("Days Before", "Days After")),
-                     "disabled": 0}
-        )
-        for d in doc_list:
-            alert = cast(
-                WhatsAppNotification,
-                frappe.get_doc("WhatsApp Notification", d.name))
-            alert.get_documents_for_today()
+        start = 0
+        while True:
+            # Page through notifications so sending starts with the first
+            # page instead of after every row has been loaded.
+            names = frappe.get_all(
+                "WhatsApp Notification",
+                filters={
+                    "doctype_event": ("in", ("Days Before", "Days After")),
+                    "disabled": 0},
+                order_by="creation asc",
+                limit_start=start,
+                limit_page_length=DAILY_PAGE_SIZE,
+                pluck="name",
+            )
+            for name in names:
+                alert = cast(
+                    WhatsAppNotification,
+                    frappe.get_doc("WhatsApp Notification", name))
+                try:
+                    alert.get_documents_for_today()
+                except Exception:
+                    # One broken notification must not hold up the rest of
+                    # the daily run.
+                    frappe.log_error(
+                        frappe.get_traceback(),
+                        f"WhatsApp Notification {name} daily run failed")
+            if len(names) < DAILY_PAGE_SIZE:
+                break
+            start += DAILY_PAGE_SIZE
@@ -4,6 +4,8 @@
 # import frappe
 from frappe.model.document import Document
 
+from frappe_whatsapp.utils.consent import clear_opt_out_keywords_cache
+
 
 class WhatsAppOptOutKeyword(Document):
 	# begin: auto-generated types
@@ -22,4 +24,9 @@ class WhatsAppOptOutKeyword(Document):
 		target_category: DF.Link | None
 		whatsapp_account: DF.Link | None
 	# end: auto-generated types
-	pass
+
+	def on_update(self):
+		clear_opt_out_keywords_cache()
+
+	def on_trash(self):
+		clear_opt_out_keywords_cache()
@@ -1,7 +1,9 @@
 # Copyright (c) 2025, Shridhar Patil and contributors
 # For license information, please see license.txt
 
+import frappe
 from frappe.model.document import Document
+from frappe.utils import cint, now
 from frappe_whatsapp.utils import format_number
 
 
@@ -51,5 +53,47 @@ class WhatsAppProfiles(Document):
             self.number = format_number(self.number)
 
     def set_title(self):
-        self.title = " - ".join(filter(
-            None, [self.profile_name, self.number])) or "Unnamed Profile"
+        profile_name, number = self.profile_name, self.number
+        if profile_name and number:
+            self.title = f"{profile_name} - {number}"
+        else:
+            self.title = profile_name or number or "Unnamed Profile"
+
+
+def insert_profile_if_missing(
+        number: str,
+        *,
+        profile_name: str | None = None,
+        whatsapp_account: str | None = None) -> str | None:
+    """Create a WhatsApp Profiles row for an already formatted *number*.
+
+    Written as a single ``INSERT IGNORE`` instead of exists + ORM insert:
+    the unique index on ``number`` turns an existing profile into a no-op,
+    and the only controller work (number formatting and title) is
+    reproduced here. Returns the new profile's name, or ``None`` if the
+    number already had a profile.
+    """
+    name = frappe.generate_hash(length=10)
+    timestamp = now()
+    user = frappe.session.user
+    frappe.db.sql(
+        """
+        INSERT IGNORE INTO `tabWhatsApp Profiles`
+            (name, creation, modified, owner, modified_by, docstatus,
+             idx, number, profile_name, title, whatsapp_account,
+             consent_status)
+        VALUES
+            (%s, %s, %s, %s, %s, 0, 0, %s, %s, %s, %s, 'Unknown')
+        """,
+        (
+            name,
+            timestamp, timestamp, user, user,
+            number,
+            profile_name,
+            f"{profile_name} - {number}" if profile_name else number,
+            whatsapp_account,
+        ),
+    )
+    if cint(frappe.db.sql("SELECT ROW_COUNT()")[0][0]):
+        return name
+    return None
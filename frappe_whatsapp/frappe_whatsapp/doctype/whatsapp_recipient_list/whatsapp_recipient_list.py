@@ -7,6 +7,8 @@ from frappe.model.document import Document
 class WhatsAppRecipientList(Document):
 	def validate(self):
 		self.validate_recipients()
+		# Cached so Bulk WhatsApp Message can read it instead of counting rows
+		self.recipient_count = len(self.recipients)
 	
 	def validate_recipients(self):
 		if not self.is_new():
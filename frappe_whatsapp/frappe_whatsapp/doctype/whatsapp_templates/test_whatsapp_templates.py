@@ -9,7 +9,9 @@ import frappe
 
 from frappe.tests.utils import FrappeTestCase
 from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import (  # noqa: E501
+    _BUTTON_SHAPE_FIELDS,
     _COMPLIANCE_FIELDS,
+    _TEMPLATE_SHAPE_FIELDS,
     _build_template_docname,
     _derive_sync_compliance,
     _footer_looks_like_unsubscribe,
@@ -26,6 +28,11 @@ _MOD = (
 )
 
 
+def _each_account(templates):
+    """get_paginated_data_many side effect: the same templates per account."""
+    return lambda collections, **kwargs: [list(templates) for _ in collections]
+
+
 class TestWhatsAppTemplates(FrappeTestCase):
     def test_normalize_meta_language_code_uses_underscores(self):
         self.assertEqual(_normalize_meta_language_code("en-US"), "en_US")
@@ -108,7 +115,7 @@ class TestTemplateMetaSync(FrappeTestCase):
         }
 
     @patch(f"{_MOD}._resolve_language_link", return_value="en")
-    @patch(f"{_MOD}.get_paginated_data")
+    @patch(f"{_MOD}.get_paginated_data_many")
     @patch(f"{_MOD}.validate_account_connection")
     def test_call_permission_component_is_imported_for_selected_account(
         self, mock_validate, mock_pages, _mock_language
@@ -117,7 +124,7 @@ class TestTemplateMetaSync(FrappeTestCase):
         account = self._make_account(suffix)
         actual_name = f"call_permission_{suffix}"
         mock_validate.return_value = {"valid": True}
-        mock_pages.return_value = [{
+        mock_pages.side_effect = _each_account([{
             "id": f"template-{suffix}",
             "name": actual_name,
             "status": "APPROVED",
@@ -127,7 +134,7 @@ class TestTemplateMetaSync(FrappeTestCase):
                 {"type": "BODY", "text": "Can we call you?"},
                 {"type": "CALL_PERMISSION_REQUEST"},
             ],
-        }]
+        }])
 
         message = fetch(account.name)
 
@@ -150,7 +157,7 @@ class TestTemplateMetaSync(FrappeTestCase):
         self.assertEqual(mock_validate.call_args.args[0].name, account.name)
 
     @patch(f"{_MOD}._resolve_language_link", return_value="en")
-    @patch(f"{_MOD}.get_paginated_data")
+    @patch(f"{_MOD}.get_paginated_data_many")
     @patch(f"{_MOD}.validate_account_connection", return_value={"valid": True})
     def test_same_template_name_imports_each_language_variant(
         self, _mock_validate, mock_pages, _mock_language
@@ -158,14 +165,14 @@ class TestTemplateMetaSync(FrappeTestCase):
         suffix = frappe.generate_hash(length=8)
         account = self._make_account(suffix)
         actual_name = f"call_permission_languages_{suffix}"
-        mock_pages.return_value = [
+        mock_pages.side_effect = _each_account([
             self._template_payload(
                 actual_name, "en_US", f"en-{suffix}", "Can we call you?"),
             self._template_payload(
                 actual_name, "es", f"es-{suffix}", "¿Podemos llamarte?"),
             self._template_payload(
                 actual_name, "pt-BR", f"pt-{suffix}", "Podemos ligar?"),
-        ]
+        ])
 
         first_message = fetch(account.name)
         second_message = fetch(account.name)
@@ -208,7 +215,7 @@ class TestTemplateMetaSync(FrappeTestCase):
             all(row.is_call_permission_request for row in templates))
 
     @patch(f"{_MOD}._resolve_language_link", return_value="en")
-    @patch(f"{_MOD}.get_paginated_data")
+    @patch(f"{_MOD}.get_paginated_data_many")
     @patch(f"{_MOD}.validate_account_connection", return_value={"valid": True})
     def test_same_name_and_language_are_isolated_by_account(
         self, _mock_validate, mock_pages, _mock_language
@@ -217,8 +224,8 @@ class TestTemplateMetaSync(FrappeTestCase):
         first_account = self._make_account(f"first-{suffix}")
         second_account = self._make_account(f"second-{suffix}")
         actual_name = f"shared_template_{suffix}"
-        mock_pages.return_value = [self._template_payload(
-            actual_name, "en_US", f"template-{suffix}", "Shared body")]
+        mock_pages.side_effect = _each_account([self._template_payload(
+            actual_name, "en_US", f"template-{suffix}", "Shared body")])
 
         fetch(first_account.name)
         fetch(second_account.name)
@@ -236,7 +243,7 @@ class TestTemplateMetaSync(FrappeTestCase):
         self.assertEqual(len({row.name for row in templates}), 2)
 
     @patch(f"{_MOD}._resolve_language_link", return_value="en")
-    @patch(f"{_MOD}.get_paginated_data")
+    @patch(f"{_MOD}.get_paginated_data_many")
     @patch(f"{_MOD}.validate_account_connection", return_value={"valid": True})
     def test_legacy_document_name_is_preserved_when_variants_are_added(
         self, _mock_validate, mock_pages, _mock_language
@@ -259,12 +266,12 @@ class TestTemplateMetaSync(FrappeTestCase):
         })
         legacy_doc.db_insert()
 
-        mock_pages.return_value = [
+        mock_pages.side_effect = _each_account([
             self._template_payload(
                 actual_name, "en_US", f"en-{suffix}", "New English body"),
             self._template_payload(
                 actual_name, "es", f"es-{suffix}", "Nuevo cuerpo"),
-        ]
+        ])
         message = fetch(account.name)
 
         templates = frappe.get_all(
@@ -282,7 +289,7 @@ class TestTemplateMetaSync(FrappeTestCase):
         self.assertEqual(by_language["en_US"].template, "New English body")
         self.assertNotEqual(by_language["es"].name, legacy_name)
 
-    @patch(f"{_MOD}.get_paginated_data", return_value=[])
+    @patch(f"{_MOD}.get_paginated_data_many", return_value=[[]])
     @patch(f"{_MOD}.validate_account_connection", return_value={"valid": True})
     def test_selected_sync_does_not_validate_other_active_accounts(
         self, mock_validate, _mock_pages
@@ -295,7 +302,7 @@ class TestTemplateMetaSync(FrappeTestCase):
         self.assertEqual(mock_validate.call_count, 1)
         self.assertEqual(mock_validate.call_args.args[0].name, selected.name)
 
-    @patch(f"{_MOD}.get_paginated_data", return_value=[])
+    @patch(f"{_MOD}.get_paginated_data_many", return_value=[[]])
     @patch(f"{_MOD}.validate_account_connection", return_value={"valid": True})
     def test_template_sync_does_not_commit_per_template(
         self, _mock_validate, _mock_pages
@@ -1002,3 +1009,104 @@ class TestDetectManualComplianceChange(FrappeTestCase):
 
         self._call(current, before)
         self.assertEqual(current.compliance_auto_managed, 0)
+
+
+# ---------------------------------------------------------------------------
+# Meta update skipped when the template shape is unchanged
+# ---------------------------------------------------------------------------
+
+class TestTemplateShapeChange(FrappeTestCase):
+    """validate() only rebuilds and re-sends components that changed."""
+
+    @staticmethod
+    def _saved_template():
+        return frappe.get_doc({
+            "doctype": "WhatsApp Templates",
+            "name": "shape_test-en-Test Account",
+            "template_name": "shape_test",
+            "actual_name": "shape_test",
+            "whatsapp_account": "Test Account",
+            "language_code": "en",
+            "category": "UTILITY",
+            "status": "APPROVED",
+            "template": "Hello {{1}}",
+            "sample_values": "Oscar",
+            "header_type": "TEXT",
+            "header": "Welcome",
+            "footer": "Thanks",
+            "is_call_permission_request": 0,
+            "buttons": [
+                {"button_type": "Quick Reply", "button_label": "Yes"},
+                {
+                    "button_type": "Visit Website",
+                    "button_label": "Open",
+                    "website_url": "https://example.com/{{1}}",
+                    "url_type": "Dynamic",
+                    "example_url": "https://example.com/a",
+                },
+            ],
+        })
+
+    def _validate(self, change):
+        """Validate a saved template after ``change`` edits it.
+
+        Returns whether the components were rebuilt and sent to Meta.
+        """
+        doc = self._saved_template()
+        doc._doc_before_save = self._saved_template()
+        change(doc)
+        with patch.object(
+            WhatsAppTemplates, "_build_components", return_value=[]
+        ) as mock_build, patch.object(
+            WhatsAppTemplates, "update_template"
+        ) as mock_update:
+            doc.validate()
+        self.assertEqual(mock_build.called, mock_update.called)
+        return mock_update.called
+
+    def test_non_shape_field_change_skips_meta_update(self):
+        def change(doc):
+            doc.status = "PAUSED"
+            doc.template_name = "renamed"
+
+        self.assertFalse(self._validate(change))
+
+    def test_unchanged_save_skips_meta_update(self):
+        self.assertFalse(self._validate(lambda doc: None))
+
+    def test_each_template_shape_field_change_updates_meta(self):
+        changed_values = {
+            "template": "Hi {{1}}",
+            "sample_values": "Maria",
+            "header_type": "",
+            "header": "Hello",
+            "sample": "sample.png",
+            "footer": "Bye",
+            "is_call_permission_request": 1,
+        }
+        self.assertEqual(set(changed_values), set(_TEMPLATE_SHAPE_FIELDS))
+        for fieldname, value in changed_values.items():
+            with self.subTest(fieldname=fieldname):
+                self.assertTrue(self._validate(
+                    lambda doc: doc.set(fieldname, value)))
+
+    def test_each_button_shape_field_change_updates_meta(self):
+        for fieldname in _BUTTON_SHAPE_FIELDS:
+            with self.subTest(fieldname=fieldname):
+                self.assertTrue(self._validate(
+                    lambda doc: doc.buttons[1].set(fieldname, "changed")))
+
+    def test_button_rows_added_removed_or_reordered_update_meta(self):
+        def add(doc):
+            doc.append("buttons", {
+                "button_type": "Quick Reply", "button_label": "No"})
+
+        def remove(doc):
+            doc.buttons.pop()
+
+        def reorder(doc):
+            doc.buttons.reverse()
+
+        for change in (add, remove, reorder):
+            with self.subTest(change=change.__name__):
+                self.assertTrue(self._validate(change))
@@ -5,33 +5,75 @@
 import hashlib
 import os
 import re
+import threading
 import frappe
 import magic
 from frappe.model.document import Document
-from frappe.integrations.utils import make_post_request, make_request
 from frappe import _
 from frappe_whatsapp.utils import get_whatsapp_account
 from frappe_whatsapp.utils.consent import get_compliance_settings, get_opt_out_keywords
-from frappe.utils import get_bench_path, get_site_base_path
+from frappe.utils import get_bench_path, get_site_base_path, now
 from typing import Any, Mapping, cast
 
 from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import (
     WhatsAppAccount,
     validate_account_connection,
 )
-from frappe_whatsapp.utils.meta import get_paginated_data
+from frappe_whatsapp.utils.meta import (
+    get_paginated_data_many,
+    request_meta_json,
+)
 
-_ALLOWED_CATEGORY = {
+_ALLOWED_CATEGORY = frozenset({
     "", "TRANSACTIONAL", "MARKETING", "OTP", "UTILITY", "AUTHENTICATION"
-}
-_ALLOWED_HEADER_TYPE = {"", "TEXT", "DOCUMENT", "IMAGE"}
+})
+_ALLOWED_HEADER_TYPE = frozenset({"", "TEXT", "DOCUMENT", "IMAGE"})
+# Template name -> Meta actual_name (spaces become underscores).
+_NAME_TRANS = str.maketrans({" ": "_"})
+# Leading bytes handed to libmagic; enough for the image and document
+# signatures Meta accepts as samples.
+_MIME_SNIFF_BYTES = 8192
+_PLACEHOLDER_RE = re.compile(r"\{\{\d+\}\}")
 _MAX_DOCUMENT_NAME_LENGTH = 140
+# Names per IN (...) lookup when matching a Meta sync to existing rows.
+_SYNC_LOOKUP_CHUNK_SIZE = 1000
+# Accounts whose template lists are fetched from Meta concurrently.
+_SYNC_FETCH_WORKERS = 8
 _DOCUMENT_NAME_HASH_LENGTH = 12
 
 # Categories that do not require opt-in by default
 _NON_MARKETING_CATEGORIES = frozenset(
     {"UTILITY", "AUTHENTICATION", "OTP", "TRANSACTIONAL"})
 
+# Fields that feed the components sent to Meta; saves that change none of
+# these (nor the buttons) skip the Meta update.
+_TEMPLATE_SHAPE_FIELDS = (
+    "template",
+    "sample_values",
+    "header_type",
+    "header",
+    "sample",
+    "footer",
+    "is_call_permission_request",
+)
+_BUTTON_SHAPE_FIELDS = (
+    "button_type",
+    "button_label",
+    "website_url",
+    "url_type",
+    "example_url",
+    "phone_number",
+    "flow",
+)
+
+# Meta button type -> WhatsApp Button.button_type for synced templates.
+_META_BTN_TYPE_MAP = {
+    "URL": "Visit Website",
+    "PHONE_NUMBER": "Call Phone",
+    "QUICK_REPLY": "Quick Reply",
+    "FLOW": "Flow",
+}
+
 # Compliance fields whose manual edits should clear compliance_auto_managed
 _COMPLIANCE_FIELDS = (
     "requires_opt_in",
@@ -119,9 +161,7 @@ class WhatsAppTemplates(Document):
     def autoname(self):
         self.set_whatsapp_account()
         if not self.language_code:
-            lang_code = str(
-                frappe.db.get_value("Language", self.language) or "en")
-            self.language_code = lang_code.replace("-", "_")
+            self.language_code = self._get_language_code()
 
         self.name = _build_template_docname(
             self.actual_name or self.template_name,
@@ -145,17 +185,47 @@ class WhatsAppTemplates(Document):
             language_changed = (str(before.language) != str(self.language))
 
         if (not self.language_code) or language_changed:
-            lang_code = str(
-                frappe.db.get_value("Language", self.language) or "en")
-            self.language_code = lang_code.replace("-", "_")
+            self.language_code = self._get_language_code()
+
+        if not self.is_new() and not self._template_shape_changed(before):
+            # Nothing Meta stores changed; skip the media upload and update.
+            return
 
         if self.header_type in ["IMAGE", "DOCUMENT"] and self.sample:
             self.get_session_id()
             self.get_media_id()
 
+        # Built once here for update_template or after_insert.
+        self._components = self._build_components()
+
         if not self.is_new():
             self.update_template()
 
+    def _template_shape_changed(
+        self, before: "WhatsAppTemplates | None"
+    ) -> bool:
+        """Whether this save changes the components sent to Meta."""
+        if not before:
+            return True
+        if any(self.has_value_changed(f) for f in _TEMPLATE_SHAPE_FIELDS):
+            return True
+
+        def buttons(doc):
+            return [
+                tuple(str(btn.get(f) or "") for f in _BUTTON_SHAPE_FIELDS)
+                for btn in doc.get("buttons") or []
+            ]
+
+        return buttons(self) != buttons(before)
+
+    def _get_language_code(self) -> str:
+        """Meta language code for the linked Language (``en`` if unset)."""
+        lang_code = str(
+            (self.language
+             and frappe.get_cached_value("Language", self.language, "name"))
+            or "en")
+        return lang_code.replace("-", "_")
+
     def _detect_manual_compliance_change(
         self, before: "WhatsAppTemplates | None"
     ) -> None:
@@ -250,37 +320,30 @@ class WhatsAppTemplates(Document):
         if not file_path:
             frappe.throw(_("Could not resolve sample path."))
 
-        if not os.path.exists(str(file_path)):
+        # One open gives both the size and the bytes libmagic needs.
+        try:
+            with open(str(file_path), "rb") as f:
+                file_length = os.fstat(f.fileno()).st_size
+                file_type = _get_mime_detector().from_buffer(
+                    f.read(_MIME_SNIFF_BYTES))
+        except FileNotFoundError:
             frappe.throw(_("Sample file not found at: {0}").format(file_path))
-
-        mime = magic.Magic(mime=True)
-        file_type = mime.from_file(str(file_path))
+            return
 
         payload = {
-            "file_length": os.path.getsize(str(file_path)),
+            "file_length": file_length,
             "file_type": file_type,
             "messaging_product": "whatsapp",
         }
 
-        r = None
-        try:
-            r = make_post_request(
-                f"{self._url}/{self._version}/{self._app_id}/uploads",
-                headers=self._headers,
-                json=payload,
-            )
-        except Exception:
-            integration = frappe.flags.integration_request
-            if integration is None:
-                frappe.throw(_("Upload failed due to server error."))
-                return
-            res = integration.json().get("error", {})
-            frappe.throw(
-                msg=res.get(
-                    "error_user_msg",
-                    res.get("message", _("Upload failed"))),
-                title=res.get("error_user_title", "Error"),
-            )
+        r = request_meta_json(
+            "POST",
+            f"{self._url}/{self._version}/{self._app_id}/uploads",
+            account_name=str(self.whatsapp_account),
+            operation=_("template upload session"),
+            headers=self._headers,
+            json_body=payload,
+        )
 
         # Runtime + typing safety
         if not r or not isinstance(r, dict):
@@ -306,37 +369,28 @@ class WhatsAppTemplates(Document):
         if not file_name:
             frappe.throw(_("Could not resolve sample path."))
 
-        if not os.path.exists(str(file_name)):
-            frappe.throw(_("Sample file not found at: {0}").format(file_name))
-
         if not getattr(self, "_session_id", None):
             frappe.throw(
                 _("Missing upload session id. Run get_session_id() first."))
 
         headers = {"authorization": f"OAuth {self._token}"}
 
-        # Read binary
-        with open(str(file_name), "rb") as f:
-            file_content = f.read()
-
-        r = None
+        # Stream the file from disk; requests sends the handle in chunks
+        # (sized from the file) instead of holding the whole sample in
+        # memory.
         try:
-            r = make_post_request(
+            f = open(str(file_name), "rb")
+        except FileNotFoundError:
+            frappe.throw(_("Sample file not found at: {0}").format(file_name))
+            return
+        with f:
+            r = request_meta_json(
+                "POST",
                 f"{self._url}/{self._version}/{self._session_id}",
+                account_name=str(self.whatsapp_account),
+                operation=_("template media upload"),
                 headers=headers,
-                data=file_content,  # bytes
-            )
-        except Exception:
-            integration = frappe.flags.integration_request
-            if integration is None:
-                frappe.throw(_("Upload failed due to server error."))
-                return
-            res = integration.json().get("error", {})
-            frappe.throw(
-                msg=res.get(
-                    "error_user_msg",
-                    res.get("message", _("Upload failed"))),
-                title=res.get("error_user_title", "Error"),
+                data=f,
             )
 
         # Runtime + typing safety
@@ -363,7 +417,8 @@ class WhatsAppTemplates(Document):
 
     def after_insert(self):
         if self.template_name:
-            self.actual_name = self.template_name.lower().replace(" ", "_")
+            self.actual_name = self.template_name.lower().translate(
+                _NAME_TRANS)
 
         self.get_settings()
 
@@ -371,82 +426,18 @@ class WhatsAppTemplates(Document):
             "name": self.actual_name,
             "language": self.language_code,
             "category": self.category,
-            "components": [],
-        }
-
-        body: dict[str, Any] = {
-            "type": "BODY",
-            "text": self.template,
+            "components": self._get_components(),
         }
 
-        if self.sample_values:
-            placeholder_count = len(
-                set(re.findall(r"\{\{\d+\}\}", self.template)))
-            splits = (placeholder_count - 1) if placeholder_count > 1 else 0
-            values = [v.strip() for v in self.sample_values.split(
-                ",", maxsplit=splits) if v.strip()]
-            body["example"] = {"body_text": [values]}
-
-        data["components"].append(body)
-
-        if self.header_type:
-            data["components"].append(self.get_header())
-
-        if self.footer:
-            data["components"].append({"type": "FOOTER", "text": self.footer})
-
-        if getattr(self, "is_call_permission_request", 0):
-            data["components"].append({"type": "CALL_PERMISSION_REQUEST"})
-
-        if self.buttons:
-            from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_button.whatsapp_button import (  # noqa: E501
-                WhatsAppButton,
-            )
-
-            button_block: dict[str, Any] = {"type": "BUTTONS", "buttons": []}
-
-            for btn in self.buttons:
-                btn = cast(WhatsAppButton, btn)
-                b: dict[str, Any] = {
-                    "type": btn.button_type,
-                    "text": btn.button_label}
-
-                if btn.button_type == "Visit Website":
-                    b["type"] = "URL"
-                    b["url"] = str(btn.website_url)
-                    if btn.url_type == "Dynamic" and btn.example_url:
-                        b["example"] = btn.example_url.split(",")
-                elif btn.button_type == "Call Phone":
-                    b["type"] = "PHONE_NUMBER"
-                    b["phone_number"] = str(btn.phone_number)
-                elif btn.button_type == "Quick Reply":
-                    b["type"] = "QUICK_REPLY"
-
-                button_block["buttons"].append(b)
-
-            data["components"].append(button_block)
-
-        r = None
-        try:
-            r = make_post_request(
-                (f"{self._url}/{self._version}/"
-                 f"{self._business_id}/message_templates"),
-                headers=self._headers,
-                json=data,
-            )
-        except Exception:
-            integration = frappe.flags.integration_request
-            if integration is None:
-                frappe.throw(
-                    _("Template creation failed due to server error."))
-                return
-            res = integration.json().get("error", {})
-            frappe.throw(
-                msg=res.get(
-                    "error_user_msg",
-                    res.get("message", _("Template creation failed"))),
-                title=res.get("error_user_title", "Error"),
-            )
+        r = request_meta_json(
+            "POST",
+            (f"{self._url}/{self._version}/"
+             f"{self._business_id}/message_templates"),
+            account_name=str(self.whatsapp_account),
+            operation=_("template creation"),
+            headers=self._headers,
+            json_body=data,
+        )
 
         # ✅ Runtime + typing safety for the response
         if not r or not isinstance(r, dict):
@@ -471,86 +462,74 @@ class WhatsAppTemplates(Document):
         """Update template to Meta."""
         self.get_settings()
 
-        data: dict[str, Any] = {"components": []}
+        data: dict[str, Any] = {"components": self._get_components()}
 
+        request_meta_json(
+            "POST",
+            f"{self._url}/{self._version}/{self.id}",
+            account_name=str(self.whatsapp_account),
+            operation=_("template update"),
+            headers=self._headers,
+            json_body=data,
+        )
+
+    def _get_components(self) -> list[dict[str, Any]]:
+        """Components prepared by validate(), or built now if it did not."""
+        components = self.__dict__.get("_components")
+        if components is None:
+            components = self._components = self._build_components()
+        return components
+
+    def _build_components(self) -> list[dict[str, Any]]:
+        """Meta components for this template: body, header, footer,
+        call permission and buttons."""
         body: dict[str, Any] = {
             "type": "BODY",
             "text": self.template,
         }
-
         if self.sample_values:
-            placeholder_count = len(
-                set(re.findall(r"\{\{\d+\}\}", self.template)))
-            splits = (placeholder_count - 1) if placeholder_count > 1 else 0
-            values = [
-                v.strip() for v in self.sample_values.split(
-                    ",", maxsplit=splits) if v.strip()]
-            body["example"] = {"body_text": [values]}
-
-        data["components"].append(body)
-
-        if self.header_type:
-            data["components"].append(self.get_header())
-
-        if self.footer:
-            data["components"].append({"type": "FOOTER", "text": self.footer})
-
-        if getattr(self, "is_call_permission_request", 0):
-            data["components"].append({"type": "CALL_PERMISSION_REQUEST"})
-
-        if self.buttons:
-            button_block: dict[str, Any] = {"type": "BUTTONS", "buttons": []}
-
-            for btn in self.buttons:
-                b: dict[str, Any] = {
-                    "type": btn.button_type,
-                    "text": btn.button_label}
-
-                if btn.button_type == "Visit Website":
-                    b["type"] = "URL"
-                    b["url"] = str(btn.website_url)
-                    if btn.url_type == "Dynamic" and btn.example_url:
-                        b["example"] = [
-                            u.strip() for u in btn.example_url.split(
-                                ",") if u.strip()]
-
-                elif btn.button_type == "Call Phone":
-                    b["type"] = "PHONE_NUMBER"
-                    b["phone_number"] = str(btn.phone_number)
-
-                elif btn.button_type == "Quick Reply":
-                    b["type"] = "QUICK_REPLY"
-
-                button_block["buttons"].append(b)
+            body["example"] = {"body_text": [self._get_sample_values()]}
+
+        # One list display instead of growing the list append by append.
+        return [
+            body,
+            *((self.get_header(),) if self.header_type else ()),
+            *(({"type": "FOOTER", "text": self.footer},)
+              if self.footer else ()),
+            *(({"type": "CALL_PERMISSION_REQUEST"},)
+              if getattr(self, "is_call_permission_request", 0) else ()),
+            *((_build_button_block(self.buttons),) if self.buttons else ()),
+        ]
 
-            data["components"].append(button_block)
+    def _get_sample_values(self) -> list[str]:
+        """Body example values, split once per template/sample_values pair.
 
-        try:
-            make_post_request(
-                f"{self._url}/{self._version}/{self.id}",
-                headers=self._headers,
-                json=data,
-            )
-        except Exception:
-            integration = frappe.flags.integration_request
-            if integration is not None:
-                res = integration.json().get("error", {})
-                frappe.throw(
-                    msg=res.get(
-                        "error_user_msg",
-                        res.get("message", _("Update failed"))),
-                    title=res.get("error_user_title", "Error"),
-                )
-            raise
+        The last placeholder takes the remainder, so its sample may itself
+        contain commas.
+        """
+        key = (self.template, self.sample_values)
+        cached = self.__dict__.get("_sample_values_cache")
+        if cached is None or cached[0] != key:
+            placeholder_count = len(
+                set(_PLACEHOLDER_RE.findall(self.template or "")))
+            splits = (placeholder_count - 1) if placeholder_count > 1 else 0
+            cached = self.__dict__["_sample_values_cache"] = (
+                key, _split_csv(self.sample_values or "", splits))
+        return cached[1]
 
     def get_settings(self):
-        """Get whatsapp settings."""
+        """Get whatsapp settings.
+
+        Loaded once per account for the life of this instance, so the
+        upload and template calls of one save share a single lookup.
+        """
         from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
+        account = str(self.whatsapp_account)
+        if getattr(self, "_settings_account", None) == account:
+            return
         settings = cast(
             WhatsAppAccount,
-            frappe.get_doc(
-                "WhatsApp Account",
-                str(self.whatsapp_account)))
+            frappe.get_cached_doc("WhatsApp Account", account))
         self._token = settings.get_password("token")
         self._url = settings.url
         self._version = settings.version
@@ -561,36 +540,33 @@ class WhatsAppTemplates(Document):
             "authorization": f"Bearer {self._token}",
             "content-type": "application/json",
         }
+        self._settings_account = account
 
     def on_trash(self):
         self.get_settings()
         url = (
             f"{self._url}/{self._version}/{self._business_id}/"
-            f"message_templates?name={self.actual_name}"
+            "message_templates"
         )
 
+        # Only a response from this call may decide "not found" below.
+        frappe.flags.integration_request = None
         try:
-            make_request("DELETE", url, headers=self._headers)
-            return
-        except Exception:
-            integration = getattr(frappe.flags, "integration_request", None)
-            if integration is None or not hasattr(integration, "json"):
-                # Fallback: re-raise or show generic error
-                frappe.throw(_("Failed to delete template on Meta."))
-                return
-
-            payload = integration.json()
-            err = payload.get("error", {}) if isinstance(payload, dict) else {}
-            res = cast(Mapping[str, Any], err)
-
-            title = str(res.get("error_user_title") or "Error")
-            msg = str(res.get("error_user_msg") or res.get(
-                "message") or _("Error"))
-
-            if title == "Message Template Not Found":
-                frappe.msgprint("Deleted locally", title, alert=True)
-            else:
-                frappe.throw(msg=msg, title=title)
+            request_meta_json(
+                "DELETE",
+                url,
+                account_name=str(self.whatsapp_account),
+                operation=_("template deletion"),
+                headers=self._headers,
+                params={"name": self.actual_name},
+            )
+        except frappe.ValidationError:
+            title = str(
+                _get_integration_error().get("error_user_title") or "")
+            if title != "Message Template Not Found":
+                raise
+            frappe.clear_last_message()
+            frappe.msgprint("Deleted locally", title, alert=True)
 
     def get_header(self) -> dict[str, Any]:
         """Build Meta template HEADER component."""
@@ -629,10 +605,73 @@ def _as_dict(value: Any) -> dict[str, Any]:
     return value if isinstance(value, dict) else {}
 
 
+_mime_local = threading.local()
+
+
+def _get_mime_detector() -> "magic.Magic":
+    """MIME detector for this thread.
+
+    Creating one loads the whole libmagic database, so it is done once per
+    thread (libmagic handles are not thread-safe) rather than per upload.
+    """
+    detector = getattr(_mime_local, "detector", None)
+    if detector is None:
+        detector = _mime_local.detector = magic.Magic(mime=True)
+    return detector
+
+
 def _as_list(value: Any) -> list[Any]:
     return value if isinstance(value, list) else []
 
 
+def _split_csv(value: str, maxsplit: int = -1) -> list[str]:
+    """Split a comma-separated example list, dropping blank entries."""
+    return [v for v in (p.strip() for p in value.split(",", maxsplit)) if v]
+
+
+def _build_url_button(btn: Any) -> dict[str, Any]:
+    b: dict[str, Any] = {
+        "type": "URL", "text": btn.button_label, "url": str(btn.website_url)}
+    if btn.url_type == "Dynamic" and btn.example_url:
+        b["example"] = _split_csv(btn.example_url)
+    return b
+
+
+def _build_phone_button(btn: Any) -> dict[str, Any]:
+    return {
+        "type": "PHONE_NUMBER",
+        "text": btn.button_label,
+        "phone_number": str(btn.phone_number),
+    }
+
+
+def _build_quick_reply_button(btn: Any) -> dict[str, Any]:
+    return {"type": "QUICK_REPLY", "text": btn.button_label}
+
+
+def _build_default_button(btn: Any) -> dict[str, Any]:
+    return {"type": btn.button_type, "text": btn.button_label}
+
+
+# WhatsApp Button.button_type -> Meta button payload.
+_BUTTON_BUILDERS = {
+    "Visit Website": _build_url_button,
+    "Call Phone": _build_phone_button,
+    "Quick Reply": _build_quick_reply_button,
+}
+
+
+def _build_button_block(buttons: list[Any]) -> dict[str, Any]:
+    """Meta BUTTONS component for a template's button rows."""
+    return {
+        "type": "BUTTONS",
+        "buttons": [
+            _BUTTON_BUILDERS.get(btn.button_type, _build_default_button)(btn)
+            for btn in buttons
+        ],
+    }
+
+
 def _normalize_meta_language_code(value: Any) -> str:
     """Normalize Meta language codes to the stored template format."""
     return str(value or "").strip().replace("-", "_")
@@ -697,6 +736,58 @@ def _get_integration_error() -> dict[str, Any]:
     return _as_dict(payload_dict.get("error"))
 
 
+def _get_existing_templates(
+    account_name: str, templates: list[Any]
+) -> dict[tuple[str, str], str]:
+    """Map (actual_name, language_code) to docname for an account's rows
+    matching the Meta template list."""
+    names = list({
+        str(_as_dict(t).get("name") or "") for t in templates
+    } - {""})
+    existing: dict[tuple[str, str], str] = {}
+    for start in range(0, len(names), _SYNC_LOOKUP_CHUNK_SIZE):
+        for row in frappe.get_all(
+            "WhatsApp Templates",
+            filters={
+                "whatsapp_account": account_name,
+                "actual_name": [
+                    "in", names[start:start + _SYNC_LOOKUP_CHUNK_SIZE]],
+            },
+            fields=["name", "actual_name", "language_code"],
+        ):
+            existing.setdefault(
+                (str(row.actual_name), str(row.language_code or "")),
+                str(row.name))
+    return existing
+
+
+def _get_taken_docnames(
+    account_name: str,
+    templates: list[Any],
+    existing: dict[tuple[str, str], str],
+) -> set[str]:
+    """Docnames already in use among those new Meta templates would get."""
+    candidates: set[str] = set()
+    for t in templates:
+        template = _as_dict(t)
+        name = str(template.get("name") or "")
+        language_code = _normalize_meta_language_code(template.get("language"))
+        if name and (name, language_code) not in existing:
+            candidates.add(
+                _build_template_docname(name, language_code, account_name))
+    names = list(candidates)
+
+    taken: set[str] = set()
+    for start in range(0, len(names), _SYNC_LOOKUP_CHUNK_SIZE):
+        taken.update(frappe.get_all(
+            "WhatsApp Templates",
+            filters={"name": [
+                "in", names[start:start + _SYNC_LOOKUP_CHUNK_SIZE]]},
+            pluck="name",
+        ))
+    return taken
+
+
 @frappe.whitelist()
 def fetch(whatsapp_account: str | None = None) -> str:
     """Fetch templates from Meta and upsert into WhatsApp Templates."""
@@ -732,6 +823,7 @@ def fetch(whatsapp_account: str | None = None) -> str:
     imported = 0
     updated = 0
 
+    sources: list[tuple[str, str, dict[str, str]]] = []
     for account in whatsapp_accounts:
         account_name = str(account.name or "")
         if not account_name:
@@ -747,18 +839,35 @@ def fetch(whatsapp_account: str | None = None) -> str:
             "Authorization": f"Bearer {token}",
             "content-type": "application/json",
         }
+        sources.append((
+            f"{url}/{version}/{business_id}/message_templates",
+            account_name,
+            headers,
+        ))
+
+    # Page through every account's templates at once; the rows are then
+    # written here, one account at a time.
+    collections = get_paginated_data_many(
+        sources,
+        operation=_("template synchronization"),
+        params={
+            "fields": "id,name,status,language,category,components",
+            "limit": 100,
+        },
+        max_workers=_SYNC_FETCH_WORKERS,
+    )
 
+    for (_url, account_name, _headers), templates in zip(
+            sources, collections):
         try:
-            templates = get_paginated_data(
-                f"{url}/{version}/{business_id}/message_templates",
-                account_name=account_name,
-                operation=_("template synchronization"),
-                headers=headers,
-                params={
-                    "fields": "id,name,status,language,category,components",
-                    "limit": 100,
-                },
-            )
+            existing = _get_existing_templates(account_name, templates)
+            # Buttons are rewritten on every sync; clear them for all the
+            # matched rows up front instead of once per template.
+            cleared = set(existing.values())
+            _delete_children("WhatsApp Button", "WhatsApp Templates", cleared)
+            # Docnames that unmatched templates would take but another row
+            # already holds; those are updated in place, as before.
+            taken = _get_taken_docnames(account_name, templates, existing)
 
             for t in templates:
                 template = _as_dict(t)
@@ -771,15 +880,7 @@ def fetch(whatsapp_account: str | None = None) -> str:
                 language_code = _normalize_meta_language_code(meta_language)
 
                 # load or create
-                existing_name = frappe.db.get_value(
-                    "WhatsApp Templates",
-                    {
-                        "actual_name": template_name,
-                        "language_code": language_code,
-                        "whatsapp_account": account_name,
-                    },
-                    "name",
-                )
+                existing_name = existing.get((template_name, language_code))
                 if existing_name:
                     doc = cast(
                         WhatsAppTemplates,
@@ -853,13 +954,7 @@ def fetch(whatsapp_account: str | None = None) -> str:
                         doc.is_call_permission_request = 1
 
                     elif ctype == "BUTTONS":
-                        type_map = {
-                            "URL": "Visit Website",
-                            "PHONE_NUMBER": "Call Phone",
-                            "QUICK_REPLY": "Quick Reply",
-                            "FLOW": "Flow",
-                        }
-
+                        type_map = _META_BTN_TYPE_MAP
                         buttons = _as_list(component.get("buttons"))
                         for i, b_raw in enumerate(buttons, start=1):
                             button = _as_dict(b_raw)
@@ -896,7 +991,14 @@ def fetch(whatsapp_account: str | None = None) -> str:
                             doc.append("buttons", btn)
 
                 _derive_sync_compliance(doc, is_new=(existing_name is None))
-                upsert_doc_without_hooks(doc, "WhatsApp Button", "buttons")
+                upsert_doc_without_hooks(
+                    doc, "WhatsApp Button", "buttons",
+                    exists=bool(existing_name) or doc.name in taken,
+                    children_cleared=existing_name in cleared,
+                )
+                cleared.discard(existing_name)
+                taken.add(str(doc.name))
+                existing[(template_name, language_code)] = str(doc.name)
                 if existing_name:
                     updated += 1
                 else:
@@ -919,19 +1021,58 @@ def fetch(whatsapp_account: str | None = None) -> str:
     ).format(account_label, imported, updated)
 
 
-def upsert_doc_without_hooks(doc, child_dt, child_field):
-    """Insert or update a parent document and its children without hooks."""
-    if frappe.db.exists(doc.doctype, doc.name):
+def upsert_doc_without_hooks(
+        doc, child_dt, child_field, *, exists=None, children_cleared=False):
+    """Insert or update a parent document and its children without hooks.
+
+    ``exists`` skips the existence probe when the caller already knows;
+    ``children_cleared`` says the old child rows were already deleted.
+    The children are written with a single multi-row INSERT. Nothing is
+    committed here; the caller's request or job owns the transaction.
+    """
+    if exists is None:
+        exists = frappe.db.exists(doc.doctype, doc.name)
+    if exists:
         doc.db_update()
-        frappe.db.delete(
-            child_dt, {"parent": doc.name, "parenttype": doc.doctype})
+        if not children_cleared:
+            frappe.db.delete(
+                child_dt, {"parent": doc.name, "parenttype": doc.doctype})
     else:
         doc.db_insert()
-    for d in doc.get(child_field):
+
+    children = doc.get(child_field)
+    if not children:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    for d in children:
         d.parent = doc.name
         d.parenttype = doc.doctype
         d.parentfield = child_field
-        d.db_insert()
+        d.name = d.name or frappe.generate_hash(length=10)
+        d.creation = d.creation or timestamp
+        d.modified = timestamp
+        d.owner = d.owner or user
+        d.modified_by = user
+
+    rows = [d.get_valid_dict(convert_dates_to_str=True) for d in children]
+    fields = list(rows[0])
+    frappe.db.bulk_insert(
+        child_dt,
+        fields=fields,
+        values=[tuple(row.get(f) for f in fields) for row in rows],
+    )
+
+
+def _delete_children(child_dt, parenttype, parents) -> None:
+    """Delete the child rows of many parents, a chunk of names at a time."""
+    parents = list(parents)
+    for start in range(0, len(parents), _SYNC_LOOKUP_CHUNK_SIZE):
+        frappe.db.delete(child_dt, {
+            "parent": ["in", parents[start:start + _SYNC_LOOKUP_CHUNK_SIZE]],
+            "parenttype": parenttype,
+        })
 
 
 def _footer_looks_like_unsubscribe(
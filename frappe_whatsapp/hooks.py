@@ -211,6 +211,10 @@ scheduler_events = {
 # ]
 
 
+_CLEAR_MESSAGE_SAVE_OBSERVERS = (
+    "frappe_whatsapp.utils.webhook.clear_message_save_observers_cache"
+)
+
 doc_events = {
     "WhatsApp Message": {
         # Status-notification subsystem: detect material status changes and
@@ -224,6 +228,23 @@ doc_events = {
             ".on_whatsapp_message_on_update"
         ),
     },
+    **{
+        # Creating, editing or removing any of these can change whether
+        # WhatsApp Message status updates must go through doc.save.
+        doctype: {
+            "on_update": _CLEAR_MESSAGE_SAVE_OBSERVERS,
+            "on_trash": _CLEAR_MESSAGE_SAVE_OBSERVERS,
+        }
+        for doctype in (
+            "Server Script",
+            "Webhook",
+            "Notification",
+            "Assignment Rule",
+            "Milestone Tracker",
+            "Energy Point Rule",
+            "Workflow",
+        )
+    },
     "*": {
         "before_insert": ("frappe_whatsapp.utils."
                           "run_server_script_for_doc_event"),
@@ -1,5 +1,6 @@
 """Run on each event."""
 import frappe
+from functools import lru_cache
 from typing import cast
 from frappe.core.doctype.server_script.server_script_utils import EVENT_MAP
 from frappe.model.document import Document
@@ -143,11 +144,11 @@ def get_whatsapp_account(
         phone_id=None, account_type='incoming') -> Document | None:
     """map whatsapp account with message"""
     if phone_id:
-        account_name = frappe.db.get_value(
-            'WhatsApp Account', {'phone_id': phone_id}, 'name')
+        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import get_account_cache_generation  # noqa: E501
+        account_name = _get_account_name_for_phone_id(
+            frappe.local.site, str(phone_id), get_account_cache_generation())
         if account_name:
-            return frappe.get_doc(
-                "WhatsApp Account", str(account_name))
+            return frappe.get_cached_doc("WhatsApp Account", account_name)
         return None
 
     account_field_type = ('is_default_incoming'
@@ -162,6 +163,16 @@ def get_whatsapp_account(
     return None
 
 
+@lru_cache(maxsize=64)
+def _get_account_name_for_phone_id(
+        site: str, phone_id: str, generation: str) -> str | None:
+    """Resolve a phone number ID once per worker process until any WhatsApp
+    Account changes; ``site`` and ``generation`` only key the cache."""
+    account_name = frappe.db.get_value(
+        'WhatsApp Account', {'phone_id': phone_id}, 'name')
+    return str(account_name) if account_name else None
+
+
 def format_number(number: str | None) -> str:
     """Format number by removing leading '+' if present.
 
@@ -171,8 +182,4 @@ def format_number(number: str | None) -> str:
     Returns:
         Formatted number without leading '+', or empty string if None.
     """
-    if not number:
-        return ""
-    if number.startswith("+"):
-        number = number[1:]
-    return number
+    return number.removeprefix("+") if number else ""
@@ -3,17 +3,40 @@
 Handles opt-out/opt-in keyword detection, profile consent updates,
 audit logging, and confirmation message sending.
 """
+import re
+
 import frappe
 from frappe import _
 from frappe.utils import now_datetime, time_diff_in_hours
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from frappe_whatsapp.utils import format_number
+from frappe_whatsapp.utils.meta import request_meta_json
+
+if TYPE_CHECKING:
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import WhatsAppProfiles  # noqa: E501
+
+OPT_OUT_KEYWORDS_CACHE_PREFIX = "frappe_whatsapp:opt_out_keywords:"
+OPT_OUT_KEYWORDS_CACHE_TTL = 5 * 60
 
 
 def get_compliance_settings() -> Any:
-    """Load the singleton WhatsApp Compliance Settings document (cached)."""
-    return frappe.get_cached_doc("WhatsApp Compliance Settings")
+    """Load the singleton WhatsApp Compliance Settings document (cached).
+
+    The document is memoized on ``frappe.local`` so repeated checks within
+    one request or job (e.g. a bulk send) skip the document-cache lookup.
+    """
+    settings = getattr(frappe.local, "whatsapp_compliance_settings", None)
+    if settings is None:
+        settings = frappe.get_cached_doc("WhatsApp Compliance Settings")
+        frappe.local.whatsapp_compliance_settings = settings
+    return settings
+
+
+def clear_compliance_settings_cache() -> None:
+    """Drop the request-scoped compliance settings cached by
+    ``get_compliance_settings``."""
+    frappe.local.whatsapp_compliance_settings = None
 
 
 def get_opt_out_keywords(
@@ -22,18 +45,43 @@ def get_opt_out_keywords(
 
     Each item has: keyword, case_sensitive, match_type, action,
     target_category.
+
+    Results are memoized per account on ``frappe.local`` and in redis for
+    ``OPT_OUT_KEYWORDS_CACHE_TTL`` seconds, so inbound messages and Meta
+    template syncs do not read the keyword table every time.
     """
-    filters: dict[str, Any] = {"is_enabled": 1}
-    if whatsapp_account:
-        filters["whatsapp_account"] = ("in", ["", whatsapp_account])
+    cache = getattr(frappe.local, "whatsapp_opt_out_keywords", None)
+    if cache is None:
+        cache = frappe.local.whatsapp_opt_out_keywords = {}
+    if whatsapp_account in cache:
+        return cache[whatsapp_account]
+
+    cache_key = f"{OPT_OUT_KEYWORDS_CACHE_PREFIX}{whatsapp_account or ''}"
+    keywords = frappe.cache().get_value(cache_key)
+    if keywords is None:
+        filters: dict[str, Any] = {"is_enabled": 1}
+        if whatsapp_account:
+            filters["whatsapp_account"] = ("in", ["", whatsapp_account])
+
+        keywords = frappe.get_all(
+            "WhatsApp Opt Out Keyword",
+            filters=filters,
+            fields=[
+                "keyword", "case_sensitive", "match_type",
+                "action", "target_category"],
+        )
+        frappe.cache().set_value(
+            cache_key, keywords,
+            expires_in_sec=OPT_OUT_KEYWORDS_CACHE_TTL)
 
-    return frappe.get_all(
-        "WhatsApp Opt Out Keyword",
-        filters=filters,
-        fields=[
-            "keyword", "case_sensitive", "match_type",
-            "action", "target_category"],
-    )
+    cache[whatsapp_account] = keywords
+    return keywords
+
+
+def clear_opt_out_keywords_cache() -> None:
+    """Drop the keywords cached by ``get_opt_out_keywords``."""
+    frappe.local.whatsapp_opt_out_keywords = None
+    frappe.cache().delete_keys(OPT_OUT_KEYWORDS_CACHE_PREFIX)
 
 
 def check_opt_out_keyword(
@@ -52,29 +100,53 @@ def check_opt_out_keyword(
         return None
 
     keywords = get_opt_out_keywords(whatsapp_account)
+    if not keywords:
+        return None
+
+    match = _get_opt_out_matcher(keywords).match(message_text.strip())
+    if not match:
+        return None
+    return keywords[int(match.lastgroup[1:])]
 
-    for kw in keywords:
-        keyword: str = kw["keyword"]
-        text = message_text
-        if not kw.get("case_sensitive"):
-            keyword = keyword.lower()
-            text = text.lower()
 
-        text = text.strip()
+def _get_opt_out_matcher(keywords: list[dict[str, Any]]) -> re.Pattern:
+    """Compile *keywords* into one pattern matched from the start of the text.
 
-        match_type = kw.get("match_type", "Exact")
-        matched = False
+    Each keyword is a named alternative ``k<index>``; alternatives are tried
+    in list order, so the first matching keyword wins as before. Patterns
+    are memoized on ``frappe.local`` by the keyword rows themselves, so an
+    edited keyword set simply compiles a new pattern.
+    """
+    key = tuple(
+        (kw["keyword"], bool(kw.get("case_sensitive")),
+         kw.get("match_type", "Exact"))
+        for kw in keywords
+    )
+    cache = getattr(frappe.local, "whatsapp_opt_out_matchers", None)
+    if cache is None:
+        cache = frappe.local.whatsapp_opt_out_matchers = {}
+    pattern = cache.get(key)
+    if pattern is not None:
+        return pattern
+
+    alternatives = []
+    for index, (keyword, case_sensitive, match_type) in enumerate(key):
+        escaped = re.escape(keyword)
         if match_type == "Exact":
-            matched = text == keyword
+            body = rf"{escaped}\Z"
         elif match_type == "Contains":
-            matched = keyword in text
+            body = rf"(?=.*?{escaped})"
         elif match_type == "Starts With":
-            matched = text.startswith(keyword)
-
-        if matched:
-            return kw
+            body = escaped
+        else:
+            # Unknown match types never matched.
+            body = r"(?!)"
+        if not case_sensitive:
+            body = f"(?i:{body})"
+        alternatives.append(f"(?P<k{index}>{body})")
 
-    return None
+    pattern = cache[key] = re.compile("|".join(alternatives), re.DOTALL)
+    return pattern
 
 
 def check_opt_in_keyword(message_text: str) -> bool:
@@ -86,9 +158,24 @@ def check_opt_in_keyword(message_text: str) -> bool:
     if not settings.enable_opt_in_detection:
         return False
 
-    raw = settings.opt_in_keywords or ""
-    opt_in_words = [w.strip().lower() for w in raw.split(",") if w.strip()]
-    return message_text.strip().lower() in opt_in_words
+    return message_text.strip().lower() in _get_opt_in_keywords(
+        settings.opt_in_keywords or "")
+
+
+def _get_opt_in_keywords(raw: str) -> frozenset[str]:
+    """Parse the comma-separated opt-in keywords setting.
+
+    The parsed set is memoized on ``frappe.local`` against the raw setting,
+    so it is rebuilt only when the setting text changes.
+    """
+    cached = getattr(frappe.local, "whatsapp_opt_in_keywords", None)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+
+    words = frozenset(
+        w.strip().lower() for w in raw.split(",") if w.strip())
+    frappe.local.whatsapp_opt_in_keywords = (raw, words)
+    return words
 
 
 # ── Consent verification before sending ──────────────────────────────
@@ -129,7 +216,121 @@ def verify_consent_for_send(
     suitable for storing in WhatsApp Message.consent_status_at_send.
     """
     settings = get_compliance_settings()
+    bypass = _enforcement_bypass(settings)
+    if bypass:
+        return bypass
 
+    number = format_number(phone_number)
+    if not number:
+        return ConsentResult(True, "Unknown", "No phone number")
+
+    check_category = bool(consent_category and not is_consent_request)
+    if check_category:
+        # Profile flags and the category's consent in one round-trip.
+        profiles = frappe.db.sql(
+            "SELECT p.`name`, p.`do_not_contact`, p.`is_opted_out`,"
+            " p.`is_opted_in`, c.`consented`"
+            " FROM `tabWhatsApp Profiles` p"
+            " LEFT JOIN `tabWhatsApp Profile Consent` c"
+            " ON c.`parent` = p.`name` AND c.`consent_category` = %s"
+            " WHERE p.`number` = %s"
+            " LIMIT 1",
+            (consent_category, number),
+            as_dict=True,
+        )
+    else:
+        profiles = frappe.db.get_all(
+            "WhatsApp Profiles",
+            filters={"number": number},
+            fields=["name", "do_not_contact", "is_opted_out", "is_opted_in"],
+            limit=1,
+        )
+
+    if not profiles:
+        return _decide_consent(
+            settings, None, None,
+            is_transactional=is_transactional,
+            is_consent_request=is_consent_request,
+            service_window_active=service_window_active,
+        )
+
+    # The row already carries every flag the decision reads.
+    profile = profiles[0]
+    cat_consented = profile.consented if check_category else None
+
+    return _decide_consent(
+        settings, profile, cat_consented,
+        consent_category=consent_category,
+        is_transactional=is_transactional,
+        is_consent_request=is_consent_request,
+        service_window_active=service_window_active,
+    )
+
+
+def verify_consent_for_send_many(
+        phone_numbers: list[str],
+        *,
+        consent_category: str | None = None,
+        is_transactional: bool = False,
+        is_consent_request: bool = False,
+) -> dict[str, ConsentResult]:
+    """``verify_consent_for_send`` for a list of recipients.
+
+    Profiles and category consent are read with one query each, however
+    many numbers are given. Returns a result for every input number, keyed
+    by the number as given.
+    """
+    settings = get_compliance_settings()
+    bypass = _enforcement_bypass(settings)
+    if bypass:
+        return {phone_number: bypass for phone_number in phone_numbers}
+
+    numbers = {
+        phone_number: format_number(phone_number)
+        for phone_number in phone_numbers
+    }
+    wanted = list({number for number in numbers.values() if number})
+    profiles = {
+        row.number: row for row in frappe.get_all(
+            "WhatsApp Profiles",
+            filters={"number": ["in", wanted]},
+            fields=["name", "number", "do_not_contact", "is_opted_out",
+                    "is_opted_in"],
+        )
+    } if wanted else {}
+
+    category_consent: dict[str, Any] = {}
+    if consent_category and profiles and not is_consent_request:
+        category_consent = {
+            row.parent: row.consented for row in frappe.get_all(
+                "WhatsApp Profile Consent",
+                filters={
+                    "parent": ["in", [p.name for p in profiles.values()]],
+                    "consent_category": consent_category,
+                },
+                fields=["parent", "consented"],
+            )
+        }
+
+    results: dict[str, ConsentResult] = {}
+    for phone_number, number in numbers.items():
+        if not number:
+            results[phone_number] = ConsentResult(
+                True, "Unknown", "No phone number")
+            continue
+        profile = profiles.get(number)
+        results[phone_number] = _decide_consent(
+            settings, profile,
+            category_consent.get(profile.name) if profile else None,
+            consent_category=consent_category,
+            is_transactional=is_transactional,
+            is_consent_request=is_consent_request,
+        )
+    return results
+
+
+def _enforcement_bypass(settings: Any) -> ConsentResult | None:
+    """Result for every recipient when consent is not enforced."""
     # Enforcement disabled → always allow
     if settings.consent_check_mode == "Disabled":
         return ConsentResult(True, "Bypassed", "Consent check disabled")
@@ -137,17 +338,21 @@ def verify_consent_for_send(
     if not settings.enforce_consent_check:
         return ConsentResult(True, "Bypassed", "Consent enforcement off")
 
-    number = format_number(phone_number)
-    if not number:
-        return ConsentResult(True, "Unknown", "No phone number")
+    return None
 
-    profile = frappe.db.get_all(
-        "WhatsApp Profiles",
-        filters={"number": number},
-        fields=["name", "do_not_contact", "is_opted_out", "is_opted_in"],
-        limit=1,
-    )
 
+def _decide_consent(
+        settings: Any,
+        profile: Any,
+        cat_consented: Any,
+        *,
+        consent_category: str | None = None,
+        is_transactional: bool = False,
+        is_consent_request: bool = False,
+        service_window_active: bool = False,
+) -> ConsentResult:
+    """Apply the consent rules to a profile (``None`` if there is none)
+    and its ``consented`` value for ``consent_category``."""
     # No profile exists → treat as Unknown
     if not profile:
         # Consent-request templates may be sent to collect opt-in.
@@ -167,11 +372,6 @@ def verify_consent_for_send(
         return ConsentResult(
             False, "Unknown", "No consent profile found for this number")
 
-    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import WhatsAppProfiles  # noqa: E501
-    profile = cast(
-        WhatsAppProfiles,
-        frappe.get_doc("WhatsApp Profiles", profile[0].name))
-
     # Hard block: do_not_contact always prevents sending
     if profile.do_not_contact:
         return ConsentResult(
@@ -183,12 +383,7 @@ def verify_consent_for_send(
             False, "Opted Out", "Contact has opted out")
 
     # Category-level check (if a category is specified)
-    if consent_category and profile.name and not is_consent_request:
-        cat_consented = frappe.db.get_value(
-            "WhatsApp Profile Consent",
-            {"parent": profile.name, "consent_category": consent_category},
-            "consented",
-        )
+    if consent_category and not is_consent_request:
         if cat_consented is not None and not cat_consented:
             return ConsentResult(
                 False, "Opted Out",
@@ -326,24 +521,26 @@ def is_within_conversation_window(
 def _get_or_create_profile(
         contact_number: str,
         whatsapp_account: str,
-        profile_name: str | None = None) -> str:
-    """Return the WhatsApp Profiles *name* for a contact, creating one if
+        profile_name: str | None = None) -> "WhatsAppProfiles":
+    """Return the WhatsApp Profiles document for a contact, creating one if
     needed."""
     number = format_number(contact_number)
-    profile_name_id = frappe.db.get_value(
+    profile_id = frappe.db.get_value(
         "WhatsApp Profiles", {"number": number}, "name")
 
-    if profile_name_id:
-        return str(profile_name_id)
+    if not profile_id:
+        # INSERT IGNORE also absorbs a concurrent insert of the same
+        # number; only then is the winner's name looked up.
+        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import insert_profile_if_missing  # noqa: E501
+        profile_id = insert_profile_if_missing(
+            number,
+            profile_name=profile_name,
+            whatsapp_account=whatsapp_account,
+        ) or frappe.db.get_value(
+            "WhatsApp Profiles", {"number": number}, "name")
 
-    doc = frappe.get_doc({
-        "doctype": "WhatsApp Profiles",
-        "number": number,
-        "profile_name": profile_name,
-        "whatsapp_account": whatsapp_account,
-    })
-    doc.insert(ignore_permissions=True)
-    return str(doc.name)
+    return cast("WhatsAppProfiles", frappe.get_doc(
+        "WhatsApp Profiles", str(profile_id)))
 
 
 def process_opt_out(
@@ -355,12 +552,8 @@ def process_opt_out(
         profile_name: str | None = None,
 ) -> None:
     """Mark a contact as opted-out and create an audit log entry."""
-    profile_id = _get_or_create_profile(
+    profile = _get_or_create_profile(
         contact_number, whatsapp_account, profile_name)
-    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import WhatsAppProfiles  # noqa: E501
-    profile = cast(
-        WhatsAppProfiles,
-        frappe.get_doc("WhatsApp Profiles", profile_id))
 
     previous_opted_out = bool(profile.is_opted_out)
 
@@ -380,8 +573,8 @@ def process_opt_out(
         profile.save(ignore_permissions=True)
 
         _log_consent(
-            profile=profile_id,
-            phone_number=format_number(contact_number),
+            profile=str(profile.name),
+            phone_number=profile.number,
             action_type="Opt-Out",
             previous_status=previous_opted_out,
             new_status=True,
@@ -400,16 +593,15 @@ def _category_opt_out(
         profile, target_category: str,
         message_doc_name: str | None) -> None:
     """Opt-out a profile from a specific consent category."""
-    for row in (profile.get("category_consents") or []):
-        if row.consent_category == target_category:
-            row.consented = 0
-            row.consented_at = now_datetime()
-            break
+    rows = profile.get("category_consents") or []
+    row = next(
+        (r for r in rows if r.consent_category == target_category), None)
+    if row:
+        row.consented = 0
+        row.consented_at = now_datetime()
 
     # Check if all categories are now opted out
-    all_out = all(
-        not row.consented
-        for row in (profile.get("category_consents") or []))
+    all_out = not any(r.consented for r in rows)
 
     if all_out:
         profile.consent_status = "Opted Out"
@@ -440,12 +632,8 @@ def process_opt_in(
         profile_name: str | None = None,
 ) -> None:
     """Mark a contact as opted-in and create an audit log entry."""
-    profile_id = _get_or_create_profile(
+    profile = _get_or_create_profile(
         contact_number, whatsapp_account, profile_name)
-    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import WhatsAppProfiles  # noqa: E501
-    profile = cast(
-        WhatsAppProfiles,
-        frappe.get_doc("WhatsApp Profiles", profile_id))
 
     previous_opted_in = bool(profile.is_opted_in)
 
@@ -461,8 +649,8 @@ def process_opt_in(
     profile.save(ignore_permissions=True)
 
     _log_consent(
-        profile=profile_id,
-        phone_number=format_number(contact_number),
+        profile=str(profile.name),
+        phone_number=profile.number,
         action_type="Opt-In",
         previous_status=previous_opted_in,
         new_status=True,
@@ -530,32 +718,31 @@ def _send_plain_text(
     We bypass WhatsApp Message doc creation to avoid triggering consent
     checks on the confirmation itself.
     """
-    import json
-    from frappe.integrations.utils import make_post_request
     from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import _get_cached_account  # noqa: E501
     from typing import cast
 
-    wa = cast(
-        WhatsAppAccount,
-        frappe.get_doc("WhatsApp Account", whatsapp_account_name))
+    # Loaded and decrypted once per request/job, shared with WhatsApp
+    # Message sends.
+    account, token = _get_cached_account(whatsapp_account_name)
+    wa = cast(WhatsAppAccount, account)
 
-    token = wa.get_password("token")
     data = {
         "messaging_product": "whatsapp",
         "to": format_number(to),
         "type": "text",
         "text": {"body": message},
     }
-    headers = {
-        "authorization": f"Bearer {token}",
-        "content-type": "application/json",
-    }
+    headers = {"authorization": f"Bearer {token}"}
 
     try:
-        make_post_request(
+        request_meta_json(
+            "POST",
             f"{wa.url}/{wa.version}/{wa.phone_id}/messages",
+            account_name=str(wa.name),
+            operation=_("Send consent confirmation"),
             headers=headers,
-            data=json.dumps(data),
+            json_body=data,
         )
     except Exception:
         frappe.log_error(
@@ -567,15 +754,13 @@ def _send_template_confirmation(
         *, to: str, template_name: str,
         whatsapp_account_name: str) -> None:
     """Send a template confirmation message without consent checks."""
-    import json
-    from frappe.integrations.utils import make_post_request
     from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa: E501
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import _get_cached_account  # noqa: E501
     from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import WhatsAppTemplates  # noqa: E501
     from typing import cast
 
-    wa = cast(
-        WhatsAppAccount,
-        frappe.get_doc("WhatsApp Account", whatsapp_account_name))
+    account, token = _get_cached_account(whatsapp_account_name)
+    wa = cast(WhatsAppAccount, account)
 
     template = cast(
         WhatsAppTemplates,
@@ -599,7 +784,6 @@ def _send_template_confirmation(
             _("Opt-out confirmation template must not require media headers.")
         )
 
-    token = wa.get_password("token")
     data = {
         "messaging_product": "whatsapp",
         "to": format_number(to),
@@ -611,16 +795,16 @@ def _send_template_confirmation(
         },
     }
 
-    headers = {
-        "authorization": f"Bearer {token}",
-        "content-type": "application/json",
-    }
+    headers = {"authorization": f"Bearer {token}"}
 
     try:
-        make_post_request(
+        request_meta_json(
+            "POST",
             f"{wa.url}/{wa.version}/{wa.phone_id}/messages",
+            account_name=str(wa.name),
+            operation=_("Send opt-out confirmation template"),
             headers=headers,
-            data=json.dumps(data),
+            json_body=data,
         )
     except Exception:
         frappe.log_error(
@@ -686,23 +870,27 @@ def enforce_marketing_template_compliance(template) -> None:
     if not settings.include_unsubscribe_in_marketing:
         return
 
-    footer = (getattr(template, "footer", "") or "").strip()
-
-    # Pass 1: template-level unsubscribe_text (explicit operator choice).
-    tmpl_unsub = (getattr(template, "unsubscribe_text", "") or "").strip()
-    if tmpl_unsub and tmpl_unsub.lower() in footer.lower():
-        return
-
-    # Pass 2 (a–c): shared semantic detection — same logic as sync-time.
-    # Late import avoids a circular dependency (whatsapp_templates imports
-    # from consent, not the other way round).
-    if footer:
-        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import (  # noqa: E501
-            _footer_looks_like_unsubscribe,
+    # A broadcast re-checks the same template for every recipient; only a
+    # pass is remembered, keyed so an edited template or setting re-checks.
+    memo_key = None
+    if getattr(template, "name", None):
+        memo_key = (
+            str(template.name),
+            str(getattr(template, "modified", "")),
+            settings.default_unsubscribe_text or "",
         )
-        if _footer_looks_like_unsubscribe(footer, settings):
+        passed = getattr(frappe.local, "whatsapp_marketing_compliant", None)
+        if passed is None:
+            passed = frappe.local.whatsapp_marketing_compliant = set()
+        if memo_key in passed:
             return
 
+    if _marketing_footer_is_compliant(template, settings):
+        if memo_key:
+            frappe.local.whatsapp_marketing_compliant.add(memo_key)
+        return
+
+    tmpl_unsub = (getattr(template, "unsubscribe_text", "") or "").strip()
     unsubscribe_text = tmpl_unsub or (
         settings.default_unsubscribe_text or "").strip()
     if not unsubscribe_text:
@@ -717,6 +905,29 @@ def enforce_marketing_template_compliance(template) -> None:
     )
 
 
+def _marketing_footer_is_compliant(template, settings: Any) -> bool:
+    """Whether a marketing template's footer carries unsubscribe
+    instructions (see ``enforce_marketing_template_compliance``)."""
+    footer = (getattr(template, "footer", "") or "").strip()
+
+    # Pass 1: template-level unsubscribe_text (explicit operator choice).
+    tmpl_unsub = (getattr(template, "unsubscribe_text", "") or "").strip()
+    if tmpl_unsub and tmpl_unsub.lower() in footer.lower():
+        return True
+
+    # Pass 2 (a–c): shared semantic detection — same logic as sync-time.
+    # Late import avoids a circular dependency (whatsapp_templates imports
+    # from consent, not the other way round).
+    if footer:
+        from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_templates.whatsapp_templates import (  # noqa: E501
+            _footer_looks_like_unsubscribe,
+        )
+        if _footer_looks_like_unsubscribe(footer, settings):
+            return True
+
+    return False
+
+
 def enforce_template_send_rules(
         template, *,
         to_number: str | None = None,
@@ -748,15 +959,14 @@ def enforce_template_send_rules(
     if not number:
         frappe.throw(_("Cannot verify opt-in without a recipient number."))
 
-    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_profiles.whatsapp_profiles import WhatsAppProfiles  # noqa: E501
-    profile = frappe.db.get_all(
+    profiles = frappe.db.get_all(
         "WhatsApp Profiles",
         filters={"number": number},
-        fields=["name", "do_not_contact", "is_opted_out", "is_opted_in"],
+        fields=["do_not_contact", "is_opted_out", "is_opted_in"],
         limit=1,
     )
 
-    if not profile:
+    if not profiles:
         # Active service window allows sending requires_opt_in templates to
         # contacts who have not yet built a profile (unknown consent).
         if service_window_active:
@@ -764,9 +974,7 @@ def enforce_template_send_rules(
         frappe.throw(
             _("Recipient has not opted in to receive this template."))
 
-    profile = cast(
-        WhatsAppProfiles,
-        frappe.get_doc("WhatsApp Profiles", profile[0].name))
+    profile = profiles[0]
 
     # DNC and explicit opt-out always block, even within the service window.
     if profile.do_not_contact or profile.is_opted_out:
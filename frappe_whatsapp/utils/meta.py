@@ -2,16 +2,69 @@
 
 from __future__ import annotations
 
+import http.cookiejar
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from urllib.parse import urlparse
 
 import frappe
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from frappe import _
 
 
 DEFAULT_TIMEOUT = 30
 MAX_PAGES = 100
+BULK_MAX_WORKERS = 16
+
+# Shared per-process session so consecutive Graph API calls reuse pooled
+# keep-alive connections instead of a fresh TCP + TLS handshake each time.
+# urllib3 only retries idempotent methods by default, so a message POST is
+# never re-sent after Meta may already have accepted it. The session is
+# shared by every site, account and client app in the process, so it must
+# not keep cookies from one response and replay them on later calls.
+_SESSION = requests.Session()
+_SESSION.cookies.set_policy(
+    http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session for Graph API requests."""
+    return _SESSION
+
+
+class _RateLimiter:
+    """Space calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
 
 
 def _as_dict(value: Any) -> dict[str, Any]:
@@ -64,6 +117,54 @@ def _meta_error_message(
     )
 
 
+def _read_meta_response(
+    response: requests.Response,
+    *,
+    account_name: str,
+    operation: str,
+) -> tuple[dict[str, Any], str | None]:
+    """Return ``(payload, error_message)`` for a Graph API response."""
+    if response.status_code >= 400:
+        return {}, _meta_error_message(
+            response,
+            account_name=account_name,
+            operation=operation,
+        )
+
+    try:
+        payload = response.json() if response.content else {}
+    except (TypeError, ValueError):
+        return {}, _("WhatsApp Account {0}: {1} returned invalid JSON.").format(
+            account_name,
+            operation,
+        )
+
+    if not isinstance(payload, dict):
+        return {}, _(
+            "WhatsApp Account {0}: {1} returned an invalid response."
+        ).format(
+            account_name,
+            operation,
+        )
+    return payload, None
+
+
+def _unreachable_message(
+    exc: requests.RequestException,
+    *,
+    account_name: str,
+    operation: str,
+) -> str:
+    # Requests exceptions may contain the prepared URL. In particular,
+    # debug_token carries the inspected token as a query parameter, so do
+    # not include str(exc) in user-facing errors or logs.
+    return _("WhatsApp Account {0}: {1} could not reach Meta ({2}).").format(
+        account_name,
+        operation,
+        type(exc).__name__,
+    )
+
+
 def request_meta_json(
     method: str,
     url: str,
@@ -73,58 +174,112 @@ def request_meta_json(
     headers: dict[str, str] | None = None,
     params: dict[str, Any] | None = None,
     json_body: dict[str, Any] | None = None,
+    data: Any = None,
     timeout: int = DEFAULT_TIMEOUT,
 ) -> dict[str, Any]:
-    """Make a Graph API request without leaking credentials on failure."""
+    """Make a Graph API request without leaking credentials on failure.
+
+    ``data`` is a raw body for non-JSON requests; pass an open binary file
+    to stream it rather than reading it into memory.
+    """
+    if json_body is not None:
+        # orjson serializes large template payloads much faster than the
+        # stdlib encoder requests would use for ``json=``.
+        data = orjson.dumps(json_body, default=str)
+        headers = {**(headers or {}), "content-type": "application/json"}
+
     try:
-        response = requests.request(
+        response = _SESSION.request(
             method,
             url,
             headers=headers,
             params=params,
-            json=json_body,
+            data=data,
             timeout=timeout,
         )
     except requests.RequestException as exc:
-        # Requests exceptions may contain the prepared URL. In particular,
-        # debug_token carries the inspected token as a query parameter, so do
-        # not include str(exc) in user-facing errors or logs.
-        frappe.throw(
-            _("WhatsApp Account {0}: {1} could not reach Meta ({2}).").format(
-                account_name,
-                operation,
-                type(exc).__name__,
-            )
-        )
-
-    frappe.flags.integration_request = response
-    if response.status_code >= 400:
         frappe.throw(
-            _meta_error_message(
-                response,
+            _unreachable_message(
+                exc,
                 account_name=account_name,
                 operation=operation,
             )
         )
 
-    try:
-        payload = response.json() if response.content else {}
-    except (TypeError, ValueError):
-        frappe.throw(
-            _("WhatsApp Account {0}: {1} returned invalid JSON.").format(
-                account_name,
-                operation,
-            )
-        )
+    frappe.flags.integration_request = response
+    payload, error = _read_meta_response(
+        response,
+        account_name=account_name,
+        operation=operation,
+    )
+    if error:
+        frappe.throw(error)
+    return payload
 
-    if not isinstance(payload, dict):
-        frappe.throw(
-            _("WhatsApp Account {0}: {1} returned an invalid response.").format(
-                account_name,
-                operation,
+
+def request_meta_json_many(
+    method: str,
+    url: str,
+    *,
+    account_name: str,
+    operation: str,
+    json_bodies: list[dict[str, Any]],
+    headers: dict[str, str] | None = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    max_workers: int = BULK_MAX_WORKERS,
+    rate_limit: float | None = None,
+) -> list[tuple[dict[str, Any], str | None]]:
+    """Send one Graph API request per body, overlapping the round trips.
+
+    Only the HTTP calls run in worker threads; serialization and response
+    handling stay on the calling thread, which owns the Frappe site context.
+    ``rate_limit`` caps the requests started per second. Returns
+    ``(payload, error_message)`` per body, in input order, instead of
+    throwing on the first failure.
+    """
+    if not json_bodies:
+        return []
+
+    headers = {**(headers or {}), "content-type": "application/json"}
+    bodies = [orjson.dumps(body, default=str) for body in json_bodies]
+    limiter = _RateLimiter(rate_limit) if rate_limit else None
+
+    def _send(data: bytes) -> requests.Response | requests.RequestException:
+        if limiter:
+            limiter.wait()
+        try:
+            return _SESSION.request(
+                method,
+                url,
+                headers=headers,
+                data=data,
+                timeout=timeout,
             )
-        )
-    return payload
+        except requests.RequestException as exc:
+            return exc
+
+    workers = max(1, min(max_workers, len(bodies)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        responses = list(pool.map(_send, bodies))
+
+    results: list[tuple[dict[str, Any], str | None]] = []
+    for response in responses:
+        if isinstance(response, requests.RequestException):
+            results.append((
+                {},
+                _unreachable_message(
+                    response,
+                    account_name=account_name,
+                    operation=operation,
+                ),
+            ))
+            continue
+        results.append(_read_meta_response(
+            response,
+            account_name=account_name,
+            operation=operation,
+        ))
+    return results
 
 
 def _same_origin(first_url: str, next_url: str) -> bool:
@@ -137,38 +292,76 @@ def _same_origin(first_url: str, next_url: str) -> bool:
     )
 
 
-def get_paginated_data(
+def _walk_pages(
     url: str,
+    headers: dict[str, str],
+    params: dict[str, Any] | None,
+    timeout: int = DEFAULT_TIMEOUT,
+) -> list[requests.Response | requests.RequestException]:
+    """GET a collection page by page, doing HTTP only.
+
+    Safe to run off the site thread. Stops after a failed or unreadable page,
+    the last page, an unsafe next URL or ``MAX_PAGES``;
+    ``_collect_pages`` reports which.
+    """
+    pages: list[requests.Response | requests.RequestException] = []
+    next_url = url
+    next_params = params
+    for _page in range(MAX_PAGES):
+        try:
+            response = _SESSION.request(
+                "GET",
+                next_url,
+                headers=headers,
+                params=next_params,
+                timeout=timeout,
+            )
+        except requests.RequestException as exc:
+            pages.append(exc)
+            break
+        pages.append(response)
+        if response.status_code >= 400:
+            break
+        try:
+            payload = response.json() if response.content else {}
+        except (TypeError, ValueError):
+            break
+        raw_next = _as_dict(_as_dict(payload).get("paging")).get("next")
+        if not raw_next or not _same_origin(url, str(raw_next)):
+            break
+        next_url = str(raw_next)
+        next_params = None
+    return pages
+
+
+def _collect_pages(
+    pages: list[requests.Response | requests.RequestException],
     *,
+    first_url: str,
     account_name: str,
     operation: str,
-    headers: dict[str, str],
-    params: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
-    """Return every object in a Graph API collection."""
-    first_url = url
-    next_url: str | None = url
-    next_params = params
+    """Items from ``_walk_pages`` responses, throwing on the first problem."""
     results: list[dict[str, Any]] = []
-
-    for _page in range(MAX_PAGES):
-        if not next_url:
-            return results
-        if not _same_origin(first_url, next_url):
+    next_url: str | None = None
+    for page in pages:
+        if isinstance(page, requests.RequestException):
             frappe.throw(
-                _("WhatsApp Account {0}: Meta returned an unsafe pagination URL.").format(
-                    account_name
+                _unreachable_message(
+                    page,
+                    account_name=account_name,
+                    operation=operation,
                 )
             )
-
-        payload = request_meta_json(
-            "GET",
-            next_url,
+        frappe.flags.integration_request = page
+        payload, error = _read_meta_response(
+            page,
             account_name=account_name,
             operation=operation,
-            headers=headers,
-            params=next_params,
         )
+        if error:
+            frappe.throw(error)
+
         data = payload.get("data")
         if not isinstance(data, list):
             frappe.throw(
@@ -182,13 +375,72 @@ def get_paginated_data(
         paging = _as_dict(payload.get("paging"))
         raw_next = paging.get("next")
         next_url = str(raw_next) if raw_next else None
-        next_params = None
+        if next_url and not _same_origin(first_url, next_url):
+            frappe.throw(
+                _("WhatsApp Account {0}: Meta returned an unsafe pagination URL.").format(
+                    account_name
+                )
+            )
 
-    frappe.throw(
-        _("WhatsApp Account {0}: {1} exceeded {2} pages.").format(
-            account_name,
-            operation,
-            MAX_PAGES,
+    if next_url:
+        frappe.throw(
+            _("WhatsApp Account {0}: {1} exceeded {2} pages.").format(
+                account_name,
+                operation,
+                MAX_PAGES,
+            )
         )
-    )
     return results
+
+
+def get_paginated_data(
+    url: str,
+    *,
+    account_name: str,
+    operation: str,
+    headers: dict[str, str],
+    params: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Return every object in a Graph API collection."""
+    return _collect_pages(
+        _walk_pages(url, headers, params),
+        first_url=url,
+        account_name=account_name,
+        operation=operation,
+    )
+
+
+def get_paginated_data_many(
+    collections: list[tuple[str, str, dict[str, str]]],
+    *,
+    operation: str,
+    params: dict[str, Any] | None = None,
+    max_workers: int = BULK_MAX_WORKERS,
+) -> list[list[dict[str, Any]]]:
+    """``get_paginated_data`` for several ``(url, account_name, headers)``
+    collections, walked concurrently.
+
+    Each collection's pages are still fetched in order; only the HTTP runs
+    in worker threads. Results come back in input order, and the first
+    failing collection (in that order) throws.
+    """
+    if not collections:
+        return []
+
+    def _walk(collection: tuple[str, str, dict[str, str]]):
+        url, _account_name, headers = collection
+        return _walk_pages(url, headers, params)
+
+    workers = max(1, min(max_workers, len(collections)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        walked = list(pool.map(_walk, collections))
+
+    return [
+        _collect_pages(
+            pages,
+            first_url=url,
+            account_name=account_name,
+            operation=operation,
+        )
+        for (url, account_name, _headers), pages in zip(collections, walked)
+    ]
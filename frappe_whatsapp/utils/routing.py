@@ -10,9 +10,9 @@ import frappe
 from frappe.core.doctype.document_share_key.document_share_key import (
     is_expired,
 )
-from frappe.integrations.utils import make_post_request
 from frappe.utils import get_url, now_datetime
 from frappe_whatsapp.utils import format_number
+from frappe_whatsapp.utils.meta import DEFAULT_TIMEOUT, get_session
 
 if TYPE_CHECKING:
     from ..frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import (
@@ -21,6 +21,7 @@ if TYPE_CHECKING:
 
 
 ROUTE_DOCTYPE = "WhatsApp Conversation Route"
+ROUTE_APP_CACHE_KEY = "frappe_whatsapp:conversation_route_app"
 FORWARDED_INCOMING_CACHE_PREFIX = "frappe_whatsapp:incoming_forwarded:"
 PRIVATE_FILE_PREFIX = "/private/files/"
 
@@ -53,33 +54,44 @@ def _upsert_conversation_route(
         whatsapp_account=whatsapp_account,
         contact_number=contact,
     )
+    timestamp = now_datetime()
     values: dict[str, Any] = {
         "last_source_app": source_app,
     }
     if update_last_outgoing:
         values["last_outgoing_message"] = last_outgoing_message
-        values["last_outgoing_at"] = now_datetime()
-
-    existing = frappe.db.exists(dt=ROUTE_DOCTYPE, dn=doc_name)
-    if existing:
-        frappe.db.set_value(
-            ROUTE_DOCTYPE,
-            existing,
-            values,
-            update_modified=False,
-        )
-        return
-
-    doc = frappe.get_doc(
-        {
-            "doctype": ROUTE_DOCTYPE,
-            "name": doc_name,
-            "whatsapp_account": whatsapp_account,
-            "contact_number": contact,
-            **values,
-        }
+        values["last_outgoing_at"] = timestamp
+
+    # One round-trip for both the first message and every later one; the
+    # route has no controller hooks to run on insert.
+    user = frappe.session.user
+    columns = ", ".join(f"`{fieldname}`" for fieldname in values)
+    placeholders = ", ".join(["%s"] * len(values))
+    updates = ", ".join(
+        f"`{fieldname}` = VALUES(`{fieldname}`)" for fieldname in values)
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tab{ROUTE_DOCTYPE}`
+            (name, creation, modified, owner, modified_by, docstatus, idx,
+             whatsapp_account, contact_number, {columns})
+        VALUES
+            (%s, %s, %s, %s, %s, 0, 0, %s, %s, {placeholders})
+        ON DUPLICATE KEY UPDATE {updates}
+        """,
+        (
+            doc_name, timestamp, timestamp, user, user,
+            whatsapp_account, contact,
+            *values.values(),
+        ),
     )
-    doc.insert(ignore_permissions=True)
+    clear_route_app_cache(doc_name)
+    # A read later in this transaction may cache the uncommitted app.
+    frappe.db.after_rollback.add(lambda: clear_route_app_cache(doc_name))
+
+
+def clear_route_app_cache(doc_name: str) -> None:
+    """Drop the cached ``last_source_app`` of a conversation route."""
+    frappe.cache().hdel(ROUTE_APP_CACHE_KEY, doc_name)
 
 
 def set_last_sender_app(
@@ -110,6 +122,10 @@ def get_last_sender_app(
         contact_number=contact,
     )
 
+    last_app = frappe.cache().hget(ROUTE_APP_CACHE_KEY, doc_name)
+    if last_app:
+        return last_app
+
     last_app = frappe.db.get_value(
         ROUTE_DOCTYPE,
         doc_name,
@@ -117,6 +133,7 @@ def get_last_sender_app(
     )
     if not last_app:
         return None
+    frappe.cache().hset(ROUTE_APP_CACHE_KEY, doc_name, str(last_app))
     return str(last_app)
 
 
@@ -336,7 +353,27 @@ def serialize_incoming_message_for_forwarding(
     }
 
 
+def _post_to_client_app(
+        url: str, *, data: str, headers: dict[str, str]) -> None:
+    """POST to a client app over the shared keep-alive session.
+
+    Client apps usually receive bursts of messages, so reusing the pooled
+    connection skips a TCP + TLS handshake per forward. The session never
+    retries a POST, so a message is not delivered twice.
+    """
+    response = get_session().post(
+        url, data=data, headers=headers, timeout=DEFAULT_TIMEOUT)
+    frappe.flags.integration_request = response
+    response.raise_for_status()
+
+
 def forward_incoming_to_app(*, incoming_message_doc):
+    """POST an incoming message to its routed client app.
+
+    This blocks on the client's webhook, so the Meta webhook never calls it
+    directly: it goes through ``forward_incoming_to_app_async``, which runs
+    it in a background job after the message is committed.
+    """
     routed_app = incoming_message_doc.get("routed_app")
     if not routed_app:
         routed_app = resolve_incoming_routed_app(
@@ -369,8 +406,7 @@ def forward_incoming_to_app(*, incoming_message_doc):
             incoming_message_doc=incoming_message_doc)
     }
 
-    # best practice: enqueue to avoid slowing webhook response
-    make_post_request(
+    _post_to_client_app(
         app.inbound_webhook_url,
         data=json.dumps(payload),
         headers={
@@ -382,14 +418,53 @@ def forward_incoming_to_app(*, incoming_message_doc):
 
 
 def forward_incoming_to_app_async(*, incoming_message_name: str):
+    """Forward an incoming message in a background job after commit.
+
+    Messages queued in the same transaction (one webhook payload) share a
+    single job, so a burst of replies costs one enqueue instead of one per
+    message.
+    """
+    pending = getattr(frappe.local, "whatsapp_pending_forwards", None)
+    if pending is None:
+        pending = frappe.local.whatsapp_pending_forwards = []
+        frappe.db.after_commit.add(_enqueue_pending_forwards)
+        frappe.db.after_rollback.add(_discard_pending_forwards)
+    pending.append(incoming_message_name)
+
+
+def _enqueue_pending_forwards():
+    names = getattr(frappe.local, "whatsapp_pending_forwards", None)
+    frappe.local.whatsapp_pending_forwards = None
+    if not names:
+        return
     frappe.enqueue(
-        "frappe_whatsapp.utils.routing.forward_incoming_to_app_by_name",
+        "frappe_whatsapp.utils.routing.forward_incoming_to_app_by_names",
         queue="short",
-        incoming_message_name=incoming_message_name,
-        enqueue_after_commit=True
+        incoming_message_names=names,
     )
 
 
+def _discard_pending_forwards():
+    frappe.local.whatsapp_pending_forwards = None
+
+
+def forward_incoming_to_app_by_names(*, incoming_message_names: list[str]):
+    """Forward each message, so one failing client app does not hold back
+    the rest of the batch."""
+    for incoming_message_name in incoming_message_names:
+        try:
+            forward_incoming_to_app_by_name(
+                incoming_message_name=incoming_message_name)
+        except Exception:
+            frappe.log_error(
+                title="WhatsApp incoming message forward failed",
+                message=(
+                    f"WhatsApp Message {incoming_message_name}\n"
+                    f"{frappe.get_traceback()}"
+                ),
+            )
+
+
 def forward_incoming_to_app_by_name(*, incoming_message_name: str):
     incoming_message_doc = frappe.get_doc(
         "WhatsApp Message", incoming_message_name)
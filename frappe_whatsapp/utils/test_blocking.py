@@ -129,8 +129,8 @@ class TestBlockedIncomingContacts(FrappeTestCase):
 
         with (
             patch(
-                "frappe_whatsapp.utils.webhook.requests.get"
-            ) as requests_get,
+                "frappe_whatsapp.utils.webhook.get_session"
+            ) as get_session,
             patch(
                 "frappe_whatsapp.utils.webhook"
                 ".forward_incoming_to_app_async"
@@ -143,7 +143,7 @@ class TestBlockedIncomingContacts(FrappeTestCase):
                 message_type="image",
             )
 
-        requests_get.assert_not_called()
+        get_session.assert_not_called()
         forward_async.assert_not_called()
 
     def test_unblock_contact_allows_inbound_guard_to_pass(self):
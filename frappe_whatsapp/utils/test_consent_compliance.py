@@ -5,16 +5,22 @@ Covers:
   (the con_req_zoni-en scenario)
 - send-time compliance validation (enforce_marketing_template_compliance)
 - Consent-request bypass before opt-in (verify_consent_for_send)
+- Bulk consent check (verify_consent_for_send_many)
 - YES quick reply → opt-in via _handle_consent_keywords
 - STOP → opt-out via _handle_consent_keywords
 - NO quick reply → documented no-op behavior
+- Opt-out keyword matching (check_opt_out_keyword / _get_opt_out_matcher)
 """
 
 from types import SimpleNamespace
 from unittest.mock import patch
 
 from frappe.tests.utils import FrappeTestCase
-from frappe_whatsapp.utils.consent import enforce_marketing_template_compliance
+from frappe_whatsapp.utils.consent import (
+    _get_opt_out_matcher,
+    check_opt_out_keyword,
+    enforce_marketing_template_compliance,
+)
 
 _CONSENT_MOD = "frappe_whatsapp.utils.consent"
 _WEBHOOK_MOD = "frappe_whatsapp.utils.webhook"
@@ -207,12 +213,10 @@ class TestConsentRequestBypassBeforeOptIn(FrappeTestCase):
         self.assertIn("Consent request", result.reason)
 
     @patch(f"{_CONSENT_MOD}.format_number", return_value="+1234567890")
-    @patch(f"{_CONSENT_MOD}.frappe.db.get_all",
-           return_value=[SimpleNamespace(name="p1")])
-    @patch(f"{_CONSENT_MOD}.frappe.get_doc")
+    @patch(f"{_CONSENT_MOD}.frappe.db.get_all")
     @patch(f"{_CONSENT_MOD}.get_compliance_settings")
     def test_opted_out_blocks_even_consent_request(
-        self, mock_settings, mock_get_doc, _mock_db, _mock_fmt
+        self, mock_settings, mock_get_all, _mock_fmt
     ):
         """Opted-out contacts must be blocked even for consent-request
         templates."""
@@ -221,12 +225,12 @@ class TestConsentRequestBypassBeforeOptIn(FrappeTestCase):
             consent_check_mode="Strict",
             enforce_consent_check=True,
         )
-        mock_get_doc.return_value = SimpleNamespace(
+        mock_get_all.return_value = [SimpleNamespace(
             name="p1",
             do_not_contact=False,
             is_opted_out=True,
             is_opted_in=False,
-        )
+        )]
         result = verify_consent_for_send(
             "+1234567890", is_consent_request=True)
 
@@ -234,12 +238,10 @@ class TestConsentRequestBypassBeforeOptIn(FrappeTestCase):
         self.assertEqual(result.status, "Opted Out")
 
     @patch(f"{_CONSENT_MOD}.format_number", return_value="+1234567890")
-    @patch(f"{_CONSENT_MOD}.frappe.db.get_all",
-           return_value=[SimpleNamespace(name="p2")])
-    @patch(f"{_CONSENT_MOD}.frappe.get_doc")
+    @patch(f"{_CONSENT_MOD}.frappe.db.get_all")
     @patch(f"{_CONSENT_MOD}.get_compliance_settings")
     def test_dnc_blocks_even_consent_request(
-        self, mock_settings, mock_get_doc, _mock_db, _mock_fmt
+        self, mock_settings, mock_get_all, _mock_fmt
     ):
         """DNC contacts must be blocked even for consent-request templates."""
         from frappe_whatsapp.utils.consent import verify_consent_for_send
@@ -247,18 +249,54 @@ class TestConsentRequestBypassBeforeOptIn(FrappeTestCase):
             consent_check_mode="Strict",
             enforce_consent_check=True,
         )
-        mock_get_doc.return_value = SimpleNamespace(
+        mock_get_all.return_value = [SimpleNamespace(
             name="p2",
             do_not_contact=True,
             is_opted_out=False,
             is_opted_in=False,
-        )
+        )]
         result = verify_consent_for_send(
             "+1234567890", is_consent_request=True)
 
         self.assertFalse(result.allowed)
         self.assertEqual(result.status, "Opted Out")
 
+    @patch(f"{_CONSENT_MOD}.frappe.get_all")
+    @patch(f"{_CONSENT_MOD}.get_compliance_settings")
+    def test_many_checks_all_recipients_in_two_queries(
+        self, mock_settings, mock_get_all
+    ):
+        """Bulk check reads profiles and category consent once each."""
+        from frappe_whatsapp.utils.consent import verify_consent_for_send_many
+        mock_settings.return_value = SimpleNamespace(
+            consent_check_mode="Strict",
+            enforce_consent_check=True,
+            allow_transactional_without_consent=False,
+        )
+
+        def get_all(doctype, **kwargs):
+            if doctype == "WhatsApp Profiles":
+                return [
+                    SimpleNamespace(
+                        name="p1", number="111", do_not_contact=0,
+                        is_opted_out=0, is_opted_in=1),
+                    SimpleNamespace(
+                        name="p2", number="222", do_not_contact=0,
+                        is_opted_out=0, is_opted_in=1),
+                ]
+            return [SimpleNamespace(parent="p2", consented=0)]
+
+        mock_get_all.side_effect = get_all
+        results = verify_consent_for_send_many(
+            ["+111", "+222", "+333"], consent_category="Promotions")
+
+        self.assertEqual(mock_get_all.call_count, 2)
+        self.assertTrue(results["+111"].allowed)
+        self.assertFalse(results["+222"].allowed)
+        self.assertEqual(results["+222"].status, "Opted Out")
+        self.assertFalse(results["+333"].allowed)
+        self.assertEqual(results["+333"].status, "Unknown")
+
 
 # ===========================================================================
 # Webhook consent keyword processing
@@ -340,3 +378,109 @@ class TestConsentKeywordHandling(FrappeTestCase):
         )
         mock_opt_out.assert_not_called()
         mock_opt_in.assert_not_called()
+
+
+# ===========================================================================
+# Opt-out keyword matching
+# ===========================================================================
+
+def _keyword(keyword, match_type="Exact", case_sensitive=0, **kwargs):
+    return dict(
+        keyword=keyword,
+        match_type=match_type,
+        case_sensitive=case_sensitive,
+        action="Full Opt-Out",
+        **kwargs,
+    )
+
+
+class TestOptOutKeywordMatcher(FrappeTestCase):
+    """check_opt_out_keyword matches like the per-keyword comparisons it
+    replaced."""
+
+    def _check(self, text, keywords):
+        with patch(
+            f"{_CONSENT_MOD}.get_compliance_settings",
+            return_value=SimpleNamespace(enable_opt_out_detection=1),
+        ), patch(
+            f"{_CONSENT_MOD}.get_opt_out_keywords", return_value=keywords
+        ):
+            return check_opt_out_keyword(text, "TestAccount")
+
+    def test_exact_matches_whole_message_only(self):
+        keywords = [_keyword("STOP")]
+        self.assertEqual(self._check("  stop  ", keywords), keywords[0])
+        self.assertIsNone(self._check("stop please", keywords))
+        self.assertIsNone(self._check("please stop", keywords))
+
+    def test_starts_with_matches_prefix_only(self):
+        keywords = [_keyword("stop", match_type="Starts With")]
+        self.assertEqual(self._check("STOP please", keywords), keywords[0])
+        self.assertIsNone(self._check("please stop", keywords))
+
+    def test_contains_matches_anywhere(self):
+        keywords = [_keyword("unsubscribe", match_type="Contains")]
+        self.assertEqual(
+            self._check("Please UNSUBSCRIBE me", keywords), keywords[0])
+        self.assertEqual(
+            self._check("first line\nunsubscribe", keywords), keywords[0])
+        self.assertIsNone(self._check("subscribe me", keywords))
+
+    def test_case_sensitive_keyword(self):
+        keywords = [_keyword("STOP", case_sensitive=1)]
+        self.assertEqual(self._check("STOP", keywords), keywords[0])
+        self.assertIsNone(self._check("stop", keywords))
+        self.assertIsNone(self._check("Stop", keywords))
+
+    def test_case_insensitive_keyword(self):
+        keywords = [_keyword("Stop", case_sensitive=0)]
+        for text in ("STOP", "stop", "sToP"):
+            self.assertEqual(self._check(text, keywords), keywords[0])
+
+    def test_case_sensitivity_is_per_keyword(self):
+        keywords = [
+            _keyword("STOP", case_sensitive=1),
+            _keyword("cancel", case_sensitive=0),
+        ]
+        self.assertIsNone(self._check("stop", keywords))
+        self.assertEqual(self._check("CANCEL", keywords), keywords[1])
+
+    def test_regex_metacharacters_match_literally(self):
+        keywords = [
+            _keyword("stop.", match_type="Starts With"),
+            _keyword("(opt-out)*", match_type="Contains"),
+            _keyword("a+b?"),
+        ]
+        self.assertIsNone(self._check("stopX", keywords))
+        self.assertEqual(self._check("stop. now", keywords), keywords[0])
+        self.assertIsNone(self._check("opt-out", keywords))
+        self.assertEqual(self._check("say (opt-out)*", keywords), keywords[1])
+        self.assertIsNone(self._check("aab", keywords))
+        self.assertEqual(self._check("a+b?", keywords), keywords[2])
+
+    def test_first_listed_keyword_wins(self):
+        keywords = [
+            _keyword("stop", match_type="Contains", action="Category Opt-Out"),
+            _keyword("stop all"),
+            _keyword("stop", match_type="Starts With"),
+        ]
+        self.assertIs(self._check("stop all", keywords), keywords[0])
+
+        keywords = [keywords[1], keywords[2], keywords[0]]
+        self.assertIs(self._check("stop all", keywords), keywords[0])
+        self.assertIs(self._check("stop now", keywords), keywords[1])
+
+    def test_unknown_match_type_never_matches(self):
+        keywords = [_keyword("stop", match_type="Regex")]
+        self.assertIsNone(self._check("stop", keywords))
+
+    def test_matcher_is_reused_for_same_keywords(self):
+        keywords = [_keyword("stop"), _keyword("end", match_type="Contains")]
+        self.assertIs(
+            _get_opt_out_matcher(keywords),
+            _get_opt_out_matcher([dict(row) for row in keywords]),
+        )
+        self.assertIsNot(
+            _get_opt_out_matcher(keywords),
+            _get_opt_out_matcher([_keyword("stop", case_sensitive=1)]),
+        )
@@ -3,9 +3,16 @@ from unittest.mock import patch
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from requests import Response
+from requests import Request, Response
+from requests.cookies import MockRequest, create_cookie
 
-from frappe_whatsapp.utils.meta import get_paginated_data, request_meta_json
+from frappe_whatsapp.utils.meta import (
+    get_paginated_data,
+    get_paginated_data_many,
+    get_session,
+    request_meta_json,
+    request_meta_json_many,
+)
 
 
 def _response(status: int, payload: dict) -> Response:
@@ -17,7 +24,7 @@ def _response(status: int, payload: dict) -> Response:
 
 
 class TestMetaRequests(FrappeTestCase):
-    @patch("frappe_whatsapp.utils.meta.requests.request")
+    @patch("frappe_whatsapp.utils.meta._SESSION.request")
     def test_oauth_error_includes_account_code_and_subcode(self, mock_request):
         mock_request.return_value = _response(
             401,
@@ -46,7 +53,7 @@ class TestMetaRequests(FrappeTestCase):
         self.assertIn("subcode 463", message)
         self.assertNotIn("secret", message)
 
-    @patch("frappe_whatsapp.utils.meta.requests.request")
+    @patch("frappe_whatsapp.utils.meta._SESSION.request")
     def test_post_error_preserves_safe_meta_details(self, mock_request):
         mock_request.return_value = _response(
             400,
@@ -82,11 +89,11 @@ class TestMetaRequests(FrappeTestCase):
         self.assertIn("subcode 2494073", message)
         self.assertNotIn("top-secret-token", message)
         self.assertEqual(
-            mock_request.call_args.kwargs["json"],
+            json.loads(mock_request.call_args.kwargs["data"]),
             {"messaging_product": "whatsapp"},
         )
 
-    @patch("frappe_whatsapp.utils.meta.requests.request")
+    @patch("frappe_whatsapp.utils.meta._SESSION.request")
     def test_paginated_collection_follows_all_pages(self, mock_request):
         mock_request.side_effect = [
             _response(
@@ -112,3 +119,68 @@ class TestMetaRequests(FrappeTestCase):
         self.assertEqual([item["id"] for item in data], ["one", "two"])
         self.assertEqual(mock_request.call_count, 2)
         self.assertIsNone(mock_request.call_args_list[1].kwargs["params"])
+
+    @patch("frappe_whatsapp.utils.meta._SESSION.request")
+    def test_many_requests_report_errors_per_body_in_order(self, mock_request):
+        def respond(method, url, **kwargs):
+            to = json.loads(kwargs["data"])["to"]
+            if to == "bad":
+                return _response(400, {"error": {"message": "Invalid number"}})
+            return _response(200, {"messages": [{"id": f"wamid.{to}"}]})
+
+        mock_request.side_effect = respond
+
+        results = request_meta_json_many(
+            "POST",
+            "https://graph.facebook.com/v24.0/phone/messages",
+            account_name="bulk-account",
+            operation="message send",
+            headers={"authorization": "Bearer secret"},
+            json_bodies=[{"to": "one"}, {"to": "bad"}, {"to": "two"}],
+        )
+
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(results[0], ({"messages": [{"id": "wamid.one"}]}, None))
+        self.assertEqual(results[1][0], {})
+        self.assertIn("Invalid number", results[1][1])
+        self.assertEqual(results[2], ({"messages": [{"id": "wamid.two"}]}, None))
+
+    @patch("frappe_whatsapp.utils.meta._SESSION.request")
+    def test_many_collections_are_returned_in_input_order(self, mock_request):
+        def respond(method, url, **kwargs):
+            if url.endswith("/first/items"):
+                return _response(200, {
+                    "data": [{"id": "a1"}],
+                    "paging": {"next": f"{url}?after=a1"},
+                })
+            if "after=a1" in url:
+                return _response(200, {"data": [{"id": "a2"}]})
+            return _response(200, {"data": [{"id": "b1"}]})
+
+        mock_request.side_effect = respond
+
+        collections = get_paginated_data_many(
+            [
+                ("https://graph.facebook.com/v24.0/first/items", "first",
+                 {"Authorization": "Bearer one"}),
+                ("https://graph.facebook.com/v24.0/second/items", "second",
+                 {"Authorization": "Bearer two"}),
+            ],
+            operation="item sync",
+        )
+
+        self.assertEqual(
+            [[item["id"] for item in items] for items in collections],
+            [["a1", "a2"], ["b1"]],
+        )
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_shared_session_does_not_store_cookies(self):
+        """Cookies from one response must not be replayed to other sites,
+        accounts or client apps sharing the worker's session."""
+        request = Request("GET", "https://graph.facebook.com/v19.0/me")
+        cookie = create_cookie("sid", "abc", domain="graph.facebook.com")
+
+        policy = get_session().cookies.get_policy()
+
+        self.assertFalse(policy.set_ok(cookie, MockRequest(request)))
@@ -5,7 +5,9 @@ import frappe
 from frappe.tests.utils import FrappeTestCase
 
 from frappe_whatsapp.utils.routing import (
+    _enqueue_pending_forwards,
     forward_incoming_to_app,
+    forward_incoming_to_app_async,
     resolve_incoming_routed_app,
     serialize_incoming_message_for_forwarding,
 )
@@ -70,7 +72,7 @@ class TestRouting(FrappeTestCase):
         self.assertEqual(payload["profile_name"], "Jane Sender")
 
     @patch("frappe_whatsapp.utils.routing._mark_incoming_message_forwarded")
-    @patch("frappe_whatsapp.utils.routing.make_post_request")
+    @patch("frappe_whatsapp.utils.routing._post_to_client_app")
     @patch(
         "frappe_whatsapp.utils.routing._incoming_message_already_forwarded",
         return_value=False,
@@ -80,7 +82,7 @@ class TestRouting(FrappeTestCase):
         self,
         mock_get_doc,
         _mock_already_forwarded,
-        mock_make_post_request,
+        mock_post_to_client_app,
         _mock_mark_forwarded,
     ):
         mock_get_doc.return_value = frappe._dict(
@@ -109,12 +111,34 @@ class TestRouting(FrappeTestCase):
 
         forward_incoming_to_app(incoming_message_doc=incoming_message_doc)
 
-        self.assertTrue(mock_make_post_request.called)
-        payload = json.loads(mock_make_post_request.call_args.kwargs["data"])
+        self.assertTrue(mock_post_to_client_app.called)
+        payload = json.loads(mock_post_to_client_app.call_args.kwargs["data"])
         self.assertEqual(payload["event"], "whatsapp.incoming")
         self.assertEqual(payload["message"]["profile_name"], "Jane Sender")
         self.assertEqual(payload["message"]["whatsapp_account"], "Test Account")
 
+    @patch("frappe_whatsapp.utils.routing.frappe.enqueue")
+    def test_forward_async_enqueues_one_job_per_transaction(
+        self, mock_enqueue
+    ):
+        frappe.local.whatsapp_pending_forwards = None
+        with patch("frappe_whatsapp.utils.routing.frappe.db") as mock_db:
+            forward_incoming_to_app_async(incoming_message_name="MSG-0001")
+            forward_incoming_to_app_async(incoming_message_name="MSG-0002")
+
+        mock_db.after_commit.add.assert_called_once_with(
+            _enqueue_pending_forwards)
+        mock_enqueue.assert_not_called()
+
+        _enqueue_pending_forwards()
+
+        mock_enqueue.assert_called_once_with(
+            "frappe_whatsapp.utils.routing.forward_incoming_to_app_by_names",
+            queue="short",
+            incoming_message_names=["MSG-0001", "MSG-0002"],
+        )
+        self.assertIsNone(frappe.local.whatsapp_pending_forwards)
+
     def test_resolve_incoming_routed_app_seeds_default_account_route(self):
         app = self._create_client_app()
         account = self._create_account(whatsapp_client_app=app.name)
@@ -134,7 +158,7 @@ class TestRouting(FrappeTestCase):
         self.assertFalse(route.last_outgoing_at)
 
     @patch("frappe_whatsapp.utils.routing._mark_incoming_message_forwarded")
-    @patch("frappe_whatsapp.utils.routing.make_post_request")
+    @patch("frappe_whatsapp.utils.routing._post_to_client_app")
     @patch(
         "frappe_whatsapp.utils.routing._incoming_message_already_forwarded",
         return_value=False,
@@ -142,7 +166,7 @@ class TestRouting(FrappeTestCase):
     def test_forward_incoming_to_app_uses_account_default_app_when_unrouted(
         self,
         _mock_already_forwarded,
-        mock_make_post_request,
+        mock_post_to_client_app,
         _mock_mark_forwarded,
     ):
         app = self._create_client_app()
@@ -166,7 +190,7 @@ class TestRouting(FrappeTestCase):
 
         forward_incoming_to_app(incoming_message_doc=incoming_message_doc)
 
-        self.assertTrue(mock_make_post_request.called)
+        self.assertTrue(mock_post_to_client_app.called)
         route = frappe.get_doc(
             "WhatsApp Conversation Route",
             f"15551234567-{account.name}",
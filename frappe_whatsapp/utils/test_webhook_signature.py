@@ -221,14 +221,22 @@ class TestHandlePostBodyGating(FrappeTestCase):
             "frappe_whatsapp.utils.webhook.process_webhook_payload",
         )
 
-    def test_valid_signature_passes_parsed_json_to_enqueue(self):
-        """The worker must receive the parsed payload dict."""
+    def test_valid_signature_passes_raw_body_to_enqueue(self):
+        """The worker must receive the body bytes exactly as signed."""
         payload = b'{"object":"whatsapp_business_account","entry":[]}'
         _, mock_enqueue = self._call(sig_valid=True, raw_body=payload)
         call_kwargs = mock_enqueue.call_args.kwargs
-        self.assertIsInstance(call_kwargs["data"], dict)
-        self.assertEqual(call_kwargs["data"]["object"],
-                         "whatsapp_business_account")
+        self.assertEqual(call_kwargs["data"], payload)
+        self.assertTrue(call_kwargs["deduplicate"])
+
+    def test_identical_bodies_share_a_job_id(self):
+        """A Meta retry of the same body must map to the same job."""
+        _, first = self._call(sig_valid=True)
+        _, second = self._call(sig_valid=True)
+        self.assertEqual(
+            first.call_args.kwargs["job_id"],
+            second.call_args.kwargs["job_id"],
+        )
 
     # --- end-to-end with real HMAC (no mocking of _verify_webhook_signature) ---
 
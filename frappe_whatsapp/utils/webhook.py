@@ -2,16 +2,22 @@
 import frappe
 import hashlib
 import hmac
-import json
-import requests
-from frappe.utils import cint
+import orjson
+import os
+import secrets
+from functools import lru_cache
+from frappe.utils import cint, now
 from frappe.utils.password import get_decrypted_password as \
     _get_decrypted_password
 from werkzeug.wrappers import Response
-from typing import cast, Any
+from typing import Callable, cast, Any
 
-from frappe_whatsapp.utils import get_whatsapp_account
+from frappe_whatsapp.utils import get_notifications_map, get_whatsapp_account
+from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import (  # noqa: E501
+    get_account_cache_generation,
+)
 from frappe_whatsapp.utils.blocking import is_contact_blocked
+from frappe_whatsapp.utils.meta import get_session
 from frappe_whatsapp.utils.routing import resolve_incoming_routed_app, \
     forward_incoming_to_app_async
 from frappe_whatsapp.utils.consent import (
@@ -48,6 +54,13 @@ DEFAULT_MEDIA_EXTENSION_BY_TYPE = {
     "video": "mp4",
 }
 
+# Store every webhook payload as a WhatsApp Notification Log row; sites can
+# turn this off with ``whatsapp_log_webhook_payloads: 0`` in site config.
+LOG_WEBHOOK_PAYLOADS = 1
+
+# Media is streamed to disk in chunks of this size rather than read whole.
+MEDIA_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def normalize_media_mime_type(mime_type: str | None) -> str:
     """Return a lower-case MIME value without parameters."""
@@ -83,21 +96,40 @@ def webhook():
 def get():
     """Get."""
     hub_challenge = frappe.form_dict.get("hub.challenge")
-    verify_token = frappe.form_dict.get("hub.verify_token")
-    webhook_verify_token = frappe.db.get_value(
-        'WhatsApp Account',
-        {"webhook_verify_token": verify_token},
-        'webhook_verify_token'
-    )
-    if not webhook_verify_token:
+    verify_token = str(frappe.form_dict.get("hub.verify_token") or "")
+    if not _is_known_verify_token(verify_token):
         frappe.throw("No matching WhatsApp account")
 
-    if frappe.form_dict.get("hub.verify_token") != webhook_verify_token:
-        frappe.throw("Verify token does not match")
-
     return Response(hub_challenge, status=200)
 
 
+def _is_known_verify_token(verify_token: str) -> bool:
+    """Compare against every configured token with ``compare_digest`` so the
+    response time does not reveal how close a guess was."""
+    if not verify_token:
+        return False
+    provided = verify_token.encode()
+    matched = False
+    for token in _get_verify_tokens(
+            frappe.local.site, get_account_cache_generation()):
+        matched |= hmac.compare_digest(token.encode(), provided)
+    return matched
+
+
+@lru_cache(maxsize=16)
+def _get_verify_tokens(site: str, generation: str) -> tuple[str, ...]:
+    """Verify tokens of all accounts, cached per worker process until any
+    WhatsApp Account changes; ``site`` and ``generation`` only key the
+    cache."""
+    return tuple(
+        str(token) for token in frappe.get_all(
+            "WhatsApp Account",
+            filters={"webhook_verify_token": ["is", "set"]},
+            pluck="webhook_verify_token",
+        )
+    )
+
+
 def post():
     """POST: read raw body + signature header, then delegate to handler.
 
@@ -113,38 +145,25 @@ def _handle_post_body(raw_body: bytes, sig_header: str) -> Response:
     """Validate signature and enqueue processing for a single webhook POST.
 
     Validates ``X-Hub-Signature-256`` against the ``app_secret`` stored on
-    every active WhatsApp Account.  Rejects with HTTP 403 before logging or
-    enqueueing anything if validation fails.
+    every active WhatsApp Account.  Rejects with HTTP 403 before enqueueing
+    anything if validation fails.  Nothing is written to the database here;
+    the payload log is stored by the background job.
     """
     if not _verify_webhook_signature(raw_body, sig_header):
         return Response("Forbidden", status=403)
 
-    # Signature is valid — parse the JSON body (Meta always sends JSON).
-    data: dict = {}
-    try:
-        if raw_body:
-            data = json.loads(raw_body)
-    except Exception:
-        pass
-
-    # Store raw payload for troubleshooting (non-fatal DB write).
-    try:
-        frappe.get_doc({
-            "doctype": "WhatsApp Notification Log",
-            "template": "Webhook",
-            "meta_data": json.dumps(data)
-        }).insert(ignore_permissions=True)
-    except Exception:
-        frappe.log_error(
-            frappe.get_traceback(),
-            "WhatsApp webhook log insert failed")
-
+    # Signature is valid — hand the body to the worker as received. The
+    # bytes are smaller in Redis than a pickled dict, and JSON parsing
+    # happens off the web request. Meta retries resend the same body, so
+    # the body hash collapses a retry of a still-queued job.
+    body_hash = hashlib.sha256(raw_body).hexdigest()[:20]
     frappe.enqueue(
         "frappe_whatsapp.utils.webhook.process_webhook_payload",
         queue="short",
-        data=data,
+        data=raw_body,
         enqueue_after_commit=True,
-        job_id=f"whatsapp_webhook_process::{frappe.generate_hash(length=10)}"
+        job_id=f"whatsapp_webhook_process::{body_hash}",
+        deduplicate=True,
     )
 
     return Response("ok", status=200)
@@ -225,14 +244,27 @@ def _verify_webhook_signature(raw_body: bytes, sig_header: str) -> bool:
     return False
 
 
-def process_webhook_payload(data: dict):
-    """Runs in background worker. Contains the old post() logic."""
-    # Defensive: data can be string sometimes
-    if isinstance(data, str):
+def process_webhook_payload(data: bytes | str | dict):
+    """Runs in background worker. Contains the old post() logic.
+
+    ``data`` is the raw request body; jobs queued before the body was
+    passed through unparsed may still carry a dict.
+
+    Incoming messages share the job's transaction, which the job runner
+    commits once when it finishes; status updates are isolated per status
+    and committed together (see ``update_message_status``).
+    """
+    if isinstance(data, (bytes, str)):
         try:
-            data = json.loads(data)
-        except Exception:
+            data = orjson.loads(data) if data else {}
+        except orjson.JSONDecodeError:
             data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    if cint(frappe.conf.get(
+            "whatsapp_log_webhook_payloads", LOG_WEBHOOK_PAYLOADS)):
+        _log_webhook_payload(data)
 
     # Normalize entries to a list, supporting both payload shapes Meta sends:
     #   list-shaped:  data["entry"] = [{"id": "...", "changes": [...]}, ...]
@@ -289,29 +321,13 @@ def process_webhook_payload(data: dict):
             )
         return
 
-    messages = []
-    phone_id = None
+    # Pings and malformed events carry no change; stop before any lookup.
+    if not changes:
+        return
 
-    try:
-        messages = entries[0]["changes"][0]["value"].get("messages", []) or []
-        phone_id = (
-            entries[0]["changes"][0]
-            .get("value", {})
-            .get("metadata", {})
-            .get("phone_number_id")
-        )
-    except Exception:
-        messages = []
-
-    sender_profile_name = next(
-        (
-            contact.get("profile", {}).get("name")
-            for entry in entries
-            for change in (entry.get("changes") or [])
-            for contact in (change.get("value", {}).get("contacts") or [])
-        ),
-        None,
-    )
+    # Every remaining lookup reads the same change value, so resolve it once.
+    value = changes.get("value") or {}
+    phone_id = (value.get("metadata") or {}).get("phone_number_id")
 
     if phone_id:
         whatsapp_account = get_whatsapp_account(phone_id)
@@ -335,17 +351,45 @@ def process_webhook_payload(data: dict):
     from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa
     whatsapp_account = cast(WhatsAppAccount, whatsapp_account)
 
-    if messages:
-        for message in messages:
-            _process_incoming_message(
-                message=message,
-                whatsapp_account=whatsapp_account,
-                sender_profile_name=sender_profile_name
-            )
-    else:
+    # Only read the rest of the payload once it is known to be processed.
+    messages = value.get("messages") or []
+    if not messages:
         # Message delivery status updates (field == "messages")
-        if changes:
-            update_status(changes)
+        update_status(changes)
+        return
+
+    sender_profile_name = next(
+        (
+            (contact.get("profile") or {}).get("name")
+            for contact in (value.get("contacts") or [])
+        ),
+        None,
+    )
+    for message in messages:
+        _process_incoming_message(
+            message=message,
+            whatsapp_account=whatsapp_account,
+            sender_profile_name=sender_profile_name
+        )
+
+
+def _log_webhook_payload(data: dict) -> None:
+    """Store the raw payload for troubleshooting (non-fatal DB write).
+
+    Committed straight away so the row survives if processing the payload
+    later fails and the job rolls back — those are the payloads operators
+    most need to inspect.
+    """
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_notification.whatsapp_notification import write_notification_logs  # noqa: E501
+    try:
+        write_notification_logs(
+            "Webhook", [orjson.dumps(data).decode()], now())
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(
+            frappe.get_traceback(),
+            "WhatsApp webhook log insert failed")
 
 
 def _enqueue_language_detection(
@@ -370,6 +414,43 @@ def _enqueue_language_detection(
     )
 
 
+_MEDIA_MESSAGE_TYPES = frozenset(
+    {"image", "audio", "video", "document", "sticker"})
+
+# Incoming message type -> text carried in its payload (body or caption).
+# Types not listed here fall back to ``_extract_generic_body``.
+_INCOMING_BODY_EXTRACTORS: dict[str, Callable[[dict], str]] = {
+    "text": lambda payload: payload.get("body", ""),
+    **{
+        media_type: lambda payload: payload.get("caption", "")
+        for media_type in _MEDIA_MESSAGE_TYPES
+    },
+}
+
+
+def _extract_generic_body(payload: Any) -> str:
+    if isinstance(payload, dict):
+        return str(payload.get("text") or payload.get("body") or "")
+    if isinstance(payload, str):
+        return payload
+    return ""
+
+
+def _insert_incoming_message(fields: dict[str, Any]) -> Any:
+    """Insert an incoming WhatsApp Message and return the document.
+
+    Messages go through the ORM so the app's own and other apps'
+    ``doc_events`` (status notifications, server-script notifications,
+    profile creation) still fire.  Link validation is skipped: the account
+    and routed app were just resolved from the database.
+    """
+    return frappe.get_doc({
+        "doctype": "WhatsApp Message",
+        "type": "Incoming",
+        **fields,
+    }).insert(ignore_permissions=True, ignore_links=True)
+
+
 def _process_incoming_message(
         *, message: dict, whatsapp_account, sender_profile_name: str | None):
 
@@ -407,43 +488,7 @@ def _process_incoming_message(
     if msg_id and frappe.db.exists("WhatsApp Message", {"message_id": msg_id}):
         return
 
-    if message_type == "text":
-        body_text = (message.get("text") or {}).get("body", "")
-
-        doc = frappe.get_doc({
-            "doctype": "WhatsApp Message",
-            "type": "Incoming",
-            "from": message.get("from"),
-            "message": body_text,
-            "message_id": msg_id,
-            "reply_to_message_id": reply_to_message_id,
-            "is_reply": is_reply,
-            "content_type": "text",
-            "profile_name": sender_profile_name,
-            "whatsapp_account": whatsapp_account.name,
-            "routed_app": routed_app,
-        }).insert(ignore_permissions=True)
-
-        # Check for opt-out / opt-in keywords
-        _handle_consent_keywords(
-            body_text=body_text,
-            contact_number=contact_number,
-            whatsapp_account_name=str(whatsapp_account.name),
-            message_doc_name=str(doc.name),
-            profile_name=sender_profile_name,
-        )
-
-        _enqueue_language_detection(
-            contact_number=contact_number,
-            whatsapp_account=str(whatsapp_account.name),
-            text=body_text,
-            message_doc_name=str(doc.name),
-            profile_name=sender_profile_name,
-        )
-
-        forward_incoming_to_app_async(incoming_message_name=str(doc.name))
-
-    elif message_type == "interactive":
+    if message_type == "interactive":
         _handle_interactive(
             message=message,
             whatsapp_account=whatsapp_account,
@@ -452,107 +497,66 @@ def _process_incoming_message(
             reply_to_message_id=reply_to_message_id,
             is_reply=is_reply
         )
+        return
 
-    elif message_type in ["image", "audio", "video", "document", "sticker"]:
-        # Insert a stub message quickly, then download media async
-        media_payload = message.get(message_type) or {}
-        caption_text = media_payload.get("caption", "")
-        msg_doc = frappe.get_doc({
-            "doctype": "WhatsApp Message",
-            "type": "Incoming",
-            "from": message.get("from"),
-            "message_id": msg_id,
-            "reply_to_message_id": reply_to_message_id,
-            "is_reply": is_reply,
-            "message": caption_text,
-            "content_type": message_type,
-            "profile_name": sender_profile_name,
-            "whatsapp_account": whatsapp_account.name,
-            "routed_app": routed_app,
-        })
-        if (
-            message_type == "audio"
-            and msg_doc.meta.has_field("is_voice_note")
-        ):
-            msg_doc.set(
-                "is_voice_note",
-                1 if media_payload.get("voice") else 0,
-            )
-
-        msg_doc.insert(ignore_permissions=True)
-
-        # Check for opt-out / opt-in keywords in caption (if any)
-        _handle_consent_keywords(
-            body_text=caption_text or "",
-            contact_number=contact_number,
-            whatsapp_account_name=str(whatsapp_account.name),
-            message_doc_name=str(msg_doc.name),
-            profile_name=sender_profile_name,
-        )
-
-        if caption_text:
-            _enqueue_language_detection(
-                contact_number=contact_number,
-                whatsapp_account=str(whatsapp_account.name),
-                text=caption_text,
-                message_doc_name=str(msg_doc.name),
-                profile_name=sender_profile_name,
-            )
-
-        media_id = media_payload.get("id")
-        if media_id:
-            frappe.enqueue(
-                "frappe_whatsapp.utils.webhook.download_and_attach_media",
-                queue="long",
-                whatsapp_account_name=whatsapp_account.name,
-                message_docname=msg_doc.name,
-                media_id=media_id,
-                message_type=message_type,
-                enqueue_after_commit=True
-            )
+    payload = message.get(message_type) if message_type else None
+    extract_body = _INCOMING_BODY_EXTRACTORS.get(message_type or "")
+    body_text = (
+        extract_body(payload or {}) if extract_body
+        else _extract_generic_body(payload)
+    )
+    is_media = message_type in _MEDIA_MESSAGE_TYPES
+
+    fields = {
+        "from": message.get("from"),
+        "message_id": msg_id,
+        "reply_to_message_id": reply_to_message_id,
+        "is_reply": is_reply,
+        "message": body_text,
+        "content_type": message_type or "unknown",
+        "profile_name": sender_profile_name,
+        "whatsapp_account": whatsapp_account.name,
+        "routed_app": routed_app,
+    }
+    if message_type == "audio":
+        fields["is_voice_note"] = 1 if (payload or {}).get("voice") else 0
+    doc = _insert_incoming_message(fields)
 
-    else:
-        raw_body = message.get(message_type)
-        body_text = ""
-        if isinstance(raw_body, dict):
-            body_text = str(raw_body.get("text") or raw_body.get("body") or "")
-        elif isinstance(raw_body, str):
-            body_text = raw_body
-
-        doc = frappe.get_doc({
-            "doctype": "WhatsApp Message",
-            "type": "Incoming",
-            "from": message.get("from"),
-            "message_id": msg_id,
-            "reply_to_message_id": reply_to_message_id,
-            "is_reply": is_reply,
-            "message": body_text,
-            "content_type": message_type or "unknown",
-            "profile_name": sender_profile_name,
-            "whatsapp_account": whatsapp_account.name,
-            "routed_app": routed_app,
-        }).insert(ignore_permissions=True)
+    # Check for opt-out / opt-in keywords in the body or caption (if any)
+    _handle_consent_keywords(
+        body_text=body_text or "",
+        contact_number=contact_number,
+        whatsapp_account_name=str(whatsapp_account.name),
+        message_doc_name=str(doc.name),
+        profile_name=sender_profile_name,
+    )
 
-        # Check for opt-out / opt-in keywords if message contains text-like
-        # body
-        _handle_consent_keywords(
-            body_text=body_text or "",
+    if body_text:
+        _enqueue_language_detection(
             contact_number=contact_number,
-            whatsapp_account_name=str(whatsapp_account.name),
+            whatsapp_account=str(whatsapp_account.name),
+            text=body_text,
             message_doc_name=str(doc.name),
             profile_name=sender_profile_name,
         )
 
-        if body_text:
-            _enqueue_language_detection(
-                contact_number=contact_number,
-                whatsapp_account=str(whatsapp_account.name),
-                text=body_text,
-                message_doc_name=str(doc.name),
-                profile_name=sender_profile_name,
-            )
-
+    if not is_media:
         forward_incoming_to_app_async(incoming_message_name=str(doc.name))
+        return
+
+    # Media was inserted as a stub; the download job attaches the file and
+    # forwards the message once it is there.
+    media_id = (payload or {}).get("id")
+    if media_id:
+        frappe.enqueue(
+            "frappe_whatsapp.utils.webhook.download_and_attach_media",
+            queue="long",
+            whatsapp_account_name=whatsapp_account.name,
+            message_docname=doc.name,
+            media_id=media_id,
+            message_type=message_type,
+            enqueue_after_commit=True
+        )
 
 
 def _handle_consent_keywords(
@@ -615,9 +619,7 @@ def _handle_interactive(
             if response == "accept"
             else "Call permission rejected"
         )
-        doc = frappe.get_doc({
-            "doctype": "WhatsApp Message",
-            "type": "Incoming",
+        doc = _insert_incoming_message({
             "from": message.get("from"),
             "message": summary_message,
             "message_id": message.get("id"),
@@ -627,7 +629,7 @@ def _handle_interactive(
             "profile_name": sender_profile_name,
             "whatsapp_account": whatsapp_account.name,
             "routed_app": routed_app,
-        }).insert(ignore_permissions=True)
+        })
 
         from frappe_whatsapp.utils.calling import handle_call_permission_reply
         handle_call_permission_reply(
@@ -649,9 +651,7 @@ def _handle_interactive(
         payload_text = (
             str(payload.get("title") or payload.get("id") or "")
         )
-        doc = frappe.get_doc({
-            "doctype": "WhatsApp Message",
-            "type": "Incoming",
+        doc = _insert_incoming_message({
             "from": message.get("from"),
             "message": payload.get("id"),
             "message_id": message.get("id"),
@@ -661,7 +661,7 @@ def _handle_interactive(
             "profile_name": sender_profile_name,
             "whatsapp_account": whatsapp_account.name,
             "routed_app": routed_app,
-        }).insert(ignore_permissions=True)
+        })
 
         # Check for opt-out / opt-in keywords based on reply text/id
         _handle_consent_keywords(
@@ -690,39 +690,39 @@ def _handle_interactive(
         nfm_reply = interactive.get("nfm_reply") or {}
         response_json_str = nfm_reply.get("response_json", "{}")
 
+        # Parse only to build the summary; the column stores Meta's string
+        # as received instead of re-serializing the parsed copy.
         try:
-            flow_response = json.loads(response_json_str)
-        except json.JSONDecodeError:
-            flow_response = {}
+            flow_response = orjson.loads(response_json_str)
+        except orjson.JSONDecodeError:
+            flow_response = None
+        if not isinstance(flow_response, dict):
+            flow_response, response_json_str = {}, "{}"
 
         summary_parts = [f"{k}: {v}" for k, v in flow_response.items() if v]
         summary_message = ", ".join(
             summary_parts) if summary_parts else "Flow completed"
 
-        doc = frappe.get_doc({
-            "doctype": "WhatsApp Message",
-            "type": "Incoming",
+        doc = _insert_incoming_message({
             "from": message.get("from"),
             "message": summary_message,
             "message_id": message.get("id"),
             "reply_to_message_id": reply_to_message_id,
             "is_reply": is_reply,
             "content_type": "flow",
-            "flow_response": json.dumps(flow_response),
+            "flow_response": response_json_str,
             "profile_name": sender_profile_name,
             "whatsapp_account": whatsapp_account.name,
             "routed_app": routed_app,
-        }).insert(ignore_permissions=True)
+        })
 
-        # publish realtime async too (optional)
-        frappe.enqueue(
-            "frappe_whatsapp.utils.webhook.publish_flow_realtime",
-            queue="short",
+        # Already in a worker, and publish_realtime only pushes to Redis
+        # (after commit), so publish here rather than via another job.
+        publish_flow_realtime(
             phone=message.get("from"),
             message_id=message.get("id"),
             flow_response=flow_response,
             whatsapp_account=whatsapp_account.name,
-            enqueue_after_commit=True
         )
 
         forward_incoming_to_app_async(incoming_message_name=str(doc.name))
@@ -808,13 +808,18 @@ def update_status(data):
 
 def update_template_status(data):
     """Update template status."""
-    if not data.get("event") or not data.get("message_template_id"):
+    event = data.get("event")
+    template_id = data.get("message_template_id")
+    if not event or not template_id:
         return
+    # Bind only the two values used rather than the whole Meta payload, and
+    # bump ``modified`` so caches keyed on it (e.g. marketing compliance)
+    # see the change.
     frappe.db.sql(
         """UPDATE `tabWhatsApp Templates`
-        SET status = %(event)s
-        WHERE id = %(message_template_id)s""",
-        data
+        SET status = %s, modified = %s, modified_by = %s
+        WHERE id = %s""",
+        (str(event), now(), frappe.session.user, str(template_id))
     )
 
 
@@ -867,48 +872,168 @@ def _extract_status_error_fields(
     return error_fields
 
 
+# Core records that act on saves of a doctype, as
+# (doctype, field naming the target doctype, extra filters).
+_MESSAGE_SAVE_OBSERVER_RECORDS = (
+    ("Server Script", "reference_doctype",
+     {"script_type": "DocType Event", "disabled": 0}),
+    ("Webhook", "webhook_doctype", {"enabled": 1}),
+    ("Notification", "document_type", {"enabled": 1}),
+    ("Assignment Rule", "document_type", {"disabled": 0}),
+    ("Milestone Tracker", "document_type", {"disabled": 0}),
+    ("Energy Point Rule", "reference_doctype", {"enabled": 1}),
+    ("Workflow", "document_type", {"is_active": 1}),
+)
+MESSAGE_SAVE_OBSERVERS_CACHE_KEY = "frappe_whatsapp:message_save_observers"
+
+# Apps whose generic ``"*"`` handlers only act through the records above or
+# through this app's own checks, so they need not force the document path.
+_MESSAGE_SAVE_HOOK_APPS_COVERED = ("frappe", "frappe_whatsapp")
+
+
+def _message_update_is_observed(message: dict[str, Any]) -> bool:
+    """Whether a status change must go through ``doc.save``.
+
+    Outgoing messages sent on behalf of a client app feed the status
+    notifier; WhatsApp Notifications, Frappe Server Scripts, Webhooks,
+    Notifications and similar records, version tracking, and other apps'
+    doc_events (including ``"*"``) may all act on saves of WhatsApp
+    Message. Any of those needs the document lifecycle.
+    """
+    if message.get("type") == "Outgoing" and message.get("source_app"):
+        return True
+    if get_notifications_map().get("WhatsApp Message"):
+        return True
+    if frappe.get_meta("WhatsApp Message").track_changes:
+        return True
+    if _has_message_save_records():
+        return True
+    return _has_foreign_message_save_hooks()
+
+
+def _has_foreign_message_save_hooks() -> bool:
+    for app in frappe.get_installed_apps():
+        if app in _MESSAGE_SAVE_HOOK_APPS_COVERED:
+            continue
+        doc_events = frappe.get_hooks("doc_events", app_name=app) or {}
+        for doctype in ("WhatsApp Message", "*"):
+            events = doc_events.get(doctype) or {}
+            if any(
+                events.get(event)
+                for event in (
+                    "before_validate", "validate", "before_save",
+                    "on_update", "on_change")
+            ):
+                return True
+    return False
+
+
+def _has_message_save_records() -> bool:
+    """Cached until one of the observer record doctypes changes (see
+    ``clear_message_save_observers_cache``)."""
+    cached = frappe.cache().get_value(MESSAGE_SAVE_OBSERVERS_CACHE_KEY)
+    if cached is not None:
+        return bool(cached)
+
+    observed = any(
+        frappe.db.exists(doctype, {field: "WhatsApp Message", **filters})
+        for doctype, field, filters in _MESSAGE_SAVE_OBSERVER_RECORDS
+    )
+    frappe.cache().set_value(MESSAGE_SAVE_OBSERVERS_CACHE_KEY, int(observed))
+    return observed
+
+
+def clear_message_save_observers_cache(doc=None, method=None) -> None:
+    """doc_events hook for the observer record doctypes."""
+    frappe.cache().delete_value(MESSAGE_SAVE_OBSERVERS_CACHE_KEY)
+
+
 def update_message_status(data):
-    """Update message status."""
+    """Update message status.
+
+    Meta has already been answered, so a failed status is never resent.
+    Each status therefore runs in its own savepoint: one that fails is
+    logged and rolled back alone, and the rest are committed together.
+    """
     statuses = data.get("statuses")
     if not statuses or not isinstance(statuses, list):
         return
 
-    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import WhatsAppMessage  # noqa
-
     for status_payload in statuses:
         if not isinstance(status_payload, dict):
             continue
 
-        msg_id = status_payload.get("id")
-        status = status_payload.get("status")
-        if not msg_id or not status:
-            continue
+        frappe.db.savepoint("whatsapp_message_status")
+        try:
+            _apply_message_status(status_payload)
+        except Exception:
+            frappe.db.rollback(save_point="whatsapp_message_status")
+            frappe.log_error(
+                title="WhatsApp message status update failed",
+                message=(
+                    f"Status payload: {frappe.as_json(status_payload)}\n"
+                    f"{frappe.get_traceback()}"
+                ),
+            )
 
-        conversation = (status_payload.get("conversation") or {}).get("id")
-        name = frappe.db.get_value(
-            "WhatsApp Message", filters={"message_id": msg_id})
-        if not name:
-            continue
+    frappe.db.commit()
 
-        doc = cast(
-            WhatsAppMessage,
-            frappe.get_doc("WhatsApp Message", str(name)))
-        doc.status = status
-        if conversation:
-            doc.conversation_id = conversation
 
-        error_fields = _extract_status_error_fields(status_payload)
-        for fieldname, value in error_fields.items():
-            if doc.meta.has_field(fieldname):
-                doc.set(fieldname, value)
+def _apply_message_status(status_payload: dict[str, Any]) -> None:
+    msg_id = status_payload.get("id")
+    status = status_payload.get("status")
+    if not msg_id or not status:
+        return
 
-        doc.save(ignore_permissions=True)
-        frappe.db.commit()
+    conversation = (status_payload.get("conversation") or {}).get("id")
+    message = frappe.db.get_value(
+        "WhatsApp Message",
+        filters={"message_id": msg_id},
+        fieldname=["name", "type", "source_app"],
+        as_dict=True,
+    )
+    if not message:
+        return
+
+    values: dict[str, Any] = {"status": status}
+    if conversation:
+        values["conversation_id"] = conversation
+    values.update(_extract_status_error_fields(status_payload))
+
+    if not _message_update_is_observed(message):
+        # Nothing listens for this save, so skip loading, validating
+        # and re-writing the whole document: one UPDATE does it.
+        if values["status_error_payload"] is not None:
+            values["status_error_payload"] = frappe.as_json(
+                values["status_error_payload"])
+        modified = now()
+        frappe.db.set_value(
+            "WhatsApp Message", message.name, values, modified=modified)
+        # db.set_value skips Document.notify_update; publish the same
+        # doc_update / list_update events so open forms and lists refresh.
+        frappe.get_doc({
+            "doctype": "WhatsApp Message",
+            "name": message.name,
+            "modified": modified,
+        }).notify_update()
+        return
+
+    from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_message.whatsapp_message import WhatsAppMessage  # noqa
+
+    doc = cast(
+        WhatsAppMessage,
+        frappe.get_doc("WhatsApp Message", str(message.name)))
+    for fieldname, value in values.items():
+        if doc.meta.has_field(fieldname):
+            doc.set(fieldname, value)
+
+    doc.save(ignore_permissions=True)
 
 
 def download_and_attach_media(
         whatsapp_account_name: str,
         message_docname: str, media_id: str, message_type: str):
+    file_path = None
     try:
         from frappe_whatsapp.frappe_whatsapp.doctype.whatsapp_account.whatsapp_account import WhatsAppAccount  # noqa
         whatsapp_account = cast(
@@ -929,9 +1054,12 @@ def download_and_attach_media(
         base_url = f"{whatsapp_account.url}/{whatsapp_account.version}/"
 
         headers = {"Authorization": f"Bearer {token}"}
+        # Both requests go over the shared keep-alive session, so the
+        # download reuses pooled connections instead of a new TLS handshake.
+        session = get_session()
 
         # 1) Get media metadata to retrieve url/mime
-        r = requests.get(f"{base_url}{media_id}/", headers=headers, timeout=30)
+        r = session.get(f"{base_url}{media_id}/", headers=headers, timeout=30)
         r.raise_for_status()
         media_data = r.json()
 
@@ -940,25 +1068,47 @@ def download_and_attach_media(
         file_extension = get_media_file_extension(
             mime_type, message_type=message_type)
 
-        # 2) Download content
-        r2 = requests.get(media_url, headers=headers, timeout=60)
-        r2.raise_for_status()
-
-        file_data = r2.content
         file_name = (
             f"whatsapp-{message_type}-"
-            f"{frappe.generate_hash(length=10)}.{file_extension}"
+            f"{secrets.token_hex(5)}.{file_extension}"
         )
 
+        # 2) Stream the content straight into the site's files folder, so
+        # a large video is never held in worker memory. The content hash
+        # File needs is computed on the way, so its controller does not
+        # read the whole file back to hash it. Streaming bypasses File's own
+        # size check, so the site's maximum file size is enforced here.
+        content_hash = hashlib.md5(usedforsecurity=False)
+        max_file_size = frappe.get_max_file_size()
+        file_size = 0
+        with session.get(
+                media_url, headers=headers, stream=True, timeout=60) as r2:
+            r2.raise_for_status()
+            file_path = frappe.get_site_path("public", "files", file_name)
+            with open(file_path, "wb") as f:
+                for chunk in r2.iter_content(MEDIA_DOWNLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > max_file_size:
+                        frappe.throw(
+                            f"Media exceeds the maximum file size of "
+                            f"{max_file_size} bytes",
+                            frappe.ValidationError,
+                        )
+                    f.write(chunk)
+                    content_hash.update(chunk)
+
         # 3) Attach to WhatsApp Message
         from frappe.core.doctype.file.file import File
         file_doc = cast(File, frappe.get_doc({
             "doctype": "File",
             "file_name": file_name,
+            "file_url": f"/files/{file_name}",
+            "is_private": 0,
+            "file_size": file_size,
+            "content_hash": content_hash.hexdigest(),
             "attached_to_doctype": "WhatsApp Message",
             "attached_to_name": message_docname,
             "attached_to_field": "attach",
-            "content": file_data,
             "file_type": file_extension.upper(),
         }))
         file_doc.save(ignore_permissions=True)
@@ -971,6 +1121,8 @@ def download_and_attach_media(
         forward_incoming_to_app_async(incoming_message_name=message_docname)
     except Exception:
         frappe.db.rollback()
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
         frappe.log_error(
             frappe.get_traceback(),
             ("WhatsApp media download failed for "